@@ -1,14 +1,20 @@
 import os
 import json
 import asyncio
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 
 from fastapi import FastAPI, UploadFile, File, Form, HTTPException
 from fastapi.responses import FileResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 
-from .app import run_job, get_manifest, list_chunks, get_chunk_detail, reprocess_chunk
+from fastapi.concurrency import run_in_threadpool
+
+from .app import run_job, run_multi_job, get_manifest, list_chunks, get_chunk_detail, reprocess_chunk, get_job_stats
+from .postprocess import cleanup_job_artifacts
+from .resynthesize import resynthesize_job
+from .tts_service import edge_tts
+from .voice_catalog import get_voice_catalog, load_voice_map, update_voice_map
 from .podcast_generator import PodcastGenerator
 from .cloudinary_uploader import upload_video_to_cloudinary
 
@@ -32,6 +38,16 @@ class StartJobRequest(BaseModel):
     voice: Optional[str] = None  # explicit voice or "male"/"female"
 
 
+class StartMultiJobRequest(BaseModel):
+    input_path: str
+    source: str
+    targets: List[str]
+    job_id: str
+    course_id: str
+    mode: str = "fast"
+    voice: Optional[str] = None  # applied to every target
+
+
 class FinalizeRequest(BaseModel):
     job_id: Optional[str] = None
     manifest_path: Optional[str] = None
@@ -57,60 +73,14 @@ class FeedbackRequest(BaseModel):
 # -----------------
 # Voice mapping utilities
 # -----------------
-VOICE_MAP_PATH = os.path.join(os.path.dirname(__file__), "sample_data", "voice_map.json")
-try:
-    import edge_tts
-except Exception:
-    edge_tts = None
-
-# In-memory cache to avoid repeated edge-tts voice discovery
-EDGE_VOICES_CACHE = None
-
-
-def _load_voice_map() -> Dict[str, str]:
-    if os.path.exists(VOICE_MAP_PATH):
-        try:
-            with open(VOICE_MAP_PATH, "r", encoding="utf-8") as f:
-                return json.load(f)
-        except Exception:
-            return {}
-    return {}
-
-
-def _save_voice_map(vm: Dict[str, str]) -> None:
-    os.makedirs(os.path.dirname(VOICE_MAP_PATH), exist_ok=True)
-    with open(VOICE_MAP_PATH, "w", encoding="utf-8") as f:
-        json.dump(vm, f, ensure_ascii=False, indent=2)
-
-
 async def _resolve_gender_voice(lang: str, gender: str) -> Optional[str]:
     if edge_tts is None:
         return None
     try:
-        global EDGE_VOICES_CACHE
-        if EDGE_VOICES_CACHE is None:
-            EDGE_VOICES_CACHE = await edge_tts.list_voices()
-        voices = EDGE_VOICES_CACHE
-        base = lang.split("-")[0].lower()
-        gen = gender.lower()
-        candidates = []
-        for v in voices:
-            locale = (v.get("Locale") or "").lower()
-            short = v.get("ShortName")
-            g = (v.get("Gender") or "").lower()
-            if locale.startswith(base):
-                score = 0
-                if "neural" in (short or "").lower():
-                    score += 2
-                if g == gen:
-                    score += 1
-                candidates.append((score, short))
-        if candidates:
-            candidates.sort(key=lambda x: x[0], reverse=True)
-            return candidates[0][1]
+        catalog = await run_in_threadpool(get_voice_catalog)
+        return catalog.best(lang, gender)
     except Exception:
         return None
-    return None
 
 
 class VoiceSetRequest(BaseModel):
@@ -123,61 +93,37 @@ async def list_voices(lang: Optional[str] = None) -> Dict[str, Any]:
     if edge_tts is None:
         return {"voices": [], "error": "edge-tts not available"}
     try:
-        global EDGE_VOICES_CACHE
-        if EDGE_VOICES_CACHE is None:
-            EDGE_VOICES_CACHE = await edge_tts.list_voices()
-        voices = EDGE_VOICES_CACHE
-        if lang:
-            base = lang.split("-")[0].lower()
-            voices = [v for v in voices if (v.get("Locale") or "").lower().startswith(base)]
-        slim = [
-            {
-                "ShortName": v.get("ShortName"),
-                "Locale": v.get("Locale"),
-                "Gender": v.get("Gender"),
-            }
-            for v in voices
-        ]
-        return {"voices": slim}
+        catalog = await run_in_threadpool(get_voice_catalog)
+        return {"voices": catalog.list(lang)}
     except Exception as e:
         return {"voices": [], "error": str(e)}
 
 
 @app.get("/voice/{lang}")
 async def get_voice_mapping(lang: str) -> Dict[str, Any]:
-    vm = _load_voice_map()
+    vm = load_voice_map()
     base = lang.split("-")[0]
     return {"lang": lang, "voice": vm.get(lang) or vm.get(base)}
 
 
 @app.put("/voice/{lang}")
 async def set_voice_mapping(lang: str, req: VoiceSetRequest) -> Dict[str, Any]:
-    vm = _load_voice_map()
     chosen = req.voice
     if not chosen and req.gender:
         chosen = await _resolve_gender_voice(lang, req.gender)
     if not chosen:
         raise HTTPException(status_code=400, detail="Provide 'voice' or valid 'gender'")
-    vm[lang] = chosen
-    base = lang.split("-")[0]
-    vm.setdefault(base, chosen)
-    _save_voice_map(vm)
+    update_voice_map(lang, chosen)
     return {"ok": True, "lang": lang, "voice": chosen}
 
 
 async def _apply_voice_param(target: str, voice: Optional[str]) -> None:
     if not voice:
         return
-    vm = _load_voice_map()
-    if voice.lower() in ("male", "female"):
-        chosen = await _resolve_gender_voice(target, voice)
-        if chosen:
-            vm[target] = chosen
-            vm.setdefault(target.split("-")[0], chosen)
-    else:
-        vm[target] = voice
-        vm.setdefault(target.split("-")[0], voice)
-    _save_voice_map(vm)
+    chosen = await _resolve_gender_voice(target, voice) if voice.lower() in ("male", "female") else voice
+    if chosen:
+        # Rewrites voice_map.json only when the mapping changes
+        update_voice_map(target, chosen)
 
 
 # -----------------
@@ -197,6 +143,31 @@ async def start_job(req: StartJobRequest) -> Dict[str, Any]:
     return {"manifest_path": manifest_path}
 
 
+@app.post("/jobs/start-multi")
+async def start_multi_job(req: StartMultiJobRequest) -> Dict[str, Any]:
+    """Transcribe once and dub into every language in ``targets``.
+
+    Each target becomes its own job ``<job_id>-<target>`` for the other /jobs endpoints.
+    """
+    if not req.targets:
+        raise HTTPException(status_code=400, detail="Provide at least one target")
+    for target in req.targets:
+        await _apply_voice_param(target, req.voice)
+    manifests = await run_in_threadpool(
+        run_multi_job,
+        input_path=req.input_path,
+        source=req.source,
+        targets=req.targets,
+        job_id=req.job_id,
+        course_id=req.course_id,
+        mode=req.mode,
+    )
+    return {
+        "manifest_paths": manifests,
+        "jobs": {target: os.path.basename(os.path.dirname(path)) for target, path in manifests.items()},
+    }
+
+
 @app.get("/jobs/{job_id}/manifest")
 async def get_job_manifest(job_id: str) -> Dict[str, Any]:
     return get_manifest(job_id)
@@ -218,7 +189,7 @@ async def resynthesize(req: ResynthesizeRequest):
     if req.manifest_path:
         manifest_path = req.manifest_path
     elif req.job_id:
-        base = os.path.join("localizer", "output", req.job_id)
+        base = os.path.join(os.path.dirname(__file__), "output", req.job_id)
         manifest_path = os.path.join(base, "manifest.json")
     else:
         raise HTTPException(status_code=400, detail="Provide job_id or manifest_path")
@@ -242,7 +213,7 @@ async def finalize(req: FinalizeRequest) -> FileResponse:
     if req.manifest_path:
         manifest_path = req.manifest_path
     elif req.job_id:
-        base = os.path.join("localizer", "output", req.job_id)
+        base = os.path.join(os.path.dirname(__file__), "output", req.job_id)
         manifest_path = os.path.join(base, "manifest.json")
     else:
         raise HTTPException(status_code=400, detail="Provide job_id or manifest_path")
@@ -344,18 +315,15 @@ async def seed_indian_voices(gender: str = "male") -> Dict[str, Any]:
         "ml-IN",
         "or-IN",
     ]
-    vm = _load_voice_map()
     applied = []
     for lang in langs:
         try:
             chosen = await _resolve_gender_voice(lang, gender)
             if chosen:
-                vm[lang] = chosen
-                vm.setdefault(lang.split("-")[0], chosen)
+                update_voice_map(lang, chosen)
                 applied.append({"lang": lang, "voice": chosen})
         except Exception:
             continue
-    _save_voice_map(vm)
     return {"ok": True, "applied": applied}
 
 
@@ -382,8 +350,6 @@ async def upload_and_localize(
     job = job_id or os.path.splitext(filename)[0]
     
     # Run blocking job in threadpool to avoid blocking event loop
-    # This also allows asyncio.run() in tts.py to work correctly (since it runs in a separate thread)
-    from fastapi.concurrency import run_in_threadpool
     manifest_path = await run_in_threadpool(
         run_job,
         input_path=input_path,
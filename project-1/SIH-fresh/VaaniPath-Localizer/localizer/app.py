@@ -2,26 +2,51 @@ import argparse
 import json
 import os
 import time
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from typing import Dict, Any, List
-import subprocess
-from .config import CHUNK_LENGTH_SECONDS, CHUNK_OVERLAP_SECONDS, MODE_CONFIG, TRANSLATION_DEFAULT_MODEL
-from .utils import mkdir_p, setup_logger, get_worker_count, FFMPEG, FFPROBE, generate_vtt
-from .video_splitter import split_video
-from .stt import transcribe
-from .glossary import DEFAULT_GLOSSARY, merge_glossaries, clean_transcript
-from .translation import translate_text
+from .config import (
+    CHUNK_LENGTH_SECONDS,
+    CHUNK_OVERLAP_SECONDS,
+    MODE_CONFIG,
+    MULTI_TARGET_BRANCHES,
+    MULTI_TARGET_WORKERS,
+    PIPELINE_QUEUE_SIZE,
+    SAMPLE_RATE,
+    STT_WORKERS,
+    TRANSLATE_WORKERS,
+    TRANSLATION_DEFAULT_MODEL,
+    TTS_SYNC_MODE,
+    TTS_WORKERS,
+)
+from .utils import mkdir_p, setup_logger, get_worker_count, generate_vtt
+from .video_splitter import open_chunks
+from .audio_extract import decode_pcm16, load_chunk_audio, to_float32, write_wav
+from .stt import transcribe_cached, get_transcript_cache, warmup as warmup_stt
+from .glossary import clean_transcript, get_job_glossary_matcher
+from .translation import translate_segments, translate_text
+from .translation_memory import get_translation_memory
 
 # Only Konkani (Generic) requires Gemini as Google Translate doesn't support it
 # All other Indian languages now use Google Translate (as of 2024)
 GEMINI_PREFERRED_LANGS = {"kok"}  # Konkani (Generic)
 from .culture import apply_cultural_adaptation
-from .tts import tts_synthesize, generate_srt
+from .tts import (
+    generate_srt,
+    segments_fingerprint,
+    tts_fingerprint,
+    tts_synthesize,
+    tts_synthesize_segments,
+)
+from .timeline import render_chunk, render_timeline
+from .tts_cache import get_tts_cache
+from .voice_catalog import resolve_voice
 from .manifest import build_manifest, load_manifest
-from .rag_client import get_job_context
-from .audio_sync import concatenate_and_stretch
+from .rag_client import get_job_context, load_job_context
+from .audio_sync import final_output_path, finish_media
+from .pipeline import Stage, StagedPipeline
 from pathlib import Path
-from .audio_utils import get_duration
+from .audio_utils import get_duration, write_silence
+from .media_probe import has_video_stream
 from .cloudinary_uploader import upload_video_to_cloudinary as cloudinary_upload
 
 
@@ -30,300 +55,457 @@ from .cloudinary_uploader import upload_video_to_cloudinary as cloudinary_upload
 logger = setup_logger("app")
 
 
-def process_chunk(
+def _cultural_rules(job_context: Dict[str, Any]):
+    """The context's compiled cultural matcher, or its raw rules for hand-built contexts."""
+    return job_context.get("cultural_matcher") or job_context.get("cultural_rules", {})
+
+
+# Read-only job state installed once per STT worker by init_stt_worker
+_WORKER_JOB: Dict[str, Any] = {}
+
+
+def init_stt_worker(mode: str, course_id: str, source: str, target: str, context_version: str) -> None:
+    """ProcessPool initializer: load the Whisper model and the compiled job context once per worker."""
+    warmup_stt(mode)
+    _WORKER_JOB.update(
+        mode=mode,
+        source=source,
+        job_context=load_job_context(course_id, source, target, context_version),
+    )
+
+
+def transcribe_chunk_task(chunk_meta: Dict[str, Any]) -> Dict[str, Any]:
+    """Pool task: only the chunk metadata crosses the process boundary."""
+    return transcribe_chunk(chunk_meta, _WORKER_JOB["source"], _WORKER_JOB["mode"], _WORKER_JOB["job_context"])
+
+
+def transcribe_chunk(
     chunk_meta: Dict[str, Any],
     source_lang: str,
-    target_lang: str,
     mode: str,
     job_context: Dict[str, Any],
-    tts_dir: str,
-    translation_model: str,
 ) -> Dict[str, Any]:
-    audio_path = chunk_meta["audio_path"]
+    """Target-independent half of chunk processing: STT + glossary cleanup."""
+    if not chunk_meta.get("speech", True):
+        # Silence/music span found by the splitter: nothing to transcribe
+        return {
+            "index": chunk_meta["index"],
+            "start": chunk_meta["start"],
+            "end": chunk_meta["end"],
+            "text_original": "",
+            "text_clean": "",
+            "segments": [],
+            "stt_cached": False,
+            "speech": False,
+        }
 
-    # 1) STT
-    text_original, segments = transcribe(
-        audio_path=audio_path,
+    # 1) STT (skipped when this exact audio was already transcribed with the same settings)
+    text_original, segments, stt_cached = transcribe_cached(
+        audio=load_chunk_audio(chunk_meta),
         source_lang=source_lang,
         initial_prompt=job_context.get("initial_prompt"),
         mode=mode,
     )
 
     # 2) Glossary cleanup
-    merged_glossary = merge_glossaries(DEFAULT_GLOSSARY, job_context.get("glossary", {}))
-    text_clean = clean_transcript(text_original, merged_glossary)
+    glossary_matcher = job_context.get("glossary_matcher") or get_job_glossary_matcher(job_context.get("glossary", {}))
+    text_clean = clean_transcript(text_original, glossary_matcher)
+    segments = [{**seg, "text_clean": clean_transcript(seg["text"], glossary_matcher)} for seg in segments]
 
-    # 3) Translation
-    text_translated = translate_text(
-        text_clean,
-        target_lang,
-        model=translation_model,
-        style_guide=job_context.get("style_guide"),
-        glossary=job_context.get("target_glossary"),
-    )
+    return {
+        "index": chunk_meta["index"],
+        "start": chunk_meta["start"],
+        "end": chunk_meta["end"],
+        "text_original": text_original,
+        "text_clean": text_clean,
+        "segments": segments,
+        "stt_cached": stt_cached,
+    }
+
+
+def translate_chunk(
+    stt_result: Dict[str, Any],
+    target_lang: str,
+    job_context: Dict[str, Any],
+    translation_model: str,
+) -> Dict[str, Any]:
+    """Translation + cultural adaptation of a transcribed chunk (network-bound).
+
+    Returns the STT result extended with ``text_translated``, translated segments and
+    translation-memory counters, ready for :func:`voice_chunk`.
+    """
+    if not stt_result.get("speech", True):
+        return stt_result
+
+    # 3) Translation: all Whisper segments of the chunk go out batched, so the
+    # subtitles get per-segment cues and the chunk text is their concatenation
+    tm_stats: Dict[str, int] = {}
+    segments = stt_result["segments"]
+    if segments:
+        seg_translations = translate_segments(
+            [seg.get("text_clean", seg["text"]) for seg in segments],
+            target_lang,
+            model=translation_model,
+            style_guide=job_context.get("style_guide"),
+            glossary=job_context.get("target_glossary"),
+            stats=tm_stats,
+            source_lang=job_context.get("source_lang", "en"),
+        )
+        segments = [
+            {**seg, "text_translated": apply_cultural_adaptation(t, target_lang, _cultural_rules(job_context))}
+            for seg, t in zip(segments, seg_translations)
+        ]
+        text_translated = " ".join(t for t in seg_translations if t)
+    else:
+        text_translated = translate_text(
+            stt_result["text_clean"],
+            target_lang,
+            model=translation_model,
+            style_guide=job_context.get("style_guide"),
+            glossary=job_context.get("target_glossary"),
+            stats=tm_stats,
+            source_lang=job_context.get("source_lang", "en"),
+        )
 
     # 4) Cultural adaptation
-    text_adapted = apply_cultural_adaptation(text_translated, target_lang, job_context.get("cultural_rules", {}))
+    text_adapted = apply_cultural_adaptation(text_translated, target_lang, _cultural_rules(job_context))
+
+    return {
+        **stt_result,
+        "segments": segments,
+        "text_translated": text_adapted,
+        "tm_hits": tm_stats.get("tm_hits", 0),
+        "tm_misses": tm_stats.get("tm_misses", 0),
+    }
+
+
+def voice_chunk(translated: Dict[str, Any], target_lang: str, tts_dir: str) -> Dict[str, Any]:
+    """TTS + SRT for a translated chunk (network-bound); returns the manifest chunk entry."""
+    if not translated.get("speech", True):
+        # Keep the chunk's slot on the timeline with silence instead of synthesized speech
+        audio_out = os.path.join(tts_dir, f"chunk_{translated['index']:04d}.mp3")
+        write_silence(audio_out, translated["end"] - translated["start"])
+        return {
+            "index": translated["index"],
+            "start": translated["start"],
+            "end": translated["end"],
+            "text_original": "",
+            "text_translated": "",
+            "audio_path": audio_out,
+            "segments": [],
+            "stt_cached": False,
+            "speech": False,
+        }
 
     # 5) TTS + SRT
-    audio_out = os.path.join(tts_dir, f"chunk_{chunk_meta['index']:04d}.mp3")
-    srt_out = os.path.join(tts_dir, f"chunk_{chunk_meta['index']:04d}.srt")
-    tts_synthesize(text_adapted, target_lang, audio_out)
+    tts_stats: Dict[str, int] = {}
+    segments = translated["segments"]
+    text_adapted = translated["text_translated"]
+    prefix = f"chunk_{translated['index']:04d}"
+    srt_out = os.path.join(tts_dir, f"{prefix}.srt")
+    tts_mode = "segment" if TTS_SYNC_MODE == "segment" and segments else "chunk"
+    if tts_mode == "segment":
+        # One clip per Whisper segment, each tempo-fit to its own window and mixed at its
+        # timestamp, instead of one chunk clip stretched with everything else
+        segments = tts_synthesize_segments(segments, target_lang, tts_dir, prefix, stats=tts_stats)
+        audio_out = render_chunk(
+            segments, translated["end"] - translated["start"], os.path.join(tts_dir, f"{prefix}.wav")
+        )
+        fingerprint = segments_fingerprint(segments, target_lang)
+    else:
+        audio_out = os.path.join(tts_dir, f"{prefix}.mp3")
+        tts_synthesize(text_adapted, target_lang, audio_out, stats=tts_stats)
+        fingerprint = tts_fingerprint(text_adapted, target_lang)
     generate_srt(segments, srt_out)
 
-    # Keep only raw TTS generation, remove time stretching
-    final_audio_path = audio_out
-
     return {
-        "index": chunk_meta["index"],
-        "start": chunk_meta["start"],
-        "end": chunk_meta["end"],
-        "text_original": text_original,
+        "index": translated["index"],
+        "start": translated["start"],
+        "end": translated["end"],
+        "text_original": translated["text_original"],
         "text_translated": text_adapted,
-        "audio_path": final_audio_path,
+        "audio_path": audio_out,
         "srt_path": srt_out,
         "segments": segments,  # 🚀 Return segments for fine-grained VTT
+        "stt_cached": translated.get("stt_cached", False),
+        "tts_cached": bool(tts_stats.get("tts_hits")) and not tts_stats.get("tts_misses"),
+        "tts_mode": tts_mode,
+        "tts_fingerprint": fingerprint,
+        "tm_hits": translated.get("tm_hits", 0),
+        "tm_misses": translated.get("tm_misses", 0),
     }
 
+
+def localize_chunk(
+    stt_result: Dict[str, Any],
+    target_lang: str,
+    job_context: Dict[str, Any],
+    tts_dir: str,
+    translation_model: str,
+) -> Dict[str, Any]:
+    """Target-specific half of chunk processing: translation, adaptation and TTS."""
+    translated = translate_chunk(stt_result, target_lang, job_context, translation_model)
+    return voice_chunk(translated, target_lang, tts_dir)
+
+
+def process_chunk(
+    chunk_meta: Dict[str, Any],
+    source_lang: str,
+    target_lang: str,
+    mode: str,
+    job_context: Dict[str, Any],
+    tts_dir: str,
+    translation_model: str,
+) -> Dict[str, Any]:
+    stt_result = transcribe_chunk(chunk_meta, source_lang, mode, job_context)
+    return localize_chunk(stt_result, target_lang, job_context, tts_dir, translation_model)
+
 # Gemini-preferred languages that should use single-pass processing
 GEMINI_PREFERRED_LANGS = {"brx", "doi", "ks", "gom", "mai", "mni", "sat", "mwr", "bho", "bgc"}
 
 
-def process_full_video(
-    input_path: str,
-    source: str,
+def localize_full_transcript(
+    text_original: str,
+    segments: List[Dict[str, Any]],
     target: str,
-    job_id: str,
-    course_id: str,
-    mode: str,
+    job_context: Dict[str, Any],
     translation_model: str,
+    media_duration: float,
     base_out: str,
-) -> tuple[str, str, List[Dict[str, Any]]]:
-    """Process entire video without chunking (for Gemini languages).
-    
-    Returns: (final_audio_path, final_video_path, chunks_metadata)
+    input_path: str,
+    text_clean: str | None = None,
+) -> tuple[str, str | None, List[Dict[str, Any]]]:
+    """Translate, adapt and voice a whole transcript in one pass (for Gemini languages).
+
+    The clip is stretched and muxed with *input_path* by the shared finisher, like the
+    chunked path. Returns: (final_audio_path, final_video_path or None, chunks_metadata)
     """
     tts_dir = os.path.join(base_out, "tts")
     mkdir_p(tts_dir)
-    
-    job_context = get_job_context(course_id, source, target)
-    logger.info("Job context loaded (single-pass mode).")
-    
-    # Extract audio from full video
-    audio_path = os.path.join(base_out, "full_audio.wav")
-    extract_cmd = [
-        FFMPEG, "-y", "-i", input_path,
-        "-vn", "-acodec", "pcm_s16le", "-ar", "16000", "-ac", "1",
-        audio_path
-    ]
-    subprocess.check_call(extract_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT)
-    logger.info(f"Extracted full audio: {audio_path}")
-    
-    # STT on full audio
-    text_original, segments = transcribe(
-        audio_path=audio_path,
-        source_lang=source,
-        initial_prompt=job_context.get("initial_prompt"),
-        mode=mode,
-    )
-    logger.info(f"Transcribed full audio: {len(text_original)} chars")
-    
+
     # Glossary cleanup
-    merged_glossary = merge_glossaries(DEFAULT_GLOSSARY, job_context.get("glossary", {}))
-    text_clean = clean_transcript(text_original, merged_glossary)
-    
-    # Single Gemini translation call
+    if text_clean is None:
+        glossary_matcher = job_context.get("glossary_matcher") or get_job_glossary_matcher(job_context.get("glossary", {}))
+        text_clean = clean_transcript(text_original, glossary_matcher)
+
+    # Single Gemini translation call (only sentences missing from the translation memory)
+    tm_stats: Dict[str, int] = {}
     text_translated = translate_text(
         text_clean,
         target,
         model=translation_model,
         style_guide=job_context.get("style_guide"),
         glossary=job_context.get("target_glossary"),
+        stats=tm_stats,
+        source_lang=job_context.get("source_lang", "en"),
     )
     logger.info(f"Translated via Gemini: {len(text_translated)} chars")
-    
+
     # Cultural adaptation
-    text_adapted = apply_cultural_adaptation(text_translated, target, job_context.get("cultural_rules", {}))
-    
+    text_adapted = apply_cultural_adaptation(text_translated, target, _cultural_rules(job_context))
+
     # TTS + SRT for full content
     audio_out = os.path.join(tts_dir, "full_audio.mp3")
     srt_out = os.path.join(tts_dir, "full_audio.srt")
-    tts_synthesize(text_adapted, target, audio_out)
+    tts_stats: Dict[str, int] = {}
+    tts_synthesize(text_adapted, target, audio_out, stats=tts_stats)
     generate_srt(segments, srt_out)
     logger.info(f"Generated TTS: {audio_out}")
-    
-    # Time-stretch to match video duration
-    video_duration = get_duration(input_path)
-    final_audio_path = os.path.join(base_out, "final_audio.wav")
-    
-    # Use time_stretch_audio from audio_utils
-    from .audio_utils import time_stretch_audio
-    time_stretch_audio(audio_out, video_duration, final_audio_path)
-    
-    # Merge with video (if input is video)
-    final_video_path = os.path.join(base_out, "final_video.mp4")
-    # Note: Merging happens in run_job usually, but here we just return paths
-    # Actually, for single-pass, we might want to return the stretched audio as final result
-    
+
+    # One ffmpeg pass: stretch to the media duration, single encode, muxed with the copied video
+    has_video = has_video_stream(input_path)
+    final_path = final_output_path(base_out, "final_video" if has_video else "final_audio", has_video)
+    finish_media(input_path, [audio_out], media_duration, final_path, has_video=has_video)
+    # The dubbed track only exists inside the finished file
+    final_audio_path = str(final_path)
+    final_video_path = str(final_path) if has_video else None
+
     chunks_metadata = [{
         "index": 0,
         "start": 0.0,
-        "end": video_duration,
+        "end": media_duration,
         "text_original": text_original,
         "text_translated": text_adapted,
-        "audio_path": final_audio_path,
+        "audio_path": audio_out,
         "srt_path": srt_out,
+        "tts_cached": bool(tts_stats.get("tts_hits")) and not tts_stats.get("tts_misses"),
+        "tm_hits": tm_stats.get("tm_hits", 0),
+        "tm_misses": tm_stats.get("tm_misses", 0),
     }]
+    return final_audio_path, final_video_path, chunks_metadata
+
+
+def process_full_video(
+    input_path: str,
+    source: str,
+    target: str,
+    job_id: str,
+    course_id: str,
+    mode: str,
+    translation_model: str,
+    base_out: str,
+) -> tuple[str, str | None, List[Dict[str, Any]]]:
+    """Process entire video without chunking (for Gemini languages).
+    
+    Returns: (final_audio_path, final_video_path, chunks_metadata)
+    """
+    job_context = get_job_context(course_id, source, target)
+    logger.info("Job context loaded (single-pass mode).")
     
-    return str(final_audio_path), str(final_video_path), chunks_metadata
+    # Decode the full audio track once, straight into memory (no intermediate WAV)
+    audio = to_float32(decode_pcm16(input_path))
+    logger.info(f"Decoded full audio: {len(audio) / SAMPLE_RATE:.1f}s")
+    
+    # STT on full audio
+    text_original, segments, stt_cached = transcribe_cached(
+        audio=audio,
+        source_lang=source,
+        initial_prompt=job_context.get("initial_prompt"),
+        mode=mode,
+    )
+    logger.info(f"Transcribed full audio: {len(text_original)} chars")
+    
+    video_duration = get_duration(input_path)
+    final_audio_path, final_video_path, chunks_metadata = localize_full_transcript(
+        text_original, segments, target, job_context, translation_model, video_duration, base_out, input_path
+    )
+    chunks_metadata[0]["stt_cached"] = stt_cached
+    
+    return final_audio_path, final_video_path, chunks_metadata
+
+
+def _subtitle_cues(results: List[Dict[str, Any]], segment_key: str, chunk_key: str) -> List[Dict[str, Any]]:
+    """Absolute-time VTT cues: one per Whisper segment when the chunk has segment text
+    under *segment_key*, otherwise one per chunk using *chunk_key*."""
+    cues = []
+    for chunk in results:
+        segments = chunk.get("segments") or []
+        # 🚀 Use segments if available for fine-grained timestamps
+        if segments and all(segment_key in seg for seg in segments):
+            for seg in segments:
+                cues.append({
+                    "start": chunk["start"] + seg["start"],
+                    "end": chunk["start"] + seg["end"],
+                    "text": seg[segment_key],
+                })
+        else:
+            # Fallback to chunk-level text
+            cues.append({
+                "start": chunk["start"],
+                "end": chunk["end"],
+                "text": chunk.get(chunk_key, chunk.get("text", "")),
+            })
+    return cues
 
 
-def run_job(
+def _publish_single_pass(
     input_path: str,
     source: str,
     target: str,
     job_id: str,
     course_id: str,
-    mode: str = "fast",
-    translation_model: str = TRANSLATION_DEFAULT_MODEL,
+    mode: str,
+    base_out: str,
+    final_audio: str,
+    final_video: str | None,
+    chunks_metadata: List[Dict[str, Any]],
+    extra: Dict[str, Any] | None = None,
+    upload_id: str | None = None,
 ) -> str:
-    start_time = time.time()
-    base_out = os.path.join(os.path.dirname(__file__), "output", job_id)
-    mkdir_p(base_out)
-    
-    # Check if target language requires Gemini (single-pass processing)
-    base_target = target.split("-")[0]
-    if base_target in GEMINI_PREFERRED_LANGS:
-        logger.info(f"Language {target} requires Gemini - using single-pass processing")
-        final_audio, final_video, chunks_metadata = process_full_video(
-            input_path, source, target, job_id, course_id, mode, translation_model, base_out
-        )
+    upload_id = upload_id or job_id
+    # Upload to Cloudinary
+    cloudinary_url = None
+    try:
+        # Determine content type (audio or video)
+        content_type = "audio"  # Audio-only input
+        upload_path = final_audio
         
-        # Upload to Cloudinary
-        cloudinary_url = None
-        try:
-            # Determine content type (audio or video)
-            content_type = "audio"  # Default for single-pass as we skip video merge usually
-            upload_path = final_audio
+        # Video input: finish_media muxed the dubbed track into final_video
+        if final_video and os.path.exists(final_video):
+            content_type = "video"
+            upload_path = final_video
             
-            # If we had video merging, we would check if final_video exists
-            if final_video and os.path.exists(final_video):
-                content_type = "video"
-                upload_path = final_video
-                
-            if upload_path and os.path.exists(upload_path):
-                logger.info(f"Uploading {content_type} to Cloudinary: {upload_path}")
-                result = cloudinary_upload(
-                    upload_path,
-                    job_id,
-                    target,
-                    content_type=content_type
-                )
-                if result:
-                    cloudinary_url = result  # cloudinary_upload returns URL string directly
-                    logger.info(f"Cloudinary URL ({content_type}): {cloudinary_url}")
-                else:
-                    logger.error("Cloudinary upload returned no result")
+        if upload_path and os.path.exists(upload_path):
+            logger.info(f"Uploading {content_type} to Cloudinary: {upload_path}")
+            result = cloudinary_upload(
+                upload_path,
+                upload_id,
+                target,
+                content_type=content_type
+            )
+            if result:
+                cloudinary_url = result  # cloudinary_upload returns URL string directly
+                logger.info(f"Cloudinary URL ({content_type}): {cloudinary_url}")
             else:
-                logger.error(f"Upload path does not exist: {upload_path}")
-        except Exception as e:
-            logger.error(f"Cloudinary upload failed: {e}")
-        
-        # Build manifest
-        manifest = build_manifest(
-            job_id=job_id,
-            mode=mode,
-            source=source,
-            target=target,
-            course_id=course_id,
-            input_path=input_path,
-            chunks=chunks_metadata,
-            output_dir=base_out,
-            final_audio=final_audio,
-            final_video=final_video,
-            cloudinary_url=cloudinary_url,
-        )
-        
-        elapsed = time.time() - start_time
-        logger.info(f"Job {job_id} finished (single-pass): chunks=1 mode={mode} time={elapsed:.2f}s")
-        return os.path.join(base_out, "manifest.json")
+                logger.error("Cloudinary upload returned no result")
+        else:
+            logger.error(f"Upload path does not exist: {upload_path}")
+    except Exception as e:
+        logger.error(f"Cloudinary upload failed: {e}")
     
-    # Standard chunked processing for non-Gemini languages
-    chunks_dir = os.path.join(base_out, "chunks")
-    mkdir_p(chunks_dir)
-    tts_dir = os.path.join(base_out, "tts")
-    mkdir_p(tts_dir)
-
-    job_context = get_job_context(course_id, source, target)
-    logger.info("Job context loaded.")
-
-    # Split video
-    chunk_meta_list = split_video(
+    # Build manifest
+    build_manifest(
+        job_id=job_id,
+        mode=mode,
+        source=source,
+        target=target,
+        course_id=course_id,
         input_path=input_path,
-        output_dir=chunks_dir,
-        chunk_length=CHUNK_LENGTH_SECONDS,
-        overlap=CHUNK_OVERLAP_SECONDS,
+        chunks=chunks_metadata,
+        output_dir=base_out,
+        final_audio=final_audio,
+        final_video=final_video,
+        cloudinary_url=cloudinary_url,
+        extra=extra,
     )
+    return os.path.join(base_out, "manifest.json")
 
-    # Process chunks in parallel
-    results: List[Dict[str, Any]] = []
-    workers = get_worker_count()
-    logger.info(f"Processing {len(chunk_meta_list)} chunks with {workers} workers")
-    with ProcessPoolExecutor(max_workers=workers) as executor:
-        futures = {
-            executor.submit(
-                process_chunk,
-                meta,
-                source,
-                target,
-                mode,
-                job_context,
-                tts_dir,
-                translation_model,
-            ): meta["index"]
-            for meta in chunk_meta_list
-        }
-        for fut in as_completed(futures):
-            try:
-                res = fut.result()
-                results.append(res)
-            except Exception as e:
-                logger.error(f"Chunk processing failed: {e}")
 
+def _publish_chunked(
+    input_path: str,
+    source: str,
+    target: str,
+    job_id: str,
+    course_id: str,
+    mode: str,
+    base_out: str,
+    results: List[Dict[str, Any]],
+    upload_english_subtitles: bool = True,
+    extra: Dict[str, Any] | None = None,
+    upload_id: str | None = None,
+) -> str:
+    """Sync the per-chunk TTS audio to the source, merge/upload it and write the manifest.
+
+    ``upload_id`` is the Cloudinary video id (defaults to ``job_id``); multi-target
+    branches upload under their parent job so every language lands on the same video.
+    """
+    upload_id = upload_id or job_id
     # Sort results by chunk index
     results.sort(key=lambda x: x["index"]) 
     
     # Global audio synchronization
     video_duration = get_duration(input_path)
     audio_paths = [Path(r["audio_path"]) for r in results]
-    final_audio_path = Path(base_out) / "final_audio.wav"
     
     if not audio_paths:
         logger.error("No audio chunks generated! Skipping audio sync.")
         # Create a dummy silent audio or just fail gracefully?
         # For now, let's raise an error but with a better message, or return early
         raise RuntimeError("Localization failed: No audio chunks were generated.")
-        
-    concatenate_and_stretch(audio_paths, video_duration, final_audio_path)
 
     # 🎵 Detect if input is audio-only (no video stream)
-    def has_video_stream(file_path: str) -> bool:
-        """Check if file has video stream using ffprobe"""
-        cmd = [
-            FFPROBE,
-            "-v", "error",
-            "-select_streams", "v:0",
-            "-show_entries", "stream=codec_type",
-            "-of", "default=noprint_wrappers=1:nokey=1",
-            file_path
-        ]
-        try:
-            out = subprocess.check_output(cmd, stderr=subprocess.STDOUT)
-            return b"video" in out.lower()
-        except:
-            return False
-
     is_audio_only = not has_video_stream(input_path)
+    stretch = True
+    if TTS_SYNC_MODE == "segment":
+        # Every clip lands at its own source timestamp; nothing is stretched globally
+        audio_paths = [Path(render_timeline(results, video_duration, os.path.join(base_out, "timeline.wav")))]
+        stretch = False
+
+    # One ffmpeg pass: concat -> stretch -> single encode, muxed with the copied video
+    final_path = final_output_path(base_out, "final_audio" if is_audio_only else "final_video", not is_audio_only)
+    finish_media(input_path, audio_paths, video_duration, final_path, has_video=not is_audio_only, stretch=stretch)
+    # The dubbed track only exists inside the finished file
+    final_audio_path = final_path
     
     if is_audio_only:
         # 🎵 Audio-only: Upload final audio directly
@@ -331,13 +513,13 @@ def run_job(
         from .cloudinary_uploader import upload_video_to_cloudinary
         cloudinary_url = upload_video_to_cloudinary(
             file_path=str(final_audio_path),
-            video_id=job_id,
+            video_id=upload_id,
             language=target,
             content_type='audio'  # 🎵 Upload as audio
         )
         logger.info(f"📤 Cloudinary URL (audio): {cloudinary_url}")
         
-        manifest = build_manifest(
+        build_manifest(
             job_id=job_id,
             mode=mode,
             source=source,
@@ -349,34 +531,18 @@ def run_job(
             final_audio=str(final_audio_path),
             final_video=None,  # No video for audio-only
             cloudinary_url=cloudinary_url,
+            extra=extra,
         )
     else:
-        # 🎬 Video: Merge audio with video
-        logger.info("🎬 Detected video input, merging audio with video")
-        final_video_path = Path(base_out) / "final_video.mp4"
-        merge_cmd = [
-            FFMPEG,
-            "-y",
-            "-i",
-            input_path,
-            "-i",
-            str(final_audio_path),
-            "-c:v",
-            "copy",
-            "-map",
-            "0:v:0",
-            "-map",
-            "1:a:0",
-            "-shortest",
-            str(final_video_path),
-        ]
-        subprocess.check_call(merge_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT)
+        # 🎬 Video: audio was muxed with the source video by finish_media
+        logger.info("🎬 Detected video input, dubbed track muxed into the video")
+        final_video_path = final_path
 
         # 🚀 Upload to Cloudinary and get URL
         from .cloudinary_uploader import upload_video_to_cloudinary
         cloudinary_url = upload_video_to_cloudinary(
             file_path=str(final_video_path),
-            video_id=job_id,
+            video_id=upload_id,
             language=target,
             content_type='video'
         )
@@ -384,47 +550,29 @@ def run_job(
 
         # 📝 Generate and Upload Subtitles (VTT) - Translated
         vtt_path = os.path.join(base_out, "subtitles.vtt")
-        generate_vtt(results, vtt_path)
+        generate_vtt(_subtitle_cues(results, "text_translated", "text_translated"), vtt_path)
         subtitle_url = upload_video_to_cloudinary(
             file_path=vtt_path,
-            video_id=job_id,
+            video_id=upload_id,
             language=target,
             content_type='subtitle'
         )
         logger.info(f"📝 Subtitle URL ({target}): {subtitle_url}")
 
         # 📝 Generate and Upload English Subtitles (Original)
-        english_vtt_path = os.path.join(base_out, "subtitles_en.vtt")
-        # Create chunks with original text for English VTT
-        english_chunks = []
-        for chunk in results:
-            chunk_start_time = chunk["start"]
-            # 🚀 Use segments if available for fine-grained timestamps
-            if "segments" in chunk and chunk["segments"]:
-                for seg in chunk["segments"]:
-                    english_chunks.append({
-                        "start": chunk_start_time + seg["start"],
-                        "end": chunk_start_time + seg["end"],
-                        "text": seg["text"]
-                    })
-            else:
-                # Fallback to chunk-level text
-                english_chunks.append({
-                    "start": chunk["start"],
-                    "end": chunk["end"],
-                    "text": chunk.get("text_original", chunk.get("text", ""))
-                })
-        
-        generate_vtt(english_chunks, english_vtt_path)
-        english_subtitle_url = upload_video_to_cloudinary(
-            file_path=english_vtt_path,
-            video_id=job_id,
-            language="en",
-            content_type='subtitle'
-        )
-        logger.info(f"📝 English Subtitle URL: {english_subtitle_url}")
-
-        manifest = build_manifest(
+        if upload_english_subtitles:
+            english_vtt_path = os.path.join(base_out, "subtitles_en.vtt")
+            english_chunks = _subtitle_cues(results, "text", "text_original")
+            generate_vtt(english_chunks, english_vtt_path)
+            english_subtitle_url = upload_video_to_cloudinary(
+                file_path=english_vtt_path,
+                video_id=upload_id,
+                language="en",
+                content_type='subtitle'
+            )
+            logger.info(f"📝 English Subtitle URL: {english_subtitle_url}")
+
+        build_manifest(
             job_id=job_id,
             mode=mode,
             source=source,
@@ -437,13 +585,239 @@ def run_job(
             final_video=str(final_video_path),
             cloudinary_url=cloudinary_url,  # 🚀 Store Cloudinary URL in manifest
             subtitle_url=subtitle_url,      # 🚀 Store Subtitle URL in manifest
+            extra=extra,
         )
+    return os.path.join(base_out, "manifest.json")
+
+
+def run_job(
+    input_path: str,
+    source: str,
+    target: str,
+    job_id: str,
+    course_id: str,
+    mode: str = "fast",
+    translation_model: str = TRANSLATION_DEFAULT_MODEL,
+) -> str:
+    start_time = time.time()
+    base_out = os.path.join(os.path.dirname(__file__), "output", job_id)
+    mkdir_p(base_out)
+    
+    # Check if target language requires Gemini (single-pass processing)
+    base_target = target.split("-")[0]
+    if base_target in GEMINI_PREFERRED_LANGS:
+        logger.info(f"Language {target} requires Gemini - using single-pass processing")
+        final_audio, final_video, chunks_metadata = process_full_video(
+            input_path, source, target, job_id, course_id, mode, translation_model, base_out
+        )
+        manifest_path = _publish_single_pass(
+            input_path, source, target, job_id, course_id, mode, base_out,
+            final_audio, final_video, chunks_metadata,
+        )
+        
+        elapsed = time.time() - start_time
+        logger.info(f"Job {job_id} finished (single-pass): chunks=1 mode={mode} time={elapsed:.2f}s")
+        return manifest_path
+    
+    # Standard chunked processing for non-Gemini languages
+    chunks_dir = os.path.join(base_out, "chunks")
+    mkdir_p(chunks_dir)
+    tts_dir = os.path.join(base_out, "tts")
+    mkdir_p(tts_dir)
+
+    job_context = get_job_context(course_id, source, target)
+    logger.info("Job context loaded.")
+    # Load the voice map / voice catalog once, before the localize threads need them
+    logger.info(f"TTS voice for {target}: {resolve_voice(target)}")
+
+    stt_workers = STT_WORKERS or get_worker_count()
+    # Split video (chunk audio stays valid, e.g. in shared memory, until the block exits)
+    with open_chunks(
+        input_path=input_path,
+        output_dir=chunks_dir,
+        chunk_length=CHUNK_LENGTH_SECONDS,
+        overlap=CHUNK_OVERLAP_SECONDS,
+    ) as chunk_meta_list:
+        logger.info(
+            f"Processing {len(chunk_meta_list)} chunks: stt x{stt_workers} (processes), "
+            f"translate x{TRANSLATE_WORKERS}, tts x{TTS_WORKERS} (threads)"
+        )
+        # Each worker loads the Whisper model once up front and reuses it for every chunk it
+        # handles; tasks only carry chunk metadata. STT keeps the cores busy while translation
+        # and TTS overlap their network waits on threads, each stage with its own concurrency.
+        with ProcessPoolExecutor(
+            max_workers=stt_workers,
+            initializer=init_stt_worker,
+            initargs=(mode, course_id, source, target, job_context["version"]),
+        ) as executor:
+            pipeline = StagedPipeline(
+                [
+                    Stage("stt", transcribe_chunk_task, stt_workers, executor=executor),
+                    Stage(
+                        "translate",
+                        lambda r: translate_chunk(r, target, job_context, translation_model),
+                        TRANSLATE_WORKERS,
+                    ),
+                    Stage("tts", lambda r: voice_chunk(r, target, tts_dir), TTS_WORKERS),
+                ],
+                queue_size=PIPELINE_QUEUE_SIZE,
+                key=lambda item: f"chunk {item['index']}",
+            )
+            results = pipeline.run(chunk_meta_list)
+
+    manifest_path = _publish_chunked(input_path, source, target, job_id, course_id, mode, base_out, results)
 
     elapsed = time.time() - start_time
     logger.info(
         f"Job {job_id} finished: chunks={len(results)} mode={mode} time={elapsed:.2f}s"
     )
-    return os.path.join(base_out, "manifest.json")
+    return manifest_path
+
+
+def _target_job_id(job_id: str, target: str) -> str:
+    return f"{job_id}-{target}"
+
+
+def _run_target_branch(
+    input_path: str,
+    source: str,
+    target: str,
+    job_id: str,
+    course_id: str,
+    mode: str,
+    translation_model: str,
+    stt_results: List[Dict[str, Any]],
+    chunks_dir: str,
+    media_duration: float,
+    pool: ThreadPoolExecutor,
+    upload_english_subtitles: bool,
+) -> str:
+    """Localize an already-transcribed job into one target language."""
+    branch_job_id = _target_job_id(job_id, target)
+    branch_out = os.path.join(os.path.dirname(__file__), "output", branch_job_id)
+    mkdir_p(branch_out)
+    job_context = get_job_context(course_id, source, target)
+    extra = {"parent_job_id": job_id, "chunks_dir": chunks_dir}
+
+    if target.split("-")[0] in GEMINI_PREFERRED_LANGS:
+        # Same single-pass treatment as run_job, but on the shared transcript
+        text_original = " ".join(r["text_original"].strip() for r in stt_results)
+        text_clean = " ".join(r["text_clean"].strip() for r in stt_results)
+        segments = [
+            {**seg, "start": r["start"] + seg["start"], "end": r["start"] + seg["end"]}
+            for r in stt_results
+            for seg in r["segments"]
+        ]
+        final_audio, final_video, chunks_metadata = localize_full_transcript(
+            text_original, segments, target, job_context, translation_model, media_duration, branch_out,
+            input_path, text_clean=text_clean,
+        )
+        chunks_metadata[0]["stt_cached"] = all(r.get("stt_cached") for r in stt_results)
+        return _publish_single_pass(
+            input_path, source, target, branch_job_id, course_id, mode, branch_out,
+            final_audio, final_video, chunks_metadata, extra=extra, upload_id=job_id,
+        )
+
+    tts_dir = os.path.join(branch_out, "tts")
+    mkdir_p(tts_dir)
+    futures = [
+        pool.submit(localize_chunk, r, target, job_context, tts_dir, translation_model)
+        for r in stt_results
+    ]
+    results: List[Dict[str, Any]] = []
+    for fut in futures:
+        try:
+            results.append(fut.result())
+        except Exception as e:
+            logger.error(f"[{target}] Chunk localization failed: {e}")
+    return _publish_chunked(
+        input_path, source, target, branch_job_id, course_id, mode, branch_out, results,
+        upload_english_subtitles=upload_english_subtitles, extra=extra, upload_id=job_id,
+    )
+
+
+def run_multi_job(
+    input_path: str,
+    source: str,
+    targets: List[str],
+    job_id: str,
+    course_id: str,
+    mode: str = "fast",
+    translation_model: str = TRANSLATION_DEFAULT_MODEL,
+) -> Dict[str, str]:
+    """Split and transcribe once, then dub the shared transcript into every target.
+
+    Each target is written as its own job under ``output/<job_id>-<target>/`` so the
+    per-job endpoints (manifest, chunks, stats, resynthesize) work unchanged.
+
+    Returns: {target: manifest_path}
+    """
+    start_time = time.time()
+    targets = list(dict.fromkeys(t for t in targets if t))
+    if not targets:
+        raise ValueError("At least one target language is required")
+
+    base_out = os.path.join(os.path.dirname(__file__), "output", job_id)
+    chunks_dir = os.path.join(base_out, "chunks")
+    mkdir_p(chunks_dir)
+
+    # Source-side context (initial prompt, source glossary) does not depend on the target
+    stt_context = get_job_context(course_id, source, targets[0])
+
+    stt_workers = STT_WORKERS or get_worker_count()
+    with open_chunks(
+        input_path=input_path,
+        output_dir=chunks_dir,
+        chunk_length=CHUNK_LENGTH_SECONDS,
+        overlap=CHUNK_OVERLAP_SECONDS,
+    ) as chunk_meta_list:
+        logger.info(f"Transcribing {len(chunk_meta_list)} chunks once for {len(targets)} targets with {stt_workers} workers")
+        # Same STT stage as run_job; the per-target stages run in the branches below
+        with ProcessPoolExecutor(
+            max_workers=stt_workers,
+            initializer=init_stt_worker,
+            initargs=(mode, course_id, source, targets[0], stt_context["version"]),
+        ) as executor:
+            pipeline = StagedPipeline(
+                [Stage("stt", transcribe_chunk_task, stt_workers, executor=executor)],
+                queue_size=PIPELINE_QUEUE_SIZE,
+                key=lambda item: f"chunk {item['index']}",
+            )
+            stt_results = pipeline.run(chunk_meta_list)
+    stt_results.sort(key=lambda x: x["index"])
+    if not stt_results:
+        raise RuntimeError("Localization failed: no chunks were transcribed.")
+
+    media_duration = get_duration(input_path)
+    manifests: Dict[str, str] = {}
+    # Load the voice map / voice catalog once, before the branch threads need them
+    for target in targets:
+        logger.info(f"TTS voice for {target}: {resolve_voice(target)}")
+    # Translation and TTS are network-bound, so branches and their chunks share one thread pool
+    with ThreadPoolExecutor(max_workers=MULTI_TARGET_WORKERS) as chunk_pool, \
+            ThreadPoolExecutor(max_workers=min(len(targets), MULTI_TARGET_BRANCHES)) as branch_pool:
+        branch_futures = {
+            branch_pool.submit(
+                _run_target_branch,
+                input_path, source, target, job_id, course_id, mode, translation_model,
+                stt_results, chunks_dir, media_duration, chunk_pool,
+                i == 0,  # English subtitles are identical for every target; upload once
+            ): target
+            for i, target in enumerate(targets)
+        }
+        for fut in as_completed(branch_futures):
+            target = branch_futures[fut]
+            try:
+                manifests[target] = fut.result()
+            except Exception as e:
+                logger.error(f"Target {target} failed: {e}")
+
+    elapsed = time.time() - start_time
+    logger.info(
+        f"Multi-target job {job_id} finished: chunks={len(stt_results)} "
+        f"targets={len(manifests)}/{len(targets)} mode={mode} time={elapsed:.2f}s"
+    )
+    return manifests
 
 
 def _manifest_path(job_id: str) -> str:
@@ -477,7 +851,8 @@ def reprocess_chunk(job_id: str, chunk_index: int, target_lang: str, mode: str =
     # Locate original chunk audio
     base_out = os.path.join(os.path.dirname(__file__), "output", job_id)
     tts_dir = os.path.join(base_out, "tts")
-    chunks_dir = os.path.join(base_out, "chunks")
+    # Multi-target jobs share the parent job's chunks
+    chunks_dir = m.get("chunks_dir") or os.path.join(base_out, "chunks")
     meta = None
     for c in m.get("chunks", []):
         if int(c.get("index", -1)) == int(chunk_index):
@@ -489,9 +864,15 @@ def reprocess_chunk(job_id: str, chunk_index: int, target_lang: str, mode: str =
         # Start/end unknown here; set to 0
         meta = {"index": int(chunk_index), "start": 0.0, "end": 0.0, "audio_path": audio_path}
 
+    chunk_wav = os.path.join(chunks_dir, f"chunk_{int(chunk_index):04d}.wav")
+    if not os.path.exists(chunk_wav) and meta.get("end", 0.0) > meta.get("start", 0.0):
+        # In-memory jobs never wrote chunk WAVs; decode just this chunk's range from the input
+        mkdir_p(chunks_dir)
+        write_wav(chunk_wav, decode_pcm16(m.get("input_path"), meta["start"], meta["end"] - meta["start"]))
+
     # Re-run processing
     res = process_chunk(
-        chunk_meta={"index": int(chunk_index), "start": meta.get("start", 0.0), "end": meta.get("end", 0.0), "audio_path": os.path.join(chunks_dir, f"chunk_{int(chunk_index):04d}.wav")},
+        chunk_meta={"index": int(chunk_index), "start": meta.get("start", 0.0), "end": meta.get("end", 0.0), "audio_path": chunk_wav},
         source_lang=source,
         target_lang=target_lang,
         mode=mode,
@@ -513,12 +894,46 @@ def reprocess_chunk(job_id: str, chunk_index: int, target_lang: str, mode: str =
 def get_job_stats(job_id: str) -> Dict[str, Any]:
     m = get_manifest(job_id)
     chunks = m.get("chunks", [])
+    stt_hits = sum(1 for c in chunks if c.get("stt_cached"))
+    # Hit/miss counters live in the worker processes; the manifest's per-chunk flags are
+    # the per-job view, the cache itself only reports its size here
+    cache_stats = get_transcript_cache().stats()
+    tm_hits = sum(int(c.get("tm_hits", 0)) for c in chunks)
+    tm_lookups = tm_hits + sum(int(c.get("tm_misses", 0)) for c in chunks)
+    tm_cache_stats = get_translation_memory().stats()
+    speech_chunks = [c for c in chunks if c.get("speech", True)]
+    tts_hits = sum(1 for c in speech_chunks if c.get("tts_cached"))
+    tts_cache_stats = get_tts_cache().stats()
     return {
         "job_id": job_id,
         "chunk_count": len(chunks),
         "mode": m.get("mode"),
         "source_lang": m.get("source_lang"),
         "target_lang": m.get("target_lang"),
+        "transcript_cache": {
+            "job_hits": stt_hits,
+            "job_misses": len(chunks) - stt_hits,
+            "job_hit_rate": round(stt_hits / len(chunks), 3) if chunks else 0.0,
+            "entries": cache_stats["entries"],
+            "size_mb": cache_stats["size_mb"],
+            "max_mb": cache_stats["max_mb"],
+        },
+        "translation_memory": {
+            "job_hits": tm_hits,
+            "job_misses": tm_lookups - tm_hits,
+            "job_hit_rate": round(tm_hits / tm_lookups, 3) if tm_lookups else 0.0,
+            "entries": tm_cache_stats["entries"],
+            "size_mb": tm_cache_stats["size_mb"],
+            "max_mb": tm_cache_stats["max_mb"],
+        },
+        "tts_cache": {
+            "job_hits": tts_hits,
+            "job_misses": len(speech_chunks) - tts_hits,
+            "job_hit_rate": round(tts_hits / len(speech_chunks), 3) if speech_chunks else 0.0,
+            "entries": tts_cache_stats["entries"],
+            "size_mb": tts_cache_stats["size_mb"],
+            "max_mb": tts_cache_stats["max_mb"],
+        },
     }
 
 
@@ -526,12 +941,30 @@ def main():
     parser = argparse.ArgumentParser(description="Localizer - multilingual video localization engine")
     parser.add_argument("--input", required=True, help="Path to input video file")
     parser.add_argument("--source", required=True, help="Source language code (e.g., en)")
-    parser.add_argument("--target", required=True, help="Target language code (e.g., hi)")
+    target_group = parser.add_mutually_exclusive_group(required=True)
+    target_group.add_argument("--target", help="Target language code (e.g., hi)")
+    target_group.add_argument(
+        "--targets",
+        help="Comma-separated target language codes (e.g., hi,ta,te); transcribes once and dubs into each",
+    )
     parser.add_argument("--job", dest="job_id", required=True, help="Job ID")
     parser.add_argument("--course_id", required=True, help="Course identifier")
     parser.add_argument("--mode", choices=list(MODE_CONFIG.keys()), default="fast")
 
     args = parser.parse_args()
+    if args.targets:
+        manifests = run_multi_job(
+            input_path=args.input,
+            source=args.source,
+            targets=[t.strip() for t in args.targets.split(",")],
+            job_id=args.job_id,
+            course_id=args.course_id,
+            mode=args.mode,
+        )
+        for target, manifest_path in manifests.items():
+            print(f"Manifest ({target}): {manifest_path}")
+        return
+
     manifest_path = run_job(
         input_path=args.input,
         source=args.source,
@@ -0,0 +1,105 @@
+import asyncio
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Coroutine, Optional, Tuple, Type, TypeVar
+
+from .utils import setup_logger
+
+logger = setup_logger("async_utils")
+
+T = TypeVar("T")
+
+
+class BackgroundLoop:
+    """An asyncio event loop running forever on a daemon thread.
+
+    Lets synchronous code (ProcessPool workers, FastAPI threadpool handlers) hand
+    coroutines to long-lived async clients without owning a loop itself.
+    """
+
+    def __init__(self, name: str):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> "Future[T]":
+        """Schedule *coro* on the loop; returns a concurrent.futures.Future."""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: Optional[float] = None) -> T:
+        """Run *coro* on the loop and block the calling thread until it finishes."""
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("BackgroundLoop.run() called from its own loop thread")
+        return self.submit(coro).result(timeout)
+
+
+_LOOPS: dict = {}
+_LOOPS_LOCK = threading.Lock()
+
+
+def get_background_loop(name: str = "localizer-io") -> BackgroundLoop:
+    """Per-process named loop (a forked worker never reuses its parent's loop thread)."""
+    key = (name, os.getpid())
+    with _LOOPS_LOCK:
+        loop = _LOOPS.get(key)
+        if loop is None:
+            loop = BackgroundLoop(name)
+            _LOOPS[key] = loop
+        return loop
+
+
+class TokenBucket:
+    """Async token bucket: at most *rate* acquisitions per second, bursts up to *capacity*.
+
+    A rate of 0 or less disables limiting. Must be used from a single event loop.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+async def retry_with_jitter(
+    fn: Callable[[], Awaitable[T]],
+    attempts: int = 3,
+    base_delay: float = 0.5,
+    max_delay: float = 8.0,
+    retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+    label: str = "call",
+) -> T:
+    """Await ``fn()`` up to *attempts* times with full-jitter exponential backoff."""
+    for attempt in range(1, attempts + 1):
+        try:
+            return await fn()
+        except retry_on as e:
+            if attempt >= attempts:
+                raise
+            delay = random.uniform(0, min(max_delay, base_delay * (2 ** (attempt - 1))))
+            logger.warning(f"{label} failed (attempt {attempt}/{attempts}): {e}; retrying in {delay:.2f}s")
+            await asyncio.sleep(delay)
+    raise RuntimeError("unreachable")
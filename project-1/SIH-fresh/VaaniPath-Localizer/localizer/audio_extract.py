@@ -0,0 +1,198 @@
+import glob
+import mmap
+import os
+import subprocess
+import wave
+from contextlib import contextmanager
+from multiprocessing import shared_memory
+from typing import Dict, Iterator, List, Optional, Union
+
+import numpy as np
+
+try:
+    import _posixshmem  # POSIX shared memory primitives behind multiprocessing.shared_memory
+except ImportError:
+    _posixshmem = None
+
+from .config import SAMPLE_RATE
+from .media_probe import probe_duration
+from .utils import mkdir_p, setup_logger, FFMPEG
+
+logger = setup_logger("audio_extract")
+
+# Every chunk the pipeline works on is 16 kHz mono signed 16-bit PCM
+_PCM_ARGS = ["-vn", "-ac", "1", "-ar", str(SAMPLE_RATE)]
+
+
+def decode_pcm16(input_path: str, start: float | None = None, duration: float | None = None) -> np.ndarray:
+    """Decode the input's audio track (optionally a [start, start+duration) range) to
+    16 kHz mono int16 samples in one ffmpeg pass."""
+    seek = ["-ss", f"{start:.3f}"] if start else []
+    limit = ["-t", f"{duration:.3f}"] if duration else []
+    cmd = [FFMPEG, "-v", "error", *seek, "-i", input_path, *limit, *_PCM_ARGS, "-f", "s16le", "-"]
+    try:
+        out = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True).stdout
+    except subprocess.CalledProcessError as e:
+        logger.error(f"ffmpeg audio decode failed: {e.stderr.decode(errors='ignore')}")
+        raise
+    return np.frombuffer(out, dtype=np.int16)
+
+
+def write_wav(path: str, samples: np.ndarray) -> str:
+    with wave.open(path, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(SAMPLE_RATE)
+        w.writeframes(samples.tobytes())
+    return path
+
+
+def write_chunk_wavs(samples: np.ndarray, output_dir: str, spans: List[Dict]) -> List[Dict]:
+    """Slice already-decoded samples into ``chunk_XXXX.wav`` files, one per span.
+
+    *spans* are dicts with ``start``/``end`` in seconds (extra keys are kept).
+    Returns chunk metadata in the shape ``process_chunk`` expects.
+    """
+    mkdir_p(output_dir)
+    chunks = []
+    for i, span in enumerate(spans):
+        out_audio = os.path.join(output_dir, f"chunk_{i:04d}.wav")
+        s0, s1 = int(span["start"] * SAMPLE_RATE), int(span["end"] * SAMPLE_RATE)
+        write_wav(out_audio, samples[s0:s1])
+        chunks.append({**span, "index": i, "audio_path": out_audio})
+    return chunks
+
+
+def segment_to_wavs(input_path: str, output_dir: str, chunk_length: float) -> List[Dict]:
+    """Decode and cut the input into fixed-length WAV chunks with a single ffmpeg process.
+
+    Uses the ``segment`` muxer, so nothing is held in memory; chunks cannot overlap.
+    Start/end times come from the written WAV headers, so they match the audio exactly.
+    """
+    mkdir_p(output_dir)
+    for stale in glob.glob(os.path.join(output_dir, "chunk_*.wav")):
+        os.remove(stale)
+    cmd = [
+        FFMPEG,
+        "-y",
+        "-v",
+        "error",
+        "-i",
+        input_path,
+        *_PCM_ARGS,
+        "-c:a",
+        "pcm_s16le",
+        "-f",
+        "segment",
+        "-segment_time",
+        f"{chunk_length:.3f}",
+        "-reset_timestamps",
+        "1",
+        os.path.join(output_dir, "chunk_%04d.wav"),
+    ]
+    try:
+        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True)
+    except subprocess.CalledProcessError as e:
+        logger.error(f"ffmpeg segment extraction failed: {e.stderr.decode(errors='ignore')}")
+        raise
+
+    chunks = []
+    t = 0.0
+    for i, path in enumerate(sorted(glob.glob(os.path.join(output_dir, "chunk_*.wav")))):
+        dur = probe_duration(path)
+        chunks.append({"index": i, "start": t, "end": t + dur, "audio_path": path})
+        t += dur
+    return chunks
+
+
+def to_float32(samples: np.ndarray) -> np.ndarray:
+    """int16 PCM -> float32 in [-1, 1), the layout faster-whisper consumes directly."""
+    return samples.astype(np.float32) / 32768.0
+
+
+def _shm_room(size: int) -> bool:
+    """Whether /dev/shm (where POSIX shared memory lives) has *size* bytes free.
+
+    tmpfs allocates lazily, so an oversized segment is created fine and only fails with
+    SIGBUS once written (Docker's default /dev/shm is 64 MB).
+    """
+    try:
+        st = os.statvfs("/dev/shm")
+    except (AttributeError, OSError):
+        return True
+    return size <= st.f_bavail * st.f_frsize
+
+
+@contextmanager
+def shared_pcm(samples: np.ndarray) -> Iterator[Optional[str]]:
+    """Publish decoded int16 samples as a read-only buffer in shared memory.
+
+    Yields the segment name that workers pass to :func:`read_pcm_window`, or None when
+    shared memory is too small or unavailable (callers then fall back to chunk files).
+    The segment is unlinked when the block exits, so keep it open until every worker is done.
+    """
+    size = max(1, len(samples)) * np.dtype(np.int16).itemsize
+    shm = None
+    if _shm_room(size):
+        try:
+            shm = shared_memory.SharedMemory(create=True, size=size)
+        except OSError as e:
+            logger.warning(f"Shared memory unavailable ({e})")
+    if shm is None:
+        yield None
+        return
+    try:
+        buf = np.ndarray((len(samples),), dtype=np.int16, buffer=shm.buf)
+        buf[:] = samples
+        del buf
+        yield shm.name
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+def read_pcm_window(name: str, offset: int, length: int) -> np.ndarray:
+    """Copy an int16 window of a :func:`shared_pcm` segment out as float32.
+
+    On POSIX the segment is mapped read-only straight from /dev/shm, bypassing
+    SharedMemory so the worker never registers it with a resource tracker (which would
+    warn about a "leak" or unlink it when the worker exits); the mapping is closed
+    before returning.
+    """
+    if _posixshmem is None:
+        shm = shared_memory.SharedMemory(name=name)
+        try:
+            view = np.ndarray((offset + length,), dtype=np.int16, buffer=shm.buf)
+            window = to_float32(view[offset:offset + length])
+            del view
+            return window
+        finally:
+            shm.close()
+    fd = _posixshmem.shm_open("/" + name.lstrip("/"), os.O_RDONLY, mode=0o600)
+    try:
+        mm = mmap.mmap(fd, os.fstat(fd).st_size, prot=mmap.PROT_READ)
+    finally:
+        os.close(fd)
+    try:
+        return to_float32(np.frombuffer(mm, dtype=np.int16, count=length, offset=offset * 2))
+    finally:
+        mm.close()
+
+
+def pcm_chunk_meta(index: int, span: Dict, shm_name: str, total: int) -> Dict:
+    """Chunk metadata that points at an (offset, length) window of a shared PCM buffer."""
+    offset = min(int(span["start"] * SAMPLE_RATE), total)
+    end = min(int(span["end"] * SAMPLE_RATE), total)
+    return {
+        **span,
+        "index": index,
+        "pcm": {"shm": shm_name, "offset": offset, "length": end - offset, "total": total},
+    }
+
+
+def load_chunk_audio(chunk_meta: Dict) -> Union[str, np.ndarray]:
+    """Return what STT should read for a chunk: a float32 copy of its shared-memory window, or the chunk WAV path."""
+    pcm = chunk_meta.get("pcm")
+    if pcm:
+        return read_pcm_window(pcm["shm"], pcm["offset"], pcm["length"])
+    return chunk_meta["audio_path"]
@@ -1,67 +1,100 @@
-import os
 from pathlib import Path
-from typing import List
+from typing import Sequence, Union
 import subprocess
-import logging
 
+from .config import FINAL_AUDIO_BITRATE, FINAL_AUDIO_CODEC, TIMELINE_SAMPLE_RATE
 from .utils import setup_logger, FFMPEG
-from .audio_utils import get_duration, time_stretch_audio
+from .audio_utils import _build_atempo_chain, get_duration
 
 logger = setup_logger("audio_sync")
 
-def concatenate_and_stretch(audio_paths: List[Path], target_duration: float, output_path: Path) -> Path:
-    """Concatenate a list of audio files and stretch them to match *target_duration*.
+# FINAL_AUDIO_CODEC -> (ffmpeg encoder, container extension for audio-only output)
+_CODECS = {
+    "aac": ("aac", ".m4a"),
+    "opus": ("libopus", ".ogg"),
+}
+# Opus only encodes 48 kHz; AAC is fine there too, so the output rate is fixed
+_OUTPUT_RATE = 48000
 
-    Steps:
-    1. Create a temporary ``concat.txt`` file listing the inputs for ffmpeg.
-    2. Use ffmpeg ``-f concat`` to merge them into a single intermediate file.
-    3. Compute the stretch ratio (source_duration / target_duration).
-    4. Call :func:`audio_utils.time_stretch_audio` to apply a single atempo chain.
-    5. Return the path to the stretched audio file.
-    """
-    # Ensure all paths are absolute strings
-    audio_paths = [Path(p).resolve() for p in audio_paths]
-    if not audio_paths:
-        raise ValueError("No audio files provided for concatenation")
 
-    # 1. Write concat list
-    concat_file = output_path.parent / "concat.txt"
-    with open(concat_file, "w", encoding="utf-8") as f:
-        for p in audio_paths:
-            f.write(f"file '{p.as_posix()}'\n")
+def final_output_path(base_out: Union[str, Path], stem: str, has_video: bool) -> Path:
+    """``<stem>.mp4`` for video input, else ``<stem>`` + the audio-only extension of FINAL_AUDIO_CODEC."""
+    ext = ".mp4" if has_video else _CODECS.get(FINAL_AUDIO_CODEC, _CODECS["aac"])[1]
+    return Path(base_out) / f"{stem}{ext}"
 
-    intermediate = output_path.parent / "intermediate.wav"
-    # 2. Concatenate using ffmpeg
-    cmd_concat = [
-        FFMPEG,
-        "-y",
-        "-f",
-        "concat",
-        "-safe",
-        "0",
-        "-i",
-        str(concat_file),
-        "-c",
-        "copy",
-        str(intermediate),
+
+def build_finish_filter(n_inputs: int, first_input: int, ratio: float, target_duration: float) -> str:
+    """concat -> atempo -> aformat over audio inputs ``first_input .. first_input + n_inputs - 1``.
+
+    Every input is normalized to mono float PCM at the timeline rate before the concat, so
+    MP3 and WAV clips mix freely, and the result is padded/trimmed to exactly
+    *target_duration* so the track never ends early or runs past the picture.
+    """
+    fmt = f"aformat=sample_fmts=flt:sample_rates={TIMELINE_SAMPLE_RATE}:channel_layouts=mono"
+    parts = [f"[{first_input + i}:a]{fmt}[a{i}]" for i in range(n_inputs)]
+    head = "".join(f"[a{i}]" for i in range(n_inputs)) + f"concat=n={n_inputs}:v=0:a=1"
+    chain = [head]
+    if abs(ratio - 1.0) >= 0.01:
+        chain.append(_build_atempo_chain(ratio))
+    chain += [
+        f"apad=whole_dur={target_duration:.6f}",
+        f"atrim=end={target_duration:.6f}",
+        f"aformat=sample_fmts=fltp:sample_rates={_OUTPUT_RATE}:channel_layouts=mono",
     ]
-    logger.info("Concatenating %d audio chunks", len(audio_paths))
-    subprocess.check_call(cmd_concat, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT)
+    return ";".join(parts + [",".join(chain) + "[aout]"])
 
-    # 3. Compute source duration
-    src_dur = get_duration(str(intermediate))
-    if src_dur <= 0:
-        raise RuntimeError(f"Failed to obtain duration of concatenated audio {intermediate}")
 
-    # 4. Stretch to target duration
-    stretched = time_stretch_audio(str(intermediate), target_duration, str(output_path))
-    logger.info("Created stretched audio %s (target %.2fs)", stretched, target_duration)
+def finish_media(
+    input_path: str,
+    audio_paths: Sequence[Union[str, Path]],
+    target_duration: float,
+    output_path: Union[str, Path],
+    has_video: bool = True,
+    stretch: bool = True,
+) -> Path:
+    """Concatenate the dubbed clips, fit them to *target_duration* and mux with the source video
+    in a single ffmpeg run.
+
+    The clips are decoded straight into one filtergraph (see :func:`build_finish_filter`),
+    so the audio stays PCM until the one FINAL_AUDIO_CODEC encode; the video stream is
+    copied and the MP4 gets ``+faststart``. With ``stretch=False`` (a rendered timeline
+    that already has the right length) no tempo is applied. Audio-only input (*has_video*
+    False) produces just the encoded track, e.g. ``final_audio.m4a``.
+    """
+    audio_paths = [Path(p).resolve() for p in audio_paths]
+    if not audio_paths:
+        raise ValueError("No audio files provided for concatenation")
+    if target_duration <= 0:
+        raise ValueError(f"Invalid target duration {target_duration} for {input_path}")
+
+    ratio = 1.0
+    if stretch:
+        # Header reads (MP3 frame walk / WAV header): no decode pass and no extra spawn
+        src_dur = sum(get_duration(str(p)) for p in audio_paths)
+        if src_dur <= 0:
+            raise RuntimeError("Failed to obtain the duration of the dubbed audio clips")
+        ratio = src_dur / target_duration
 
-    # Cleanup temporary files
-    try:
-        os.remove(concat_file)
-        os.remove(intermediate)
-    except OSError:
-        pass
+    encoder = _CODECS.get(FINAL_AUDIO_CODEC, _CODECS["aac"])[0]
+    cmd = [FFMPEG, "-y", "-v", "error"]
+    if has_video:
+        cmd += ["-i", input_path]
+    for p in audio_paths:
+        cmd += ["-i", str(p)]
+    first = 1 if has_video else 0
+    cmd += ["-filter_complex", build_finish_filter(len(audio_paths), first, ratio, target_duration)]
+    if has_video:
+        cmd += ["-map", "0:v:0", "-c:v", "copy"]
+    cmd += ["-map", "[aout]", "-c:a", encoder, "-b:a", FINAL_AUDIO_BITRATE]
+    if str(output_path).endswith(".mp4"):
+        cmd += ["-movflags", "+faststart"]
+    if has_video:
+        cmd += ["-shortest"]
+    cmd.append(str(output_path))
 
-    return Path(stretched)
+    logger.info(
+        f"Finishing {len(audio_paths)} audio clip(s) to {target_duration:.2f}s "
+        f"(ratio {ratio:.3f}, {encoder}) in one pass: {output_path}"
+    )
+    subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True)
+    return Path(output_path)
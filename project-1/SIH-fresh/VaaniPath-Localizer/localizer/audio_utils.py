@@ -1,31 +1,82 @@
+import hashlib
 import os
 import subprocess
-from typing import List
+import wave
+from typing import List, Union
 
-from .utils import setup_logger, FFMPEG, FFPROBE
+import numpy as np
+
+from .config import SAMPLE_RATE, TIMELINE_SAMPLE_RATE, TSM_ENGINE, TSM_QUALITY
+from .media_probe import MEDIA_PROBE
+from .tsm import fit_length, wsola
+from .utils import setup_logger, FFMPEG
 
 logger = setup_logger("audio_utils")
 
 
 def get_duration(path: str) -> float:
-    cmd = [
-        FFPROBE,
-        "-v",
-        "error",
-        "-show_entries",
-        "format=duration",
-        "-of",
-        "default=noprint_wrappers=1:nokey=1",
-        path,
-    ]
+    """Duration in seconds via the shared MediaProbe (header parse or one cached ffprobe)."""
     try:
-        out = subprocess.check_output(cmd, stderr=subprocess.STDOUT)
-        return float(out.decode().strip())
+        return MEDIA_PROBE.duration(path)
     except Exception as e:
         logger.error(f"Failed to get duration for {path}: {e}")
         return 0.0
 
 
+def pcm_sha256(audio: Union[str, np.ndarray]) -> str:
+    """Hash the PCM frames of a WAV file (header excluded), or the raw bytes of any other file.
+
+    Chunk WAVs are always decoded to 16 kHz mono s16le, so identical audio hashes identically
+    regardless of which job or container it came from. In-memory float32 chunks (see
+    ``audio_extract.shared_pcm``) are hashed as the same s16le frames, so both transports
+    share cache entries.
+    """
+    h = hashlib.sha256()
+    if isinstance(audio, np.ndarray):
+        pcm16 = np.clip(np.rint(audio * 32768.0), -32768, 32767).astype("<i2")
+        h.update(f"{SAMPLE_RATE}:1:2:".encode())
+        h.update(pcm16.tobytes())
+        return h.hexdigest()
+    path = audio
+    try:
+        with wave.open(path, "rb") as w:
+            h.update(f"{w.getframerate()}:{w.getnchannels()}:{w.getsampwidth()}:".encode())
+            while True:
+                frames = w.readframes(1 << 16)
+                if not frames:
+                    break
+                h.update(frames)
+        return h.hexdigest()
+    except (wave.Error, EOFError):
+        pass
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def write_silence(output_audio: str, duration: float) -> str:
+    """Write *duration* seconds of silence in the same format as the TTS clips (24 kHz mono MP3)."""
+    cmd = [
+        FFMPEG,
+        "-y",
+        "-f",
+        "lavfi",
+        "-i",
+        "anullsrc=r=24000:cl=mono",
+        "-t",
+        f"{max(duration, 0.05):.3f}",
+        "-c:a",
+        "libmp3lame",
+        "-b:a",
+        "48k",
+        output_audio,
+    ]
+    subprocess.check_call(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT)
+    return output_audio
+
+
 def _build_atempo_chain(ratio: float) -> str:
     # We want to change speed by factor 'ratio'. atempo supports 0.5..2.0 per stage
     if abs(ratio - 1.0) < 0.01:
@@ -46,6 +97,77 @@ def _build_atempo_chain(ratio: float) -> str:
     return ",".join([f"atempo={s:.6f}" for s in stages])
 
 
+def read_wav_float32(path: str) -> tuple[np.ndarray, int] | None:
+    """Mono float32 samples and rate of a 16-bit PCM WAV without spawning ffmpeg, or None
+    if the file is anything else (compressed payload, other sample width, not a WAV)."""
+    try:
+        with wave.open(path, "rb") as w:
+            if w.getsampwidth() != 2 or w.getcomptype() != "NONE":
+                return None
+            rate, channels = w.getframerate(), w.getnchannels()
+            pcm = np.frombuffer(w.readframes(w.getnframes()), dtype="<i2")
+    except (wave.Error, EOFError, OSError):
+        return None
+    if channels > 1:
+        pcm = pcm[: len(pcm) // channels * channels].reshape(-1, channels).mean(axis=1)
+    return pcm.astype(np.float32) / 32768.0, rate
+
+
+def decode_audio(path: str, sample_rate: int = TIMELINE_SAMPLE_RATE) -> np.ndarray:
+    """Decode any audio file to mono float32 at *sample_rate* in one ffmpeg pass."""
+    cmd = [FFMPEG, "-v", "error", "-i", path, "-ac", "1", "-ar", str(sample_rate), "-f", "f32le", "-"]
+    try:
+        out = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True).stdout
+    except subprocess.CalledProcessError as e:
+        logger.error(f"ffmpeg decode of {path} failed: {e.stderr.decode(errors='ignore')}")
+        raise
+    return np.frombuffer(out, dtype=np.float32)
+
+
+def resample(samples: np.ndarray, rate: int, sample_rate: int) -> np.ndarray:
+    """Linear-interpolation resample of mono float32 samples from *rate* to *sample_rate*."""
+    if rate == sample_rate or not len(samples):
+        return samples
+    n = int(round(len(samples) * sample_rate / rate))
+    positions = np.arange(n, dtype=np.float64) * (rate / sample_rate)
+    return np.interp(positions, np.arange(len(samples)), samples).astype(np.float32)
+
+
+def load_audio(path: str, sample_rate: int = TIMELINE_SAMPLE_RATE) -> np.ndarray:
+    """Mono float32 at *sample_rate*: 16-bit WAVs are read in-process (resampled only if
+    their rate differs), anything else goes through :func:`decode_audio`."""
+    if path.lower().endswith(".wav"):
+        loaded = read_wav_float32(path)
+        if loaded is not None:
+            return resample(loaded[0], loaded[1], sample_rate)
+    return decode_audio(path, sample_rate)
+
+
+def write_pcm16_wav(path: str, samples: np.ndarray, sample_rate: int, block: int = 1 << 20) -> str:
+    """Write float32 samples as 16-bit PCM WAV, converting in blocks (memmaps stay paged out)."""
+    with wave.open(path, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        for i in range(0, len(samples), block):
+            chunk = np.clip(samples[i:i + block], -1.0, 1.0 - 1.0 / 32768)
+            w.writeframes((chunk * 32768.0).astype("<i2").tobytes())
+    return path
+
+
+def _time_stretch_wsola(input_audio: str, target_duration: float, output_audio: str) -> str:
+    loaded = read_wav_float32(input_audio)
+    if loaded is None:
+        loaded = decode_audio(input_audio, TIMELINE_SAMPLE_RATE), TIMELINE_SAMPLE_RATE
+    samples, rate = loaded
+    target_len = int(round(target_duration * rate))
+    ratio = len(samples) / target_len if target_len else 1.0
+    stretched = fit_length(wsola(samples, ratio, rate, TSM_QUALITY), target_len)
+    write_pcm16_wav(output_audio, stretched, rate)
+    logger.info(f"Time-stretched audio to {target_duration:.2f}s in-process (ratio {ratio:.2f}, {TSM_QUALITY}): {output_audio}")
+    return output_audio
+
+
 def time_stretch_audio(input_audio: str, target_duration: float, output_audio: str) -> str:
     src_dur = get_duration(input_audio)
     if src_dur <= 0.0:
@@ -54,6 +176,13 @@ def time_stretch_audio(input_audio: str, target_duration: float, output_audio: s
         shutil.copy2(input_audio, output_audio)
         return output_audio
         
+    if TSM_ENGINE == "wsola" and target_duration > 0 and output_audio.endswith(".wav"):
+        # PCM output: stretch in-process (no ffmpeg spawn for WAV input) with an exact length
+        try:
+            return _time_stretch_wsola(input_audio, target_duration, output_audio)
+        except Exception as e:
+            logger.warning(f"In-process time stretch failed ({e}); using ffmpeg atempo")
+
     ratio = src_dur / target_duration
     
     # Safety check: if ratio is too extreme, clamp it or warn?
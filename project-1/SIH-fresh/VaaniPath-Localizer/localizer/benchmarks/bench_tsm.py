@@ -0,0 +1,84 @@
+"""Benchmark: in-process WSOLA (tsm.py) vs. spawning ffmpeg atempo per clip.
+
+Stretches a batch of synthetic speech-like clips (voiced harmonics with a syllable-rate
+envelope) at several tempos and reports throughput and output-duration error.
+
+    python -m localizer.benchmarks.bench_tsm [--clips 100] [--seconds 3] [--rate 24000]
+"""
+import argparse
+import os
+import subprocess
+import tempfile
+import time
+
+import numpy as np
+
+from ..audio_utils import _build_atempo_chain, read_wav_float32, write_pcm16_wav
+from ..tsm import QUALITY_PRESETS, wsola
+from ..utils import FFMPEG
+
+TEMPOS = [0.85, 1.1, 1.25, 1.5]
+
+
+def synth_clip(seconds: float, rate: int, seed: int) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(seconds * rate)) / rate
+    f0 = 110 + 40 * rng.random() + 15 * np.sin(2 * np.pi * 0.7 * t)
+    phase = 2 * np.pi * np.cumsum(f0) / rate
+    voiced = sum(np.sin(h * phase) / h for h in range(1, 8))
+    envelope = np.clip(np.sin(2 * np.pi * 4 * t + rng.random() * 6), 0, None) ** 0.5
+    noise = 0.02 * rng.standard_normal(len(t))
+    return (0.25 * voiced * envelope + noise).astype(np.float32)
+
+
+def ffmpeg_atempo(path: str, out_path: str, tempo: float) -> np.ndarray:
+    cmd = [FFMPEG, "-y", "-v", "error", "-i", path, "-filter:a", _build_atempo_chain(tempo), "-c:a", "pcm_s16le", out_path]
+    subprocess.check_call(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT)
+    return read_wav_float32(out_path)[0]
+
+
+def _report(name: str, seconds: float, audio_seconds: float, errors_ms: list) -> None:
+    errors = np.abs(np.array(errors_ms))
+    print(
+        f"{name:<16} {seconds:8.3f} s  {audio_seconds / seconds:9.1f}x realtime  "
+        f"duration error mean {errors.mean():6.2f} ms  max {errors.max():6.2f} ms"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark WSOLA time stretching against ffmpeg atempo")
+    parser.add_argument("--clips", type=int, default=100, help="Clips per tempo")
+    parser.add_argument("--seconds", type=float, default=3.0, help="Clip length")
+    parser.add_argument("--rate", type=int, default=24000)
+    args = parser.parse_args()
+
+    clips = [synth_clip(args.seconds, args.rate, i) for i in range(args.clips)]
+    audio_seconds = args.clips * args.seconds * len(TEMPOS)
+    print(f"clips={args.clips} x {args.seconds}s x tempos {TEMPOS} at {args.rate} Hz ({audio_seconds:.0f}s of audio)")
+
+    for quality in QUALITY_PRESETS:
+        errors = []
+        t0 = time.perf_counter()
+        for tempo in TEMPOS:
+            for clip in clips:
+                out = wsola(clip, tempo, args.rate, quality)
+                errors.append((len(out) - len(clip) / tempo) / args.rate * 1000)
+        _report(f"wsola/{quality}", time.perf_counter() - t0, audio_seconds, errors)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = []
+        for i, clip in enumerate(clips):
+            paths.append(os.path.join(tmp, f"clip_{i:04d}.wav"))
+            write_pcm16_wav(paths[-1], clip, args.rate)
+        out_path = os.path.join(tmp, "out.wav")
+        errors = []
+        t0 = time.perf_counter()
+        for tempo in TEMPOS:
+            for path, clip in zip(paths, clips):
+                out = ffmpeg_atempo(path, out_path, tempo)
+                errors.append((len(out) - len(clip) / tempo) / args.rate * 1000)
+        _report("ffmpeg atempo", time.perf_counter() - t0, audio_seconds, errors)
+
+
+if __name__ == "__main__":
+    main()
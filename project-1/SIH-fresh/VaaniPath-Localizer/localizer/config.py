@@ -47,5 +47,100 @@ MODE_CONFIG = {
 # Allow env override for the translation model (e.g., "llm", "google", "indictrans2")
 TRANSLATION_DEFAULT_MODEL = os.environ.get("TRANSLATION_MODEL", "google")
 
+# Local IndicTrans2 engine (TRANSLATION_MODEL=indictrans2): a CTranslate2-converted model
+# directory with its SentencePiece models. Falls back to Google when unset or unloadable.
+INDICTRANS2_MODEL_DIR = os.environ.get("INDICTRANS2_MODEL_DIR", "")
+INDICTRANS2_SOURCE_LANG = os.environ.get("INDICTRANS2_SOURCE_LANG", "en")
+INDICTRANS2_BATCH_SIZE = int(os.environ.get("INDICTRANS2_BATCH_SIZE", "32"))
+INDICTRANS2_BEAM_SIZE = int(os.environ.get("INDICTRANS2_BEAM_SIZE", "4"))
+# 0 lets CTranslate2 pick its default thread count
+INDICTRANS2_THREADS = int(os.environ.get("INDICTRANS2_THREADS", "0"))
+
 CHUNK_LENGTH_SECONDS = 30.0
 CHUNK_OVERLAP_SECONDS = 0.0
+# "fixed" cuts every CHUNK_LENGTH_SECONDS (the long-standing behaviour); "silence" (opt-in)
+# cuts at pauses near CHUNK_LENGTH_SECONDS (within MIN..MAX) and skips non-speech chunks
+CHUNK_STRATEGY = os.environ.get("CHUNK_STRATEGY", "fixed")
+CHUNK_MIN_SECONDS = 20.0
+CHUNK_MAX_SECONDS = 40.0
+# Chunks with less voiced audio than this skip STT, translation and TTS
+MIN_SPEECH_SECONDS = 0.5
+# Pauses at least this long become their own (non-speech) chunks
+LONG_SILENCE_SECONDS = 3.0
+# All chunk audio is decoded to 16 kHz mono PCM
+SAMPLE_RATE = 16000
+# How chunk audio reaches the STT workers: "shared_memory" (one decoded int16 buffer,
+# workers copy offset/length windows out; falls back to files when /dev/shm is too small)
+# or "files" (one WAV per chunk)
+PCM_TRANSPORT = os.environ.get("PCM_TRANSPORT", "shared_memory")
+
+# Multi-target jobs: how many target languages are localized at once, and the shared
+# thread pool size for their (network-bound) translation + TTS chunk work
+MULTI_TARGET_BRANCHES = int(os.environ.get("MULTI_TARGET_BRANCHES", "4"))
+MULTI_TARGET_WORKERS = int(os.environ.get("MULTI_TARGET_WORKERS", "8"))
+
+# Whisper model cache (per process). Budget is an estimate of resident model memory in MB;
+# the most recently used model is always kept even if it alone exceeds the budget.
+WHISPER_CACHE_BUDGET_MB = int(os.environ.get("WHISPER_CACHE_BUDGET_MB", "4096"))
+# 0 lets CTranslate2 pick its default thread count
+WHISPER_CPU_THREADS = int(os.environ.get("WHISPER_CPU_THREADS", "0"))
+# Media probe results kept per process (least recently used dropped first)
+MEDIA_PROBE_CACHE_SIZE = int(os.environ.get("MEDIA_PROBE_CACHE_SIZE", "4096"))
+
+# On-disk caches shared by all jobs on this host
+CACHE_DIR = os.environ.get("LOCALIZER_CACHE_DIR", os.path.join(os.path.dirname(__file__), "cache"))
+# Transcript cache: (audio hash, source lang, whisper config, initial prompt) -> (text, segments)
+TRANSCRIPT_CACHE_ENABLED = os.environ.get("TRANSCRIPT_CACHE", "1") != "0"
+TRANSCRIPT_CACHE_MAX_MB = int(os.environ.get("TRANSCRIPT_CACHE_MAX_MB", "256"))
+# Translation memory: (sentence hash, target lang, model, glossary version, style guide) -> translation
+TRANSLATION_MEMORY_ENABLED = os.environ.get("TRANSLATION_MEMORY", "1") != "0"
+TRANSLATION_MEMORY_MAX_MB = int(os.environ.get("TRANSLATION_MEMORY_MAX_MB", "128"))
+# TTS clip cache: (spoken text after overrides, engine, voice, rate, pitch) -> audio bytes
+TTS_CACHE_ENABLED = os.environ.get("TTS_CACHE", "1") != "0"
+TTS_CACHE_MAX_MB = int(os.environ.get("TTS_CACHE_MAX_MB", "1024"))
+# edge-tts voice list persisted under CACHE_DIR and re-discovered after this many hours
+VOICE_CATALOG_TTL_HOURS = float(os.environ.get("VOICE_CATALOG_TTL_HOURS", "24"))
+
+# Batched segment translation: max characters per Google request (the API rejects >5000)
+# and max segments per Gemini JSON-array request
+TRANSLATION_BATCH_CHARS = int(os.environ.get("TRANSLATION_BATCH_CHARS", "4500"))
+GEMINI_BATCH_SEGMENTS = int(os.environ.get("GEMINI_BATCH_SEGMENTS", "80"))
+
+# Translation provider limits (per process): concurrent requests, requests/second
+# (token bucket, 0 = unlimited) and attempts per request with jittered backoff
+GOOGLE_TRANSLATE_CONCURRENCY = int(os.environ.get("GOOGLE_TRANSLATE_CONCURRENCY", "8"))
+GOOGLE_TRANSLATE_RPS = float(os.environ.get("GOOGLE_TRANSLATE_RPS", "10"))
+GEMINI_CONCURRENCY = int(os.environ.get("GEMINI_CONCURRENCY", "4"))
+GEMINI_RPS = float(os.environ.get("GEMINI_RPS", "2"))
+TRANSLATION_RETRIES = int(os.environ.get("TRANSLATION_RETRIES", "3"))
+# Threads running translation + TTS for chunks once STT is done (network-bound work)
+LOCALIZE_WORKERS = int(os.environ.get("LOCALIZE_WORKERS", "8"))
+# Staged run_job pipeline: STT processes (0 = one per core but one), then translation and
+# TTS threads sized for network waits; between stages at most PIPELINE_QUEUE_SIZE chunks
+# wait, so a slow stage holds back the ones before it (backpressure)
+STT_WORKERS = int(os.environ.get("STT_WORKERS", "0"))
+TRANSLATE_WORKERS = int(os.environ.get("TRANSLATE_WORKERS", str(LOCALIZE_WORKERS)))
+TTS_WORKERS = int(os.environ.get("TTS_WORKERS", str(LOCALIZE_WORKERS)))
+PIPELINE_QUEUE_SIZE = int(os.environ.get("PIPELINE_QUEUE_SIZE", "16"))
+# edge-tts syntheses in flight per process (shared background loop) and attempts per
+# clip with jittered backoff before falling back to gTTS
+EDGE_TTS_CONCURRENCY = int(os.environ.get("EDGE_TTS_CONCURRENCY", "6"))
+TTS_RETRIES = int(os.environ.get("TTS_RETRIES", "3"))
+# How dubbed audio is synced to the source: "chunk" (one clip per chunk, concatenated and
+# stretched by one global ratio) or "segment" (one clip per Whisper segment, each tempo-fit
+# to its own window and mixed onto a PCM timeline at its source timestamp)
+TTS_SYNC_MODE = os.environ.get("TTS_SYNC_MODE", "chunk")
+# Per-clip tempo clamp for timeline placement (1.0 minimum = never slow speech down)
+TTS_MAX_TEMPO = float(os.environ.get("TTS_MAX_TEMPO", "1.35"))
+TTS_MIN_TEMPO = float(os.environ.get("TTS_MIN_TEMPO", "1.0"))
+# Timeline mix rate (edge-tts clips are 24 kHz) and the size above which the job-length
+# mix buffer is memory-mapped to disk instead of held in RAM
+TIMELINE_SAMPLE_RATE = int(os.environ.get("TIMELINE_SAMPLE_RATE", "24000"))
+TIMELINE_MEMMAP_MB = int(os.environ.get("TIMELINE_MEMMAP_MB", "64"))
+# Time stretching: "wsola" (in-process numpy, see tsm.py) or "ffmpeg" (atempo filter), and
+# the WSOLA quality preset: "fast", "balanced" or "high"
+TSM_ENGINE = os.environ.get("TSM_ENGINE", "wsola")
+TSM_QUALITY = os.environ.get("TSM_QUALITY", "balanced")
+# The one lossy encode of the dubbed track when finishing a job: "aac" or "opus", and its bitrate
+FINAL_AUDIO_CODEC = os.environ.get("FINAL_AUDIO_CODEC", "aac")
+FINAL_AUDIO_BITRATE = os.environ.get("FINAL_AUDIO_BITRATE", "128k")
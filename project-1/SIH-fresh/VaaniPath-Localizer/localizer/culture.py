@@ -1,22 +1,49 @@
-from typing import Dict
+import threading
+from typing import Dict, Tuple, Union
 
-from .utils import setup_logger
+from .text_match import AhoCorasickReplacer
+from .utils import content_version, setup_logger
 
 logger = setup_logger("culture")
 
+# Simple courtesy localization, by target language prefix
+COURTESY = {
+    "hi": {"Thank you": "धन्यवाद"},
+    "es": {"Thank you": "Gracias"},
+}
 
-def apply_cultural_adaptation(text: str, target_lang: str, cultural_rules: Dict[str, str]) -> str:
-    if not text:
-        return text
+# (courtesy language, rules version) -> compiled matcher
+_MATCHERS: Dict[Tuple[str, str], AhoCorasickReplacer] = {}
+_MATCHERS_LOCK = threading.Lock()
+
+
+def _courtesy_lang(target_lang: str) -> str:
+    return next((p for p in COURTESY if target_lang.startswith(p)), "")
 
-    adapted = text
-    for k, v in (cultural_rules or {}).items():
-        adapted = adapted.replace(k, v)
 
-    # Simple courtesy localization
-    if target_lang.startswith("hi"):
-        adapted = adapted.replace("Thank you", "धन्यवाद")
-    elif target_lang.startswith("es"):
-        adapted = adapted.replace("Thank you", "Gracias")
+def get_cultural_matcher(target_lang: str, cultural_rules: Dict[str, str]) -> AhoCorasickReplacer:
+    """Cultural rules plus the target's courtesy phrases, compiled once per rules version."""
+    key = (_courtesy_lang(target_lang), content_version(cultural_rules))
+    with _MATCHERS_LOCK:
+        matcher = _MATCHERS.get(key)
+    if matcher is None:
+        # Explicit rules take precedence over the built-in courtesy phrases
+        matcher = AhoCorasickReplacer({**COURTESY.get(key[0], {}), **(cultural_rules or {})})
+        with _MATCHERS_LOCK:
+            _MATCHERS[key] = matcher
+    return matcher
 
-    return adapted
\ No newline at end of file
+
+def apply_cultural_adaptation(
+    text: str,
+    target_lang: str,
+    cultural_rules: Union[Dict[str, str], AhoCorasickReplacer],
+) -> str:
+    if not text:
+        return text
+    matcher = (
+        cultural_rules
+        if isinstance(cultural_rules, AhoCorasickReplacer)
+        else get_cultural_matcher(target_lang, cultural_rules)
+    )
+    return matcher.replace(text)
@@ -0,0 +1,79 @@
+import json
+import os
+import re
+import threading
+from typing import Dict, Optional
+
+from .text_match import WORD_CHARS
+from .utils import setup_logger
+
+logger = setup_logger("dialect")
+
+DIALECTS_DIR = os.path.join(os.path.dirname(__file__), "sample_data", "dialects")
+
+# \b misses words ending in a matra, so boundaries are explicit lookarounds
+_BOUNDARY_BEFORE = rf"(?<![{WORD_CHARS}])"
+_BOUNDARY_AFTER = rf"(?![{WORD_CHARS}])"
+
+
+class DialectEngine:
+    """Whole-word/phrase rewrite rules compiled into one regex alternation.
+
+    Alternatives are ordered longest first, so at every position the longest matching
+    phrase wins (``कर रहा है`` before ``रहा है`` before ``है``), and the text is rewritten
+    in a single left-to-right pass: replacements are never re-matched by other rules.
+    """
+
+    def __init__(self, rules: Dict[str, str], name: str = ""):
+        self.name = name
+        self.rules = {k: v for k, v in rules.items() if k and k != v}
+        if self.rules:
+            alternation = "|".join(re.escape(k) for k in sorted(self.rules, key=len, reverse=True))
+            self._pattern: Optional[re.Pattern] = re.compile(f"{_BOUNDARY_BEFORE}(?:{alternation}){_BOUNDARY_AFTER}")
+        else:
+            self._pattern = None
+
+    @classmethod
+    def from_file(cls, path: str) -> "DialectEngine":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data.get("rules", {}), data.get("name", os.path.splitext(os.path.basename(path))[0]))
+
+    def apply(self, text: str) -> str:
+        if not text or self._pattern is None:
+            return text
+        rules = self.rules
+        return self._pattern.sub(lambda m: rules[m.group(0)], text)
+
+
+# dialect code -> (rules file mtime, engine); None when the dialect has no rules file
+_ENGINES: Dict[str, tuple] = {}
+_ENGINES_LOCK = threading.Lock()
+
+
+def get_dialect_engine(code: str) -> Optional[DialectEngine]:
+    """Compiled engine for ``sample_data/dialects/<code>.json`` (recompiled if the file changes)."""
+    path = os.path.join(DIALECTS_DIR, f"{code}.json")
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    with _ENGINES_LOCK:
+        cached = _ENGINES.get(code)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        try:
+            engine = DialectEngine.from_file(path)
+        except (OSError, ValueError) as e:
+            logger.error(f"Failed to load dialect rules {path}: {e}")
+            engine = None
+        else:
+            logger.info(f"Compiled {len(engine.rules)} dialect rules for {code}")
+        _ENGINES[code] = (mtime, engine)
+        return engine
+
+
+def apply_dialect(text: str, code: str) -> str:
+    """Rewrite base-language (Hindi) MT output toward dialect *code*; unchanged if it has no rules."""
+    engine = get_dialect_engine(code)
+    return engine.apply(text) if engine else text
@@ -0,0 +1,130 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from .utils import mkdir_p, setup_logger
+
+logger = setup_logger("disk_cache")
+
+# A hit only rewrites last_access when the stored one is older than this, so hot keys
+# do not turn every read into a write transaction (LRU order only needs coarse times)
+_TOUCH_INTERVAL_S = 60.0
+# Once over budget, evict down to this fraction of it so the next inserts do not evict again
+_EVICT_TO = 0.9
+
+_SCHEMA = """
+BEGIN IMMEDIATE;
+CREATE TABLE IF NOT EXISTS entries (
+    key TEXT PRIMARY KEY,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL);
+CREATE INDEX IF NOT EXISTS entries_last_access ON entries(last_access);
+-- Running total of entries.size, kept by triggers so writers never SUM the table
+CREATE TABLE IF NOT EXISTS usage (id INTEGER PRIMARY KEY CHECK (id = 0), total INTEGER NOT NULL);
+INSERT OR IGNORE INTO usage (id, total) SELECT 0, COALESCE(SUM(size), 0) FROM entries;
+CREATE TRIGGER IF NOT EXISTS entries_insert AFTER INSERT ON entries
+    BEGIN UPDATE usage SET total = total + new.size WHERE id = 0; END;
+CREATE TRIGGER IF NOT EXISTS entries_update AFTER UPDATE OF size ON entries
+    BEGIN UPDATE usage SET total = total + new.size - old.size WHERE id = 0; END;
+CREATE TRIGGER IF NOT EXISTS entries_delete AFTER DELETE ON entries
+    BEGIN UPDATE usage SET total = total - old.size WHERE id = 0; END;
+COMMIT;
+"""
+
+
+class DiskCache:
+    """Size-bounded, least-recently-used key/value store backed by SQLite.
+
+    Safe to share between the ProcessPool workers of a job: every process (and
+    thread) opens its own connection, and SQLite's WAL mode serializes writers.
+    The total size lives in a trigger-maintained row, so a write only evicts (oldest
+    access first, down to 90% of *max_bytes*) once that total is over budget.
+    Hit/miss counters are per instance, i.e. per process.
+    """
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._local = threading.local()
+        mkdir_p(os.path.dirname(path))
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None or getattr(self._local, "pid", None) != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key: str) -> Optional[bytes]:
+        try:
+            conn = self._conn()
+            row = conn.execute("SELECT value, last_access FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            now = time.time()
+            if now - row[1] >= _TOUCH_INTERVAL_S:
+                with conn:
+                    conn.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+            self.hits += 1
+            return row[0]
+        except sqlite3.Error as e:
+            logger.warning(f"Cache read failed ({self.path}): {e}")
+            self.misses += 1
+            return None
+
+    def set(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_bytes:
+            return
+        try:
+            conn = self._conn()
+            with conn:
+                conn.execute(
+                    "INSERT INTO entries (key, value, size, last_access) VALUES (?, ?, ?, ?)"
+                    " ON CONFLICT(key) DO UPDATE SET"
+                    " value = excluded.value, size = excluded.size, last_access = excluded.last_access",
+                    (key, sqlite3.Binary(value), len(value), time.time()),
+                )
+                total = conn.execute("SELECT total FROM usage WHERE id = 0").fetchone()[0]
+                if total > self.max_bytes:
+                    self._evict(conn, total)
+        except sqlite3.Error as e:
+            logger.warning(f"Cache write failed ({self.path}): {e}")
+
+    def _evict(self, conn: sqlite3.Connection, total: int) -> None:
+        goal = int(self.max_bytes * _EVICT_TO)
+        evicted = []
+        rows = conn.execute("SELECT key, size FROM entries ORDER BY last_access ASC")
+        for key, size in rows:
+            if total <= goal:
+                break
+            evicted.append((key,))
+            total -= size
+        rows.close()
+        conn.executemany("DELETE FROM entries WHERE key = ?", evicted)
+        logger.info(f"Evicted {len(evicted)} entries from {os.path.basename(self.path)}")
+
+    def stats(self) -> Dict[str, Any]:
+        entries, size = 0, 0
+        try:
+            entries, size = self._conn().execute(
+                "SELECT (SELECT COUNT(*) FROM entries), total FROM usage WHERE id = 0"
+            ).fetchone()
+        except sqlite3.Error:
+            pass
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": entries,
+            "size_mb": round(size / (1024 * 1024), 2),
+            "max_mb": round(self.max_bytes / (1024 * 1024), 2),
+        }
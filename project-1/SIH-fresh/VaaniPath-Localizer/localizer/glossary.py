@@ -1,6 +1,9 @@
-from typing import Dict
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
-from .utils import setup_logger
+from .text_match import AhoCorasickReplacer, tokenize
+from .utils import content_version, setup_logger
 
 logger = setup_logger("glossary")
 
@@ -433,20 +436,98 @@ def merge_glossaries(base: Dict[str, str], rag: Dict[str, str]) -> Dict[str, str
     return merged
 
 
-def clean_transcript(text: str, glossary: Dict[str, str]) -> str:
+# glossary content version -> compiled matcher, least recently used first
+_MATCHERS: "OrderedDict[str, AhoCorasickReplacer]" = OrderedDict()
+_MATCHERS_LOCK = threading.Lock()
+_MAX_MATCHERS = 32
+
+
+def _cached_matcher(version: str, build: Callable[[], Dict[str, str]]) -> AhoCorasickReplacer:
+    with _MATCHERS_LOCK:
+        matcher = _MATCHERS.get(version)
+        if matcher is not None:
+            _MATCHERS.move_to_end(version)
+            return matcher
+    matcher = AhoCorasickReplacer(build())
+    with _MATCHERS_LOCK:
+        _MATCHERS[version] = matcher
+        while len(_MATCHERS) > _MAX_MATCHERS:
+            _MATCHERS.popitem(last=False)
+    logger.info(f"Compiled glossary matcher {version} ({matcher.size} terms)")
+    return matcher
+
+
+def get_glossary_matcher(glossary: Dict[str, str]) -> AhoCorasickReplacer:
+    """Compiled matcher for *glossary*, built once per content version and cached."""
+    return _cached_matcher(content_version(glossary), lambda: glossary)
+
+
+def get_job_glossary_matcher(rag_glossary: Dict[str, str]) -> AhoCorasickReplacer:
+    """DEFAULT_GLOSSARY merged with a job's glossary; merged and compiled once per job glossary version."""
+    return _cached_matcher(
+        f"default+{content_version(rag_glossary)}",
+        lambda: merge_glossaries(DEFAULT_GLOSSARY, rag_glossary),
+    )
+
+
+class GlossaryIndex:
+    """Inverted index from a term's first word to the glossary terms starting with it.
+
+    ``relevant(text)`` returns only the terms that occur in *text* (case-insensitive,
+    whole words), in order of first occurrence, with one dictionary probe per word.
+    """
+
+    def __init__(self, glossary: Dict[str, str]):
+        self.glossary = glossary
+        self._index: Dict[str, List[Tuple[Tuple[str, ...], str]]] = {}
+        for key in glossary:
+            words = _words(key)
+            if words:
+                self._index.setdefault(words[0], []).append((words, key))
+
+    def relevant(self, text: str) -> Dict[str, str]:
+        words = _words(text)
+        found: Dict[str, str] = {}
+        for i, word in enumerate(words):
+            for term_words, key in self._index.get(word, ()):
+                if key not in found and tuple(words[i:i + len(term_words)]) == term_words:
+                    found[key] = self.glossary[key]
+        return found
+
+
+def _words(text: str) -> Tuple[str, ...]:
+    return tuple(t.lower() for t in tokenize(text) if not t.isspace())
+
+
+_INDEXES: "OrderedDict[str, GlossaryIndex]" = OrderedDict()
+
+
+def relevant_terms(glossary: Optional[Dict[str, str]], text: str) -> Dict[str, str]:
+    """The subset of *glossary* whose terms appear in *text* (index cached per glossary version)."""
+    if not glossary:
+        return {}
+    version = content_version(glossary)
+    with _MATCHERS_LOCK:
+        index = _INDEXES.get(version)
+        if index is not None:
+            _INDEXES.move_to_end(version)
+    if index is None:
+        index = GlossaryIndex(glossary)
+        with _MATCHERS_LOCK:
+            _INDEXES[version] = index
+            while len(_INDEXES) > _MAX_MATCHERS:
+                _INDEXES.popitem(last=False)
+    return index.relevant(text)
+
+
+def clean_transcript(text: str, glossary: Union[Dict[str, str], AhoCorasickReplacer]) -> str:
     if not text:
         return text
 
-    cleaned = text
     # Normalize whitespace
-    cleaned = " ".join(cleaned.split())
-
-    # Replace mapped terms with canonical forms
-    # Simple token-based replacement; preserves "tech words" by mapping to themselves
-    for k, v in glossary.items():
-        # Case-insensitive replace while preserving case of the value
-        cleaned = cleaned.replace(k, v)
-        cleaned = cleaned.replace(k.lower(), v)
-        cleaned = cleaned.replace(k.upper(), v)
+    cleaned = " ".join(text.split())
 
-    return cleaned
\ No newline at end of file
+    # Replace mapped terms with canonical forms in one scan: case-insensitive, whole
+    # words only ("Go" does not touch "Google"), longest term wins
+    matcher = glossary if isinstance(glossary, AhoCorasickReplacer) else get_glossary_matcher(glossary)
+    return matcher.replace(cleaned)
@@ -0,0 +1,235 @@
+import argparse
+import os
+import re
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .config import (
+    INDICTRANS2_BATCH_SIZE,
+    INDICTRANS2_BEAM_SIZE,
+    INDICTRANS2_MODEL_DIR,
+    INDICTRANS2_SOURCE_LANG,
+    INDICTRANS2_THREADS,
+)
+from .utils import setup_logger
+
+logger = setup_logger("indictrans2")
+
+# ISO codes used across the localizer -> IndicTrans2 (FLORES-200 style) language tags
+FLORES_CODES = {
+    "en": "eng_Latn",
+    "as": "asm_Beng",
+    "bn": "ben_Beng",
+    "brx": "brx_Deva",
+    "doi": "doi_Deva",
+    "gom": "gom_Deva",
+    "kok": "gom_Deva",
+    "gu": "guj_Gujr",
+    "hi": "hin_Deva",
+    "kn": "kan_Knda",
+    "ks": "kas_Arab",
+    "mai": "mai_Deva",
+    "ml": "mal_Mlym",
+    "mni": "mni_Beng",
+    "mr": "mar_Deva",
+    "ne": "npi_Deva",
+    "or": "ory_Orya",
+    "pa": "pan_Guru",
+    "sa": "san_Deva",
+    "sat": "sat_Olck",
+    "sd": "snd_Arab",
+    "ta": "tam_Taml",
+    "te": "tel_Telu",
+    "ur": "urd_Arab",
+}
+
+# SentencePiece model names used by the IndicTrans2 CTranslate2 exports
+_SPM_CANDIDATES = {
+    "source": ["source.model", "model.SRC", os.path.join("vocab", "model.SRC")],
+    "target": ["target.model", "model.TGT", os.path.join("vocab", "model.TGT")],
+}
+
+
+# IndicProcessor-style preprocessing: typographic punctuation is normalized to what the
+# model saw in training, and URLs, e-mails and dotted/slashed numbers are masked as <IDn>
+# tags so the model copies them instead of translating or transliterating them
+_PUNCT_MAP = str.maketrans({
+    "\u201c": '"', "\u201d": '"', "\u201e": '"', "\u2018": "'", "\u2019": "'",
+    "\u2013": "-", "\u2014": "-", "\u2026": "...", "\u00a0": " ",
+})
+_ENTITY_RE = re.compile(
+    r"(?:https?://|www\.)\S+?(?=[.,;:!?)\]\"']*(?:\s|$))"  # URL, minus trailing punctuation/quotes
+    r"|[\w.+-]+@[\w-]+(?:\.[\w-]+)+"  # e-mail
+    r"|\d+(?:[.,:/-]\d+)+"  # dates, times, versions, decimals
+)
+# The model sometimes respaces or re-brackets a tag: "< ID1 >", "[ID1]"
+_PLACEHOLDER_RE = re.compile(r"[<\[]\s*ID\s*(\d+)\s*[>\]]")
+
+
+def flores_code(lang: str) -> Optional[str]:
+    return FLORES_CODES.get((lang or "").split("-")[0])
+
+
+def supports(source_lang: str, target_lang: str) -> bool:
+    """Whether the configured model direction covers *source_lang* -> *target_lang*.
+
+    The en-indic model only translates from INDICTRANS2_SOURCE_LANG (English) into a
+    language with its own FLORES tag; anything else (Hindi source, English target, ...)
+    must go to another provider.
+    """
+    src = (source_lang or "").split("-")[0]
+    tgt = (target_lang or "").split("-")[0]
+    return src == INDICTRANS2_SOURCE_LANG.split("-")[0] and tgt != src and flores_code(tgt) is not None
+
+
+def preprocess(sentence: str) -> Tuple[str, List[str]]:
+    """Normalize punctuation and mask entities; returns (model input, masked entities)."""
+    text = " ".join(sentence.translate(_PUNCT_MAP).split())
+    entities: List[str] = []
+
+    def mask(m: "re.Match") -> str:
+        entities.append(m.group(0))
+        return f"<ID{len(entities)}>"
+
+    return _ENTITY_RE.sub(mask, text), entities
+
+
+def postprocess(text: str, entities: List[str]) -> str:
+    """Put the entities masked by :func:`preprocess` back in place of their tags."""
+    if not entities:
+        return text
+
+    def unmask(m: "re.Match") -> str:
+        n = int(m.group(1))
+        return entities[n - 1] if 0 < n <= len(entities) else m.group(0)
+
+    return _PLACEHOLDER_RE.sub(unmask, text)
+
+
+def _find_spm(model_dir: str, side: str) -> str:
+    for name in _SPM_CANDIDATES[side]:
+        path = os.path.join(model_dir, name)
+        if os.path.exists(path):
+            return path
+    raise FileNotFoundError(f"No {side} SentencePiece model in {model_dir} (tried {_SPM_CANDIDATES[side]})")
+
+
+class IndicTrans2Engine:
+    """IndicTrans2 on CTranslate2 (int8, CPU), loaded once per process.
+
+    Input sentences are normalized and entity-masked (:func:`preprocess`),
+    SentencePiece-encoded and prefixed with the source/target language tags IndicTrans2
+    expects, sorted by token length so each batch pads as little as possible, and
+    restored to input order (and their entities) afterwards.
+    """
+
+    def __init__(self, model_dir: str, threads: int = INDICTRANS2_THREADS):
+        import ctranslate2
+        import sentencepiece as spm
+
+        self.model_dir = model_dir
+        self.translator = ctranslate2.Translator(
+            model_dir, device="cpu", compute_type="int8", intra_threads=threads
+        )
+        self.sp_source = spm.SentencePieceProcessor(model_file=_find_spm(model_dir, "source"))
+        self.sp_target = spm.SentencePieceProcessor(model_file=_find_spm(model_dir, "target"))
+        self._lock = threading.Lock()
+        self.stats = {"sentences": 0, "seconds": 0.0}
+
+    def translate_batch(
+        self,
+        sentences: List[str],
+        target_lang: str,
+        source_lang: str = INDICTRANS2_SOURCE_LANG,
+        batch_size: int = INDICTRANS2_BATCH_SIZE,
+    ) -> List[str]:
+        if not supports(source_lang, target_lang):
+            raise ValueError(f"IndicTrans2 does not support {source_lang}->{target_lang}")
+        src_tag, tgt_tag = flores_code(source_lang), flores_code(target_lang)
+
+        t0 = time.time()
+        prepared = [preprocess(s) for s in sentences]
+        tokens = [[src_tag, tgt_tag] + self.sp_source.encode(text, out_type=str) for text, _ in prepared]
+        order = sorted(range(len(tokens)), key=lambda i: len(tokens[i]))
+        out: List[str] = [""] * len(sentences)
+        for b in range(0, len(order), batch_size):
+            idx = order[b:b + batch_size]
+            results = self.translator.translate_batch(
+                [tokens[i] for i in idx],
+                beam_size=INDICTRANS2_BEAM_SIZE,
+                max_batch_size=batch_size,
+                max_decoding_length=256,
+            )
+            for i, res in zip(idx, results):
+                out[i] = postprocess(self.sp_target.decode(res.hypotheses[0]).strip(), prepared[i][1])
+
+        with self._lock:
+            self.stats["sentences"] += len(sentences)
+            self.stats["seconds"] += time.time() - t0
+        return out
+
+    def sentences_per_sec(self) -> float:
+        with self._lock:
+            return self.stats["sentences"] / self.stats["seconds"] if self.stats["seconds"] else 0.0
+
+
+_ENGINE: Optional[IndicTrans2Engine] = None
+_ENGINE_ERROR: Optional[str] = None
+_ENGINE_LOCK = threading.Lock()
+
+
+def get_engine(model_dir: Optional[str] = None) -> Optional[IndicTrans2Engine]:
+    """Process-wide engine, or None if the model / CTranslate2 / SentencePiece is unavailable."""
+    global _ENGINE, _ENGINE_ERROR
+    with _ENGINE_LOCK:
+        if _ENGINE is not None or _ENGINE_ERROR is not None:
+            return _ENGINE
+        model_dir = model_dir or INDICTRANS2_MODEL_DIR
+        if not model_dir:
+            _ENGINE_ERROR = "INDICTRANS2_MODEL_DIR not set"
+        else:
+            try:
+                logger.info(f"Loading IndicTrans2 (CTranslate2 int8) from {model_dir}")
+                _ENGINE = IndicTrans2Engine(model_dir)
+            except Exception as e:
+                _ENGINE_ERROR = str(e)
+        if _ENGINE_ERROR:
+            logger.warning(f"IndicTrans2 unavailable ({_ENGINE_ERROR}); falling back to Google")
+        return _ENGINE
+
+
+def engine_stats() -> Dict[str, float]:
+    engine = _ENGINE
+    if engine is None:
+        return {"loaded": False, "sentences": 0, "seconds": 0.0, "sentences_per_sec": 0.0}
+    return {
+        "loaded": True,
+        "sentences": engine.stats["sentences"],
+        "seconds": round(engine.stats["seconds"], 3),
+        "sentences_per_sec": round(engine.sentences_per_sec(), 2),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Translate text with the local IndicTrans2 CTranslate2 engine")
+    parser.add_argument("--model-dir", default=INDICTRANS2_MODEL_DIR, help="CTranslate2-converted IndicTrans2 model directory")
+    parser.add_argument("--target", required=True, help="Target language code (e.g., hi)")
+    parser.add_argument("--source", default=INDICTRANS2_SOURCE_LANG, help="Source language code")
+    parser.add_argument("--input", required=True, help="Text file, one sentence per line")
+    parser.add_argument("--batch-size", type=int, default=INDICTRANS2_BATCH_SIZE)
+    args = parser.parse_args()
+
+    engine = get_engine(args.model_dir)
+    if engine is None:
+        raise SystemExit(f"IndicTrans2 engine could not be loaded: {_ENGINE_ERROR}")
+    with open(args.input, "r", encoding="utf-8") as f:
+        sentences = [line.strip() for line in f if line.strip()]
+    for line in engine.translate_batch(sentences, args.target, args.source, args.batch_size):
+        print(line)
+    stats = engine_stats()
+    logger.info(f"Translated {stats['sentences']} sentences in {stats['seconds']}s ({stats['sentences_per_sec']} sentences/sec)")
+
+
+if __name__ == "__main__":
+    main()
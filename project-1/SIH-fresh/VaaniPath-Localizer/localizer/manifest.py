@@ -20,6 +20,7 @@ def build_manifest(
     final_video: str | None = None,
     cloudinary_url: str | None = None,  # 🚀 NEW: Cloudinary URL
     subtitle_url: str | None = None,    # 🚀 NEW: Subtitle URL
+    extra: Dict | None = None,
 ) -> Dict:
     """Create a manifest JSON describing the localization job.
 
@@ -27,6 +28,8 @@ def build_manifest(
     globally synchronized audio file and the final merged video output.
     ``cloudinary_url`` is the optional Cloudinary URL for the dubbed video.
     ``subtitle_url`` is the optional Cloudinary URL for the VTT subtitle file.
+    ``extra`` holds additional top-level fields (e.g. ``parent_job_id`` and
+    ``chunks_dir`` for the per-target jobs of a multi-target run).
     """
     data = {
         "job_id": job_id,
@@ -46,6 +49,8 @@ def build_manifest(
         data["cloudinary_url"] = cloudinary_url
     if subtitle_url:    # 🚀 NEW: Store Subtitle URL
         data["subtitle_url"] = subtitle_url
+    if extra:
+        data.update(extra)
     mkdir_p(output_dir)
     out_path = os.path.join(output_dir, "manifest.json")
     with open(out_path, "w", encoding="utf-8") as f:
@@ -54,6 +59,18 @@ def build_manifest(
     return data
 
 
+# Top-level fields build_manifest writes itself; anything else came in through ``extra``
+_BUILT_KEYS = {
+    "job_id", "mode", "source_lang", "target_lang", "course_id", "input_path", "chunk_count",
+    "chunks", "final_audio", "final_video", "cloudinary_url", "subtitle_url",
+}
+
+
+def manifest_extra(data: Dict) -> Dict:
+    """The ``extra`` fields of a loaded manifest, to carry over when it is rebuilt."""
+    return {k: v for k, v in data.items() if k not in _BUILT_KEYS}
+
+
 def load_manifest(manifest_path: str) -> Dict:
     with open(manifest_path, "r", encoding="utf-8") as f:
         return json.load(f)
\ No newline at end of file
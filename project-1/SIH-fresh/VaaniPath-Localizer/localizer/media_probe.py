@@ -0,0 +1,181 @@
+import json
+import os
+import struct
+import subprocess
+import threading
+import wave
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from .config import MEDIA_PROBE_CACHE_SIZE
+from .utils import setup_logger, FFPROBE
+
+logger = setup_logger("media_probe")
+
+# MPEG audio header tables, indexed by [version][layer] / [version]
+_MP3_BITRATES = {
+    # MPEG-1: Layer I, II, III
+    (3, 3): [0, 32, 64, 96, 128, 160, 192, 224, 256, 288, 320, 352, 384, 416, 448],
+    (3, 2): [0, 32, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320, 384],
+    (3, 1): [0, 32, 40, 48, 56, 64, 80, 96, 112, 128, 160, 192, 224, 256, 320],
+    # MPEG-2 / 2.5: Layer I, II/III
+    (2, 3): [0, 32, 48, 56, 64, 80, 96, 112, 128, 144, 160, 176, 192, 224, 256],
+    (2, 2): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+    (2, 1): [0, 8, 16, 24, 32, 40, 48, 56, 64, 80, 96, 112, 128, 144, 160],
+}
+_MP3_SAMPLE_RATES = {
+    3: [44100, 48000, 32000],  # MPEG-1
+    2: [22050, 24000, 16000],  # MPEG-2
+    0: [11025, 12000, 8000],   # MPEG-2.5
+}
+
+
+def _mp3_frame(header: int) -> Optional[Tuple[int, int, int]]:
+    """Decode a 32-bit MPEG audio frame header into (frame_bytes, samples, sample_rate)."""
+    if (header >> 21) & 0x7FF != 0x7FF:
+        return None
+    version = (header >> 19) & 0x3
+    layer = (header >> 17) & 0x3
+    br_index = (header >> 12) & 0xF
+    sr_index = (header >> 10) & 0x3
+    padding = (header >> 9) & 0x1
+    if version == 1 or layer == 0 or br_index in (0, 15) or sr_index == 3:
+        return None
+    bitrate = _MP3_BITRATES[(3 if version == 3 else 2, layer)][br_index] * 1000
+    sample_rate = _MP3_SAMPLE_RATES[version][sr_index]
+    if layer == 3:  # Layer I
+        return (12 * bitrate // sample_rate + padding) * 4, 384, sample_rate
+    if layer == 2 or version == 3:  # Layer II, or MPEG-1 Layer III
+        return 144 * bitrate // sample_rate + padding, 1152, sample_rate
+    return 72 * bitrate // sample_rate + padding, 576, sample_rate  # MPEG-2/2.5 Layer III
+
+
+def _mp3_duration(path: str) -> Optional[float]:
+    """Sum the frame durations of an MP3 by walking its frame headers (no decoding)."""
+    with open(path, "rb") as f:
+        data = f.read()
+    pos = 0
+    # Skip ID3v2 tags (there can be more than one)
+    while data[pos:pos + 3] == b"ID3" and len(data) >= pos + 10:
+        size = 0
+        for b in data[pos + 6:pos + 10]:
+            size = (size << 7) | (b & 0x7F)
+        pos += 10 + size + (10 if data[pos + 5] & 0x10 else 0)
+
+    duration = 0.0
+    frames = 0
+    end = len(data) - 4
+    while pos <= end:
+        frame = _mp3_frame(struct.unpack_from(">I", data, pos)[0])
+        if frame is None or frame[0] <= 0:
+            if frames:
+                break  # trailing tags (ID3v1/APE) or garbage
+            nxt = data.find(b"\xff", pos + 1)
+            if nxt < 0 or nxt - pos > 64 * 1024:
+                return None
+            pos = nxt
+            continue
+        size, samples, sample_rate = frame
+        # The first frame may be a Xing/Info/VBRI header that carries no audio
+        if frames == 0 and any(tag in data[pos:pos + 64] for tag in (b"Xing", b"Info", b"VBRI")):
+            pos += size
+            frames = 1
+            continue
+        duration += samples / sample_rate
+        frames += 1
+        pos += size
+    return duration if frames > 1 or duration > 0 else None
+
+
+class MediaProbe:
+    """Per-process LRU cache of media facts, keyed by (path, mtime, size).
+
+    WAV and MP3 durations come straight from their headers; everything else costs
+    one ``ffprobe -show_streams -show_format`` JSON call per file version. At most
+    *max_entries* results are kept, so a long-lived server probing every chunk and
+    clip of every job does not grow without bound.
+    """
+
+    def __init__(self, max_entries: int = MEDIA_PROBE_CACHE_SIZE):
+        self._cache: "OrderedDict[Tuple[str, int, int], Dict[str, Any]]" = OrderedDict()
+        self.max_entries = max(1, max_entries)
+        self._lock = threading.Lock()
+        self.ffprobe_calls = 0
+
+    def probe(self, path: str) -> Dict[str, Any]:
+        """Return {"duration", "has_audio", "has_video", "source"} for *path*."""
+        st = os.stat(path)
+        key = (os.path.abspath(path), st.st_mtime_ns, st.st_size)
+        with self._lock:
+            info = self._cache.get(key)
+            if info is not None:
+                self._cache.move_to_end(key)
+                return info
+        info = self._probe_headers(path) or self._probe_ffprobe(path)
+        with self._lock:
+            self._cache[key] = info
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+        return info
+
+    def duration(self, path: str) -> float:
+        return float(self.probe(path).get("duration") or 0.0)
+
+    def has_video(self, path: str) -> bool:
+        return bool(self.probe(path).get("has_video"))
+
+    def _probe_headers(self, path: str) -> Optional[Dict[str, Any]]:
+        ext = os.path.splitext(path)[1].lower()
+        try:
+            if ext == ".wav":
+                with wave.open(path, "rb") as w:
+                    dur = w.getnframes() / float(w.getframerate())
+                return {"duration": dur, "has_audio": True, "has_video": False, "source": "wav"}
+            if ext == ".mp3":
+                dur = _mp3_duration(path)
+                if dur is not None:
+                    return {"duration": dur, "has_audio": True, "has_video": False, "source": "mp3"}
+        except (wave.Error, EOFError, OSError, struct.error) as e:
+            logger.debug(f"Header probe failed for {path}: {e}")
+        return None
+
+    def _probe_ffprobe(self, path: str) -> Dict[str, Any]:
+        cmd = [FFPROBE, "-v", "error", "-show_streams", "-show_format", "-of", "json", path]
+        self.ffprobe_calls += 1
+        try:
+            out = subprocess.check_output(cmd, stderr=subprocess.STDOUT)
+            data = json.loads(out.decode("utf-8", errors="ignore") or "{}")
+        except Exception as e:
+            logger.error(f"ffprobe failed for {path}: {e}")
+            return {"duration": 0.0, "has_audio": False, "has_video": False, "source": "error"}
+
+        streams = data.get("streams", [])
+        fmt = data.get("format", {})
+        duration = fmt.get("duration")
+        if duration is None:
+            durations = [float(s["duration"]) for s in streams if s.get("duration")]
+            duration = max(durations) if durations else 0.0
+        # Cover art in audio files shows up as a one-frame "video" stream
+        has_video = any(
+            s.get("codec_type") == "video" and not (s.get("disposition") or {}).get("attached_pic")
+            for s in streams
+        )
+        return {
+            "duration": float(duration),
+            "has_audio": any(s.get("codec_type") == "audio" for s in streams),
+            "has_video": has_video,
+            "source": "ffprobe",
+            "streams": streams,
+            "format": fmt,
+        }
+
+
+MEDIA_PROBE = MediaProbe()
+
+
+def probe_duration(path: str) -> float:
+    return MEDIA_PROBE.duration(path)
+
+
+def has_video_stream(path: str) -> bool:
+    return MEDIA_PROBE.has_video(path)
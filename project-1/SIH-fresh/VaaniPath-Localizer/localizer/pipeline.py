@@ -0,0 +1,116 @@
+import queue
+import threading
+import time
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from .utils import setup_logger
+
+logger = setup_logger("pipeline")
+
+# Marks the end of a stage's input; passed along once every worker of the stage has stopped
+_DONE = object()
+
+
+class Stage:
+    """One step of a StagedPipeline: ``fn(item) -> item`` run by *workers* threads.
+
+    With an *executor* (e.g. the STT ProcessPoolExecutor) the threads only hand items to
+    it and wait, so *workers* is the number of tasks in flight there; without one, *fn*
+    runs on the stage's own threads, which suits network-bound work.
+    """
+
+    def __init__(self, name: str, fn: Callable[[Any], Any], workers: int, executor: Optional[Executor] = None):
+        self.name = name
+        self.fn = fn
+        self.workers = max(1, workers)
+        self.executor = executor
+
+    def __call__(self, item: Any) -> Any:
+        if self.executor is not None:
+            return self.executor.submit(self.fn, item).result()
+        return self.fn(item)
+
+
+class StagedPipeline:
+    """Items flow through the stages in order, connected by bounded queues.
+
+    Each stage has its own concurrency, so CPU-bound stages can keep every core busy
+    while I/O-bound stages overlap their network waits. A full queue blocks the stage
+    feeding it (backpressure): a slow downstream stage holds back at most *queue_size*
+    items instead of letting finished work pile up in memory. An item whose stage raises
+    is logged and dropped; the rest of the job carries on.
+    """
+
+    def __init__(self, stages: Sequence[Stage], queue_size: int = 8, key: Callable[[Any], Any] = lambda item: item):
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage")
+        self.stages = list(stages)
+        self.queue_size = max(1, queue_size)
+        self.key = key
+        # stage name -> {"done", "failed", "busy_s"} for the last run
+        self.stats: Dict[str, Dict[str, Any]] = {}
+
+    def run(self, items: Iterable[Any]) -> List[Any]:
+        """Push *items* through every stage; returns the items that made it out (unordered)."""
+        queues = [queue.Queue(maxsize=self.queue_size) for _ in self.stages]
+        results: List[Any] = []
+        lock = threading.Lock()
+        self.stats = {s.name: {"done": 0, "failed": 0, "busy_s": 0.0} for s in self.stages}
+        remaining = [s.workers for s in self.stages]
+
+        def emit(i: int, item: Any) -> None:
+            if i + 1 < len(self.stages):
+                queues[i + 1].put(item)
+            else:
+                with lock:
+                    results.append(item)
+
+        def worker(i: int) -> None:
+            stage, inbox, stats = self.stages[i], queues[i], self.stats[self.stages[i].name]
+            while True:
+                item = inbox.get()
+                if item is _DONE:
+                    # Let sibling workers see the end too; the last one out closes the next stage
+                    inbox.put(_DONE)
+                    with lock:
+                        remaining[i] -= 1
+                        last = remaining[i] == 0
+                    if last and i + 1 < len(self.stages):
+                        queues[i + 1].put(_DONE)
+                    return
+                t0 = time.perf_counter()
+                try:
+                    out = stage(item)
+                except Exception as e:
+                    logger.error(f"{stage.name} failed for {self.key(item)}: {e}")
+                    with lock:
+                        stats["failed"] += 1
+                        stats["busy_s"] += time.perf_counter() - t0
+                    continue
+                with lock:
+                    stats["done"] += 1
+                    stats["busy_s"] += time.perf_counter() - t0
+                emit(i, out)
+
+        threads = [
+            threading.Thread(target=worker, args=(i,), name=f"pipeline-{stage.name}-{w}", daemon=True)
+            for i, stage in enumerate(self.stages)
+            for w in range(stage.workers)
+        ]
+        for t in threads:
+            t.start()
+        t0 = time.perf_counter()
+        for item in items:
+            queues[0].put(item)
+        queues[0].put(_DONE)
+        for t in threads:
+            t.join()
+
+        elapsed = max(time.perf_counter() - t0, 1e-9)
+        summary = ", ".join(
+            f"{s.name} {st['done']} ok/{st['failed']} failed ({st['busy_s'] / (elapsed * s.workers):.0%} busy x{s.workers})"
+            for s, st in ((s, self.stats[s.name]) for s in self.stages)
+        )
+        logger.info(f"Pipeline finished in {elapsed:.2f}s: {summary}")
+        return results
@@ -1,11 +1,20 @@
-from typing import Dict
+from typing import Dict, List, Tuple
 import os
 import json
+import threading
 
-from .utils import setup_logger
+from .culture import get_cultural_matcher
+from .glossary import get_job_glossary_matcher
+from .utils import content_version, setup_logger
 
 logger = setup_logger("rag_client")
 
+GLOSSARIES_DIR = os.path.join(os.path.dirname(__file__), "sample_data", "glossaries")
+
+# (course_id, src, tgt) -> (source file mtimes, context)
+_CONTEXT_CACHE: Dict[Tuple[str, str, str], Tuple[tuple, Dict]] = {}
+_CONTEXT_LOCK = threading.Lock()
+
 
 def _load_sector_glossary(course_id: str) -> Dict[str, str]:
     base_dir = os.path.join(os.path.dirname(__file__), "sample_data", "glossaries")
@@ -19,7 +28,7 @@ def _load_sector_glossary(course_id: str) -> Dict[str, str]:
     return {}
 
 
-def get_job_context(course_id: str, src: str, tgt: str) -> Dict:
+def _build_job_context(course_id: str, src: str, tgt: str) -> Dict:
     # Lightweight RAG context with sector-aware glossary support
     logger.info(f"Loading RAG context for course_id={course_id} src={src} tgt={tgt}")
     base_glossary = {
@@ -63,6 +72,7 @@ def get_job_context(course_id: str, src: str, tgt: str) -> Dict:
     }
 
     context = {
+        "source_lang": src,
         "glossary": merged_glossary,
         "initial_prompt": (
             "This is a vocational training module. Use clear, industry terminology; avoid slang; keep sentences short."
@@ -74,3 +84,53 @@ def get_job_context(course_id: str, src: str, tgt: str) -> Dict:
         "target_glossary": target_glossary,
     }
     return context
+
+
+def _context_sources(course_id: str, tgt: str) -> List[str]:
+    """Files _build_job_context reads for this key (they may not exist)."""
+    return [
+        os.path.join(GLOSSARIES_DIR, f"{course_id}.json"),
+        os.path.join(GLOSSARIES_DIR, "roles.json"),
+        os.path.join(GLOSSARIES_DIR, "lang", f"{(tgt or '').split('-')[0]}.json"),
+    ]
+
+
+def _mtimes(paths: List[str]) -> tuple:
+    out = []
+    for path in paths:
+        try:
+            out.append(os.stat(path).st_mtime_ns)
+        except OSError:
+            out.append(None)
+    return tuple(out)
+
+
+def get_job_context(course_id: str, src: str, tgt: str) -> Dict:
+    """Job context for (course_id, src, tgt), cached until one of its glossary files changes.
+
+    The context carries a content ``version`` hash plus the compiled glossary and
+    cultural-rule matchers. Treat it as read-only: it is shared between jobs.
+    """
+    key = (course_id, src, tgt)
+    mtimes = _mtimes(_context_sources(course_id, tgt))
+    with _CONTEXT_LOCK:
+        cached = _CONTEXT_CACHE.get(key)
+        if cached is not None and cached[0] == mtimes:
+            return cached[1]
+
+    context = _build_job_context(course_id, src, tgt)
+    context["version"] = content_version(context)
+    context["glossary_matcher"] = get_job_glossary_matcher(context["glossary"])
+    context["cultural_matcher"] = get_cultural_matcher(tgt, context["cultural_rules"])
+    with _CONTEXT_LOCK:
+        _CONTEXT_CACHE[key] = (mtimes, context)
+    logger.info(f"Job context {context['version']} cached for course_id={course_id} src={src} tgt={tgt}")
+    return context
+
+
+def load_job_context(course_id: str, src: str, tgt: str, version: str) -> Dict:
+    """Pool initializer side: load the context the parent process computed as *version*."""
+    context = get_job_context(course_id, src, tgt)
+    if context["version"] != version:
+        logger.warning(f"Job context changed on disk (expected {version}, loaded {context['version']})")
+    return context
@@ -1,84 +1,159 @@
 import os
+import json
 import argparse
-import subprocess
 from typing import Dict
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
-from .manifest import load_manifest, build_manifest
-from .tts import tts_synthesize, apply_pronunciation_overrides
-from .utils import mkdir_p, setup_logger, FFMPEG
-from .audio_sync import concatenate_and_stretch
+from .config import LOCALIZE_WORKERS, TTS_SYNC_MODE
+from .manifest import load_manifest, build_manifest, manifest_extra
+from .timeline import render_chunk, render_timeline
+from .tts import (
+    apply_pronunciation_overrides,
+    segments_fingerprint,
+    tts_fingerprint,
+    tts_synthesize_many,
+    tts_synthesize_segments,
+)
+from .tts_cache import record as record_tts
+from .utils import mkdir_p, setup_logger
+from .audio_sync import final_output_path, finish_media
 from .audio_utils import get_duration
+from .media_probe import has_video_stream
 
 logger = setup_logger("resynthesize")
 
 
+def _same_file(recorded: str | None, path: str) -> bool:
+    """Whether the manifest's clip path and *path* are the same existing file.
+
+    run_job records absolute paths while callers may pass a relative manifest path, so
+    the strings alone cannot be compared.
+    """
+    return bool(recorded) and os.path.exists(recorded) and os.path.exists(path) and os.path.samefile(recorded, path)
+
+
 def resynthesize_job(manifest_path: str, output_dir: str | None = None) -> Dict:
+    """Re-generate TTS only for chunks whose clip is out of date.
+
+    A chunk is dirty when its ``tts_fingerprint`` (translated text, voice, pronunciation
+    overrides version) differs from the one recorded in the manifest, or its clip is
+    missing from the output directory. Dirty chunks are synthesized together; the
+    manifest is saved with the new fingerprints so the next pass can reuse them.
+    """
+    manifest_path = os.path.abspath(manifest_path)
     m = load_manifest(manifest_path)
     target_lang = m.get("target_lang", "hi")
     base_out = os.path.dirname(manifest_path)
     tts_dir = os.path.join(base_out, "tts")
     if output_dir:
-        tts_out = output_dir
+        tts_out = os.path.abspath(output_dir)
         mkdir_p(tts_out)
     else:
         tts_out = tts_dir
 
     updated = []
-    # Re-generate TTS for all chunks (or specific ones if we tracked changes, but for now all)
-    # Ideally we only regen changed ones, but 'resynthesize' implies full pass or we need logic.
-    # The current code does full pass.
+    reused = []
+    dirty = []
+    # Chunks voiced per Whisper segment (TTS_SYNC_MODE=segment) are re-voiced the same way
+    dirty_segmented = []
     for c in sorted(m.get("chunks", []), key=lambda x: x.get("index", 0)):
+        if not c.get("speech", True):
+            # Silent chunk: its silence clip is reused as is
+            continue
         text = c.get("text_translated", "")
+        segmented = c.get("tts_mode") == "segment" and bool(c.get("segments"))
+        if segmented:
+            audio_out = os.path.join(tts_out, f"chunk_{int(c['index']):04d}.wav")
+            fingerprint = segments_fingerprint(c["segments"], target_lang)
+        else:
+            audio_out = os.path.join(tts_out, f"chunk_{int(c['index']):04d}.mp3")
+            fingerprint = tts_fingerprint(text, target_lang)
+        if c.get("tts_fingerprint") == fingerprint and _same_file(c.get("audio_path"), audio_out):
+            reused.append(c["index"])
+            continue
+        if segmented:
+            dirty_segmented.append((c, None, audio_out, fingerprint))
+            continue
+        # Marked as overridden, so tts_synthesize does not apply the overrides again
         text_over = apply_pronunciation_overrides(text, target_lang)
-        audio_out = os.path.join(tts_out, f"chunk_{int(c['index']):04d}.mp3")
-        tts_synthesize(text_over, target_lang, audio_out)
+        dirty.append((c, text_over, audio_out, fingerprint))
+
+    # All dirty clips go to the TTS service together so their network waits overlap
+    tts_stats: Dict[str, int] = {}
+    if dirty:
+        tts_synthesize_many([(text_over, target_lang, audio_out) for _, text_over, audio_out, _ in dirty], stats=tts_stats)
+
+    def resegment(item) -> Dict[str, int]:
+        c, _, audio_out, _ = item
+        stats: Dict[str, int] = {}
+        c["segments"] = tts_synthesize_segments(
+            c["segments"], target_lang, tts_out, f"chunk_{int(c['index']):04d}", stats=stats
+        )
+        render_chunk(c["segments"], c["end"] - c["start"], audio_out)
+        return stats
+
+    if dirty_segmented:
+        with ThreadPoolExecutor(max_workers=LOCALIZE_WORKERS) as pool:
+            for stats in pool.map(resegment, dirty_segmented):
+                record_tts(tts_stats, stats.get("tts_hits", 0), stats.get("tts_misses", 0))
+
+    dirty += dirty_segmented
+    for c, _, audio_out, fingerprint in sorted(dirty, key=lambda d: d[0]["index"]):
         # Update audio path in chunk if it changed location
         c["audio_path"] = audio_out
+        c["tts_fingerprint"] = fingerprint
         updated.append({"index": c["index"], "audio_path": audio_out})
-    
-    logger.info(f"Resynthesized {len(updated)} chunks to {tts_out}")
-    return {"updated": updated, "tts_dir": tts_out, "manifest": m}
+    if dirty:
+        with open(manifest_path, "w", encoding="utf-8") as f:
+            json.dump(m, f, ensure_ascii=False, indent=2)
+
+    hits, misses = tts_stats.get("tts_hits", 0), tts_stats.get("tts_misses", 0)
+    logger.info(
+        f"Resynthesized {len(updated)} chunks to {tts_out}, reused {len(reused)} "
+        f"({hits} from the TTS cache)"
+    )
+    return {
+        "updated": updated,
+        "reused": reused,
+        "regenerated_count": len(updated),
+        "reused_count": len(reused),
+        "tts_dir": tts_out,
+        "tts_cache": {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 3) if hits + misses else 0.0,
+        },
+        "manifest": m,
+    }
 
 
 def finalize_resynthesis(manifest_path: str, manifest_data: Dict) -> str:
     """Re-run global sync and merge using updated TTS audio."""
-    base_out = os.path.dirname(manifest_path)
+    base_out = os.path.dirname(os.path.abspath(manifest_path))
     input_path = manifest_data.get("input_path")
     
-    # 1. Global Sync
+    # 1. Global Sync + merge in one ffmpeg pass (single encode, video copied)
     video_duration = get_duration(input_path)
     chunks = sorted(manifest_data.get("chunks", []), key=lambda x: x["index"])
     audio_paths = [Path(c["audio_path"]) for c in chunks]
     
-    final_audio_path = Path(base_out) / "final_audio_resynth.wav"
-    concatenate_and_stretch(audio_paths, video_duration, final_audio_path)
-    
-    # 2. Merge
-    final_video_path = Path(base_out) / "final_video_resynth.mp4"
-    merge_cmd = [
-        FFMPEG,
-        "-y",
-        "-i",
-        input_path,
-        "-i",
-        str(final_audio_path),
-        "-c:v",
-        "copy",
-        "-map",
-        "0:v:0",
-        "-map",
-        "1:a:0",
-        "-shortest",
-        str(final_video_path),
-    ]
-    subprocess.check_call(merge_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT)
+    stretch = True
+    if TTS_SYNC_MODE == "segment" or any(c.get("tts_mode") == "segment" for c in chunks):
+        audio_paths = [Path(render_timeline(chunks, video_duration, os.path.join(base_out, "timeline_resynth.wav")))]
+        stretch = False
+    has_video = has_video_stream(input_path)
+    final_path = final_output_path(base_out, "final_video_resynth" if has_video else "final_audio_resynth", has_video)
+    finish_media(input_path, audio_paths, video_duration, final_path, has_video=has_video, stretch=stretch)
+    # The dubbed track only exists inside the finished file
+    final_audio_path = final_path
+    final_video_path = final_path if has_video else None
     
-    # 3. Update Manifest
+    # 2. Update Manifest
     # We can either update the existing one or save a new one. 
     # Let's update the existing one to point to new final artifacts.
     manifest_data["final_audio"] = str(final_audio_path)
-    manifest_data["final_video"] = str(final_video_path)
+    manifest_data["final_video"] = str(final_video_path) if final_video_path else None
     
     # Use build_manifest to save (it handles mkdir etc)
     build_manifest(
@@ -91,10 +166,12 @@ def finalize_resynthesis(manifest_path: str, manifest_data: Dict) -> str:
         chunks=chunks,
         output_dir=base_out,
         final_audio=str(final_audio_path),
-        final_video=str(final_video_path)
+        final_video=str(final_video_path) if final_video_path else None,
+        # e.g. parent_job_id / chunks_dir of a multi-target branch
+        extra=manifest_extra(manifest_data),
     )
     
-    return str(final_video_path)
+    return str(final_path)
 
 
 def main():
@@ -108,13 +185,13 @@ def main():
     if args.manifest:
         manifest_path = args.manifest
     elif args.job:
-        base = os.path.join("localizer", "output", args.job)
+        base = os.path.join(os.path.dirname(__file__), "output", args.job)
         manifest_path = os.path.join(base, "manifest.json")
     else:
         raise SystemExit("Provide --job or --manifest")
 
     res = resynthesize_job(manifest_path, args.out)
-    print(f"Resynthesis complete. Updated {len(res['updated'])} chunks.")
+    print(f"Resynthesis complete. Regenerated {res['regenerated_count']} chunks, reused {res['reused_count']}.")
     
     if args.finalize:
         final_video = finalize_resynthesis(manifest_path, res["manifest"])
@@ -1,31 +1,121 @@
-from typing import Dict, Any, List, Tuple
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, List, Tuple, Union
+
+import numpy as np
 
 from faster_whisper import WhisperModel
 
-from .config import MODE_CONFIG
+from .audio_utils import pcm_sha256
+from .config import (
+    CACHE_DIR,
+    MODE_CONFIG,
+    TRANSCRIPT_CACHE_ENABLED,
+    TRANSCRIPT_CACHE_MAX_MB,
+    WHISPER_CACHE_BUDGET_MB,
+    WHISPER_CPU_THREADS,
+)
+from .disk_cache import DiskCache
 from .utils import setup_logger
 
 logger = setup_logger("stt")
 
+# Approximate float32 resident size (MB) of each Whisper checkpoint once loaded by CTranslate2.
+# Used only to keep the per-process cache within WHISPER_CACHE_BUDGET_MB.
+_MODEL_SIZE_MB = {
+    "tiny": 150,
+    "base": 290,
+    "small": 970,
+    "medium": 3050,
+    "large": 6200,
+}
+_COMPUTE_SCALE = {
+    "int8": 0.25,
+    "int8_float16": 0.3,
+    "int8_float32": 0.3,
+    "float16": 0.5,
+    "float32": 1.0,
+}
+
+# (model_size, compute_type, cpu_threads) -> WhisperModel, least recently used first
+_MODEL_CACHE: "OrderedDict[Tuple[str, str, int], WhisperModel]" = OrderedDict()
+_MODEL_CACHE_LOCK = threading.Lock()
+_MODEL_CACHE_STATS = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def _estimate_model_mb(model_size: str, compute_type: str) -> float:
+    base = _MODEL_SIZE_MB.get(model_size.split(".")[0].replace("-v2", "").replace("-v3", ""), 1000)
+    return base * _COMPUTE_SCALE.get(compute_type, 1.0)
+
+
+def _cached_mb() -> float:
+    return sum(_estimate_model_mb(size, compute) for size, compute, _ in _MODEL_CACHE)
+
+
+def get_model(mode: str = "fast", cpu_threads: int = WHISPER_CPU_THREADS) -> WhisperModel:
+    """Return the process-wide WhisperModel for *mode*, loading it on first use.
+
+    Models are kept in an LRU keyed by (model size, compute type, cpu_threads). When the
+    estimated memory of cached models exceeds WHISPER_CACHE_BUDGET_MB the least recently
+    used ones are dropped; the model being returned is never evicted.
+    """
+    cfg = MODE_CONFIG.get(mode, MODE_CONFIG["fast"])
+    key = (cfg["whisper_model"], cfg["compute_type"], int(cpu_threads))
+
+    with _MODEL_CACHE_LOCK:
+        model = _MODEL_CACHE.get(key)
+        if model is not None:
+            _MODEL_CACHE.move_to_end(key)
+            _MODEL_CACHE_STATS["hits"] += 1
+            return model
+
+        _MODEL_CACHE_STATS["misses"] += 1
+        logger.info(f"Loading Whisper model={key[0]} compute={key[1]} cpu_threads={key[2]}")
+        model = WhisperModel(key[0], device="cpu", compute_type=key[1], cpu_threads=key[2])
+        _MODEL_CACHE[key] = model
+
+        while len(_MODEL_CACHE) > 1 and _cached_mb() > WHISPER_CACHE_BUDGET_MB:
+            evicted, _ = _MODEL_CACHE.popitem(last=False)
+            _MODEL_CACHE_STATS["evictions"] += 1
+            logger.info(f"Evicted Whisper model {evicted} from cache (budget {WHISPER_CACHE_BUDGET_MB}MB)")
+        return model
+
+
+def warmup(mode: str = "fast") -> None:
+    """Load the model for *mode* ahead of the first transcription (e.g. in a pool initializer)."""
+    get_model(mode)
+
+
+def model_cache_stats() -> Dict[str, Any]:
+    with _MODEL_CACHE_LOCK:
+        return {
+            **_MODEL_CACHE_STATS,
+            "models": [list(k) for k in _MODEL_CACHE],
+            "estimated_mb": round(_cached_mb(), 1),
+            "budget_mb": WHISPER_CACHE_BUDGET_MB,
+        }
+
 
 def transcribe(
-    audio_path: str,
+    audio: Union[str, np.ndarray],
     source_lang: str,
     initial_prompt: str,
     mode: str = "fast",
 ) -> Tuple[str, List[Dict[str, Any]]]:
     cfg = MODE_CONFIG.get(mode, MODE_CONFIG["fast"])
-    model_size = cfg["whisper_model"]
-    compute_type = cfg["compute_type"]
 
-    logger.info(f"STT mode={mode}, model={model_size}, compute={compute_type}")
-    model = WhisperModel(model_size, device="cpu", compute_type=compute_type)
+    logger.info(f"STT mode={mode}, model={cfg['whisper_model']}, compute={cfg['compute_type']}")
+    model = get_model(mode)
 
     # Strip region code (e.g., 'en-IN' -> 'en') for Whisper compatibility
     base_lang = source_lang.split('-')[0]
 
+    # faster-whisper takes a path or a 16 kHz mono float32 array (e.g. a shared-memory view)
     segments_iter, info = model.transcribe(
-        audio_path,
+        audio,
         language=base_lang,
         vad_filter=cfg.get("vad_filter", False),
         initial_prompt=initial_prompt or None,
@@ -40,4 +130,56 @@ def transcribe(
         texts.append(seg.text)
 
     text = " ".join(t.strip() for t in texts)
-    return text, segments
\ No newline at end of file
+    return text, segments
+
+
+_TRANSCRIPT_CACHE: DiskCache | None = None
+
+
+def get_transcript_cache() -> DiskCache:
+    global _TRANSCRIPT_CACHE
+    if _TRANSCRIPT_CACHE is None:
+        _TRANSCRIPT_CACHE = DiskCache(
+            os.path.join(CACHE_DIR, "transcripts.sqlite"),
+            TRANSCRIPT_CACHE_MAX_MB * 1024 * 1024,
+        )
+    return _TRANSCRIPT_CACHE
+
+
+def _transcript_cache_key(audio_hash: str, source_lang: str, initial_prompt: str, mode: str) -> str:
+    cfg = MODE_CONFIG.get(mode, MODE_CONFIG["fast"])
+    prompt_hash = hashlib.sha256((initial_prompt or "").encode("utf-8")).hexdigest()[:16]
+    return "|".join([
+        audio_hash,
+        source_lang.split("-")[0],
+        cfg["whisper_model"],
+        cfg["compute_type"],
+        "vad" if cfg.get("vad_filter") else "novad",
+        prompt_hash,
+    ])
+
+
+def transcribe_cached(
+    audio: Union[str, np.ndarray],
+    source_lang: str,
+    initial_prompt: str,
+    mode: str = "fast",
+) -> Tuple[str, List[Dict[str, Any]], bool]:
+    """Like :func:`transcribe`, but served from the content-addressed transcript cache when possible.
+
+    Returns: (text, segments, cache_hit)
+    """
+    if not TRANSCRIPT_CACHE_ENABLED:
+        text, segments = transcribe(audio, source_lang, initial_prompt, mode)
+        return text, segments, False
+
+    cache = get_transcript_cache()
+    key = _transcript_cache_key(pcm_sha256(audio), source_lang, initial_prompt, mode)
+    cached = cache.get(key)
+    if cached is not None:
+        data = json.loads(cached)
+        return data["text"], data["segments"], True
+
+    text, segments = transcribe(audio, source_lang, initial_prompt, mode)
+    cache.set(key, json.dumps({"text": text, "segments": segments}, ensure_ascii=False).encode("utf-8"))
+    return text, segments, False
@@ -0,0 +1,78 @@
+"""Checks for the single-pass finisher (audio_sync.py): filtergraph shape and output length.
+
+The ``finish_media`` checks run ffmpeg and are skipped when it is not on PATH.
+
+Run with ``python -m pytest localizer/test_audio_sync.py`` from the repository root.
+"""
+import os
+import shutil
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from localizer import audio_sync
+from localizer.audio_sync import build_finish_filter, final_output_path, finish_media
+from localizer.audio_utils import decode_audio, write_pcm16_wav
+from localizer.utils import FFMPEG
+
+needs_ffmpeg = pytest.mark.skipif(shutil.which(FFMPEG) is None, reason="ffmpeg not on PATH")
+
+
+def test_filter_normalizes_every_input_and_fixes_the_length():
+    graph = build_finish_filter(3, 1, 1.0, 12.5)
+    assert graph.count("aformat=sample_fmts=flt:") == 3
+    assert "[1:a]" in graph and "[3:a]" in graph and "[0:a]" not in graph
+    assert "concat=n=3:v=0:a=1" in graph
+    assert "atempo" not in graph
+    assert "apad=whole_dur=12.500000" in graph and "atrim=end=12.500000" in graph
+    assert graph.endswith("[aout]")
+
+
+def test_filter_stretches_only_when_needed():
+    assert "atempo" not in build_finish_filter(1, 0, 1.005, 10.0)
+    assert "atempo=1.5" in build_finish_filter(1, 0, 1.5, 10.0)
+
+
+def test_output_path_follows_codec(monkeypatch, tmp_path):
+    assert final_output_path(tmp_path, "final_video", True).name == "final_video.mp4"
+    monkeypatch.setattr(audio_sync, "FINAL_AUDIO_CODEC", "opus")
+    assert final_output_path(tmp_path, "final_audio", False).name == "final_audio.ogg"
+    monkeypatch.setattr(audio_sync, "FINAL_AUDIO_CODEC", "aac")
+    assert final_output_path(tmp_path, "final_audio", False).name == "final_audio.m4a"
+
+
+def _clip(path, seconds, rate=24000):
+    t = np.arange(int(rate * seconds)) / rate
+    return write_pcm16_wav(str(path), (0.3 * np.sin(2 * np.pi * 220 * t)).astype(np.float32), rate)
+
+
+@needs_ffmpeg
+@pytest.mark.parametrize("stretch", [True, False])
+def test_audio_only_output_has_target_duration(tmp_path, stretch):
+    clips = [_clip(tmp_path / "a.wav", 1.0), _clip(tmp_path / "b.wav", 2.0)]
+    out = finish_media(str(clips[0]), clips, 2.0, tmp_path / "final_audio.m4a", has_video=False, stretch=stretch)
+    duration = len(decode_audio(str(out), 48000)) / 48000
+    assert abs(duration - 2.0) < 0.05
+
+
+@needs_ffmpeg
+def test_video_is_copied_and_muxed(tmp_path):
+    video = tmp_path / "in.mp4"
+    subprocess.run(
+        [FFMPEG, "-v", "error", "-f", "lavfi", "-i", "testsrc=size=64x64:rate=10:duration=3",
+         "-c:v", "mpeg4", str(video)],
+        check=True,
+    )
+    out = finish_media(str(video), [_clip(tmp_path / "a.wav", 4.0)], 3.0, tmp_path / "final_video.mp4")
+    info = subprocess.run([FFMPEG, "-hide_banner", "-i", str(out)], capture_output=True, text=True).stderr
+    assert "Video: mpeg4" in info and "Audio:" in info
+    assert abs(len(decode_audio(str(out), 48000)) / 48000 - 3.0) < 0.1
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,48 @@
+"""Checks for the compiled cultural-rule matchers (culture.py).
+
+Run with ``python -m pytest localizer/test_culture.py`` from the repository root.
+"""
+import os
+import sys
+
+import pytest
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from localizer.culture import apply_cultural_adaptation, get_cultural_matcher
+
+RULES = {"USD": "INR", "miles": "kilometers"}
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("Costs 5 USD.", "Costs 5 INR."),
+    ("costs 5 usd, or 7 Usd", "costs 5 INR, or 7 INR"),  # case-insensitive
+    ("USDT is not USD", "USDT is not INR"),  # whole words only
+    ("two miles, not smiles", "two kilometers, not smiles"),
+])
+def test_rules_match_case_insensitive_whole_words(text, expected):
+    assert apply_cultural_adaptation(text, "hi", RULES) == expected
+
+
+def test_courtesy_phrases_follow_target_language():
+    assert apply_cultural_adaptation("Thank you. thank you!", "hi-IN", {}) == "धन्यवाद. धन्यवाद!"
+    assert apply_cultural_adaptation("Thank you.", "es", {}) == "Gracias."
+    assert apply_cultural_adaptation("Thank you.", "ta", {}) == "Thank you."
+
+
+def test_explicit_rules_override_courtesy_phrases():
+    assert apply_cultural_adaptation("Thank you", "hi", {"Thank you": "शुक्रिया"}) == "शुक्रिया"
+
+
+def test_matcher_compiled_once_per_rules_version():
+    matcher = get_cultural_matcher("hi", RULES)
+    assert get_cultural_matcher("hi-IN", dict(RULES)) is matcher
+    assert get_cultural_matcher("es", RULES) is not matcher
+    assert get_cultural_matcher("hi", {**RULES, "feet": "meters"}) is not matcher
+    # A precompiled matcher (as carried in the job context) is used as is
+    assert apply_cultural_adaptation("5 USD", "es", matcher) == "5 INR"
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
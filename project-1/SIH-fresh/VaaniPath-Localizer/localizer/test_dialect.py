@@ -0,0 +1,82 @@
+"""Checks for the compiled dialect engine (dialect.py) against the old _approx_bhojpuri.
+
+The expected strings were produced by the removed ``translation._approx_bhojpuri``
+(sequential ``\\b...\\b`` re.sub calls). Where that function got a sentence right the
+engine must give the same output; where its ``\\b`` broke on vowel signs (है, नहीं,
+तुम्हारा, ...) the engine's whole-word output is pinned instead, with the old output
+noted for reference.
+
+Run with ``python -m pytest localizer/test_dialect.py`` from the repository root.
+"""
+import json
+import os
+import sys
+
+import pytest
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from localizer import dialect
+from localizer.dialect import DialectEngine, apply_dialect, get_dialect_engine
+
+# Sentences _approx_bhojpuri handled correctly: same output expected
+LEGACY_PARITY = [
+    ("यह है पहला पाठ।", "ई बा पहला पाठ।"),
+    ("ठीक है? तो क्या है अगला कदम?", "ठीक बा? तऽ का बा अगला कदम?"),
+    ("लेकिन सुबह और शाम तब साहब आप कब", "बाकिर सबेरे आउर सांझ तब साहेब रउआ कबहुँ"),
+    ("वे हैं, ये हैं।", "ऊ लोग बाड़े, ई लोग बाड़े।"),
+    ("Python क्या है?", "पायथन का बा?"),
+]
+
+# Sentences where the old \b rules misfired; the old output is in the comment
+LEGACY_FIXED = [
+    # old: "मशीन काम कर रहा है।" (no rule fired after the matra)
+    ("मशीन काम कर रहा है।", "मशीन काम करत बा।"),
+    # old: "का भइल अगर जुड़ाव नहीं होगा"
+    ("क्या हुआ अगर कनेक्शन नहीं होगा", "का भइल अगर जुड़ाव ना होई"),
+    # old: "मेरा नाम राम है आउर तू्हारा नाम श्याम है।" (तुम rewritten inside तुम्हारा)
+    ("मेरा नाम राम है और तुम्हारा नाम श्याम है।", "हमार नाम राम बा आउर तोहार नाम श्याम बा।"),
+    # old: "रउआ दस्ताने पहनें, काहेकि मशीन चल रही है आउर उह गर्म हो सकती है।"
+    (
+        "आप दस्ताने पहनें, क्योंकि मशीन चल रही है और वह गर्म हो सकती है।",
+        "रउआ दस्ताने पहनें, काहे कि मशीन चल करत बा आउर उह गर्म हो सकेले।",
+    ),
+]
+
+
+@pytest.mark.parametrize("hindi,bhojpuri", LEGACY_PARITY + LEGACY_FIXED)
+def test_bho_rules(hindi, bhojpuri):
+    assert apply_dialect(hindi, "bho") == bhojpuri
+
+
+def test_longest_phrase_wins_and_replacements_are_not_rematched():
+    engine = DialectEngine({"है": "बा", "रहा है": "रहल बा", "कर रहा है": "करत बा", "बा": "X"})
+    assert engine.apply("वह कर रहा है, वह रहा है, यह है") == "वह करत बा, वह रहल बा, यह बा"
+
+
+def test_only_whole_words_match():
+    engine = DialectEngine({"तुम": "तू", "आप": "रउआ"})
+    assert engine.apply("तुम्हारा आपको तुम, आप") == "तुम्हारा आपको तू, रउआ"
+
+
+def test_unknown_code_is_passthrough():
+    assert apply_dialect("यह है", "xx") == "यह है"
+
+
+def test_rules_file_recompiled_when_changed(tmp_path, monkeypatch):
+    monkeypatch.setattr(dialect, "DIALECTS_DIR", str(tmp_path))
+    monkeypatch.setattr(dialect, "_ENGINES", {})
+    path = tmp_path / "tst.json"
+    path.write_text(json.dumps({"rules": {"है": "बा"}}), encoding="utf-8")
+    first = get_dialect_engine("tst")
+    assert get_dialect_engine("tst") is first
+    assert first.apply("यह है") == "यह बा"
+
+    path.write_text(json.dumps({"rules": {"है": "हौ"}}), encoding="utf-8")
+    os.utime(path, ns=(1, os.stat(path).st_mtime_ns + 1_000_000_000))
+    assert get_dialect_engine("tst").apply("यह है") == "यह हौ"
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
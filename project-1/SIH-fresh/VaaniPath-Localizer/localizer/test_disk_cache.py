@@ -0,0 +1,98 @@
+"""Checks for the SQLite LRU cache (disk_cache.py): running size total, eviction and access times.
+
+Run with ``python -m pytest localizer/test_disk_cache.py`` from the repository root.
+"""
+import os
+import sqlite3
+import sys
+
+import pytest
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from localizer import disk_cache
+from localizer.disk_cache import DiskCache
+
+
+def _table(cache):
+    conn = sqlite3.connect(cache.path)
+    try:
+        rows = dict(conn.execute("SELECT key, last_access FROM entries").fetchall())
+        total, summed = conn.execute(
+            "SELECT total, (SELECT COALESCE(SUM(size), 0) FROM entries) FROM usage WHERE id = 0"
+        ).fetchone()
+    finally:
+        conn.close()
+    return rows, total, summed
+
+
+def test_running_total_follows_inserts_replaces_and_evictions(tmp_path):
+    cache = DiskCache(str(tmp_path / "c.sqlite"), max_bytes=1000)
+    cache.set("a", b"x" * 100)
+    cache.set("b", b"x" * 200)
+    cache.set("a", b"x" * 50)  # replace shrinks the entry
+    rows, total, summed = _table(cache)
+    assert set(rows) == {"a", "b"}
+    assert total == summed == 250
+
+    for i in range(10):
+        cache.set(f"k{i}", b"x" * 150)
+    _, total, summed = _table(cache)
+    assert total == summed <= 1000
+    assert cache.stats()["size_mb"] == round(total / (1024 * 1024), 2)
+
+
+def test_eviction_drops_least_recently_used_down_to_low_watermark(tmp_path, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(disk_cache.time, "time", lambda: clock[0])
+    cache = DiskCache(str(tmp_path / "c.sqlite"), max_bytes=1000)
+    for i in range(5):
+        clock[0] += 1
+        cache.set(f"k{i}", b"x" * 200)  # exactly at budget: nothing evicted yet
+    assert len(_table(cache)[0]) == 5
+
+    clock[0] += 1000  # long enough for a hit to refresh last_access
+    assert cache.get("k0") == b"x" * 200
+    clock[0] += 1
+    cache.set("new", b"x" * 200)
+
+    rows, total, _ = _table(cache)
+    # k0 was just read, so k1 and k2 (the oldest) go, leaving 800 <= 90% of the budget
+    assert set(rows) == {"k0", "k3", "k4", "new"}
+    assert total == 800
+
+
+def test_hits_only_touch_stale_access_times(tmp_path, monkeypatch):
+    clock = [1000.0]
+    monkeypatch.setattr(disk_cache.time, "time", lambda: clock[0])
+    cache = DiskCache(str(tmp_path / "c.sqlite"), max_bytes=1000)
+    cache.set("k", b"v")
+
+    clock[0] += disk_cache._TOUCH_INTERVAL_S / 2
+    assert cache.get("k") == b"v"
+    assert _table(cache)[0]["k"] == 1000.0
+
+    clock[0] += disk_cache._TOUCH_INTERVAL_S
+    assert cache.get("k") == b"v"
+    assert _table(cache)[0]["k"] == clock[0]
+    assert (cache.hits, cache.misses) == (2, 0)
+
+
+def test_total_seeded_from_existing_table(tmp_path):
+    path = str(tmp_path / "old.sqlite")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE entries (key TEXT PRIMARY KEY, value BLOB NOT NULL, size INTEGER NOT NULL, last_access REAL NOT NULL)"
+    )
+    conn.execute("INSERT INTO entries VALUES ('old', x'00', 300, 0)")
+    conn.commit()
+    conn.close()
+
+    cache = DiskCache(path, max_bytes=1000)
+    assert cache.get("old") == b"\x00"
+    assert _table(cache)[1] == 300
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,60 @@
+"""Checks for relevant-term glossary selection (glossary.relevant_terms) used by LLM prompts.
+
+Run with ``python -m pytest localizer/test_glossary.py`` from the repository root.
+"""
+import os
+import sys
+
+import pytest
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from localizer.glossary import GlossaryIndex, relevant_terms
+
+GLOSSARY = {
+    "valve": "वाल्व",
+    "safety valve": "सेफ्टी वाल्व",
+    "Go": "Go",
+    "power supply": "पावर सप्लाई",
+    "PLC": "पीएलसी",
+}
+
+
+def test_only_terms_in_the_text_in_order_of_first_occurrence():
+    text = "Check the power supply, then the PLC. Open the safety valve."
+    assert list(relevant_terms(GLOSSARY, text)) == ["power supply", "PLC", "safety valve", "valve"]
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("we use GO and plc", ["Go", "PLC"]),  # case-insensitive
+    ("Google valves", []),  # whole words only
+    ("power\n  supply", ["power supply"]),  # any whitespace between words
+    ("", []),
+])
+def test_whole_word_case_insensitive(text, expected):
+    assert list(relevant_terms(GLOSSARY, text)) == expected
+
+
+def test_empty_glossary():
+    assert relevant_terms(None, "valve") == {}
+    assert relevant_terms({}, "valve") == {}
+
+
+def test_index_values_come_from_the_glossary():
+    assert GlossaryIndex(GLOSSARY).relevant("the valve") == {"valve": "वाल्व"}
+
+
+def test_gemini_prompt_carries_only_relevant_terms():
+    pytest.importorskip("requests")
+    from localizer.translation import _gemini_instructions
+
+    big = {**GLOSSARY, **{f"term{i}": f"T{i}" for i in range(500)}}
+    instructions, n_terms = _gemini_instructions("hi", None, big, "Close the valve.")
+    assert n_terms == 1
+    assert instructions[-1].endswith("- valve -> वाल्व")
+    assert len("\n".join(instructions)) < 500
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
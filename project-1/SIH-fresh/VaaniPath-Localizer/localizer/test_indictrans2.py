@@ -0,0 +1,157 @@
+"""Checks for the IndicTrans2 engine (indictrans2.py) and its Google fallback.
+
+The batching checks drive ``IndicTrans2Engine.translate_batch`` with a recording
+translator and a whitespace tokenizer, so they need no model. ``test_tiny_model`` runs
+the real engine and is skipped unless ctranslate2 + sentencepiece are installed and
+``INDICTRANS2_TEST_MODEL_DIR`` points at a small converted model, e.g.:
+
+    ct2-fairseq-converter --model_path <indictrans2-en-indic-dist>/model/checkpoint_best.pt \
+        --data_dir <indictrans2-en-indic-dist>/final_bin --output_dir /tmp/it2-ct2 --quantization int8
+    cp <indictrans2-en-indic-dist>/vocab/model.SRC <indictrans2-en-indic-dist>/vocab/model.TGT /tmp/it2-ct2/
+    INDICTRANS2_TEST_MODEL_DIR=/tmp/it2-ct2 python -m pytest localizer/test_indictrans2.py
+
+Run with ``python -m pytest localizer/test_indictrans2.py`` from the repository root.
+"""
+import os
+import sys
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from localizer.indictrans2 import IndicTrans2Engine, flores_code, postprocess, preprocess
+
+
+class _WhitespaceSPM:
+    def encode(self, text, out_type=str):
+        return text.split()
+
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+
+class _RecordingTranslator:
+    """Echoes each batch (tags dropped, upper-cased) and remembers what it was sent."""
+
+    def __init__(self):
+        self.batches = []
+
+    def translate_batch(self, batch, **kwargs):
+        self.batches.append(batch)
+        return [SimpleNamespace(hypotheses=[[t.upper() for t in tokens[2:]]]) for tokens in batch]
+
+
+def _fake_engine():
+    engine = IndicTrans2Engine.__new__(IndicTrans2Engine)
+    engine.model_dir = "<fake>"
+    engine.translator = _RecordingTranslator()
+    engine.sp_source = engine.sp_target = _WhitespaceSPM()
+    engine._lock = threading.Lock()
+    engine.stats = {"sentences": 0, "seconds": 0.0}
+    return engine
+
+
+SENTENCES = [
+    "a fairly long sentence with many words in it",
+    "short",
+    "a medium length sentence",
+    "two words",
+    "the longest sentence of them all by quite a wide margin indeed",
+]
+
+
+def test_batches_sorted_by_length_and_order_restored():
+    engine = _fake_engine()
+    out = engine.translate_batch(SENTENCES, "hi", source_lang="en", batch_size=2)
+
+    assert out == [s.upper() for s in SENTENCES]
+    batches = engine.translator.batches
+    assert [len(b) for b in batches] == [2, 2, 1]
+    lengths = [len(tokens) for batch in batches for tokens in batch]
+    assert lengths == sorted(lengths)
+    assert engine.stats["sentences"] == len(SENTENCES)
+
+
+def test_language_tags_prefixed():
+    engine = _fake_engine()
+    engine.translate_batch(["hello world"], "mr", source_lang="en")
+    assert engine.translator.batches == [[["eng_Latn", "mar_Deva", "hello", "world"]]]
+
+
+@pytest.mark.parametrize("source,target", [("en", "xx"), ("hi", "mr"), ("en", "en")])
+def test_unsupported_language_rejected(source, target):
+    with pytest.raises(ValueError):
+        _fake_engine().translate_batch(["hello"], target, source_lang=source)
+
+
+def test_entities_masked_and_restored():
+    text, entities = preprocess("Visit \u201chttps://example.org/docs\u201d by 12/05/2024\u2026")
+    assert text == 'Visit "<ID1>" by <ID2>...'
+    assert entities == ["https://example.org/docs", "12/05/2024"]
+    # The model may respace or re-bracket a tag
+    assert postprocess("[ID2] तक < ID1 > देखें", entities) == "12/05/2024 तक https://example.org/docs देखें"
+
+    engine = _fake_engine()
+    out = engine.translate_batch(["mail ops@example.org today"], "hi", source_lang="en")
+    assert engine.translator.batches == [[["eng_Latn", "hin_Deva", "mail", "<ID1>", "today"]]]
+    assert out == ["MAIL ops@example.org TODAY"]
+
+
+def test_google_fallback_without_engine(monkeypatch):
+    pytest.importorskip("requests")
+    from localizer import translation
+
+    calls = []
+    monkeypatch.setattr(translation, "get_indictrans2_engine", lambda: None)
+    monkeypatch.setattr(
+        translation, "_translate_google", lambda text, lang, *a, **k: calls.append(text) or f"google:{text}"
+    )
+    assert translation._translate_provider("Hello there.", "hi", "indictrans2", None, None) == "google:Hello there."
+    assert calls == ["Hello there."]
+
+
+@pytest.mark.parametrize("source,target,engine_used", [
+    ("en", "hi", True),
+    ("en-US", "ta", True),
+    ("hi", "mr", False),  # en-indic model: non-English source goes to Google
+    ("en", "en", False),  # English has a FLORES tag but is not an Indic target
+    ("en", "fr", False),
+])
+def test_source_language_routing(monkeypatch, source, target, engine_used):
+    pytest.importorskip("requests")
+    from localizer import translation
+
+    engine = _fake_engine()
+    google = []
+    monkeypatch.setattr(translation, "get_indictrans2_engine", lambda: engine)
+    monkeypatch.setattr(
+        translation, "_translate_google", lambda text, lang, *a, **k: google.append(text) or f"google:{text}"
+    )
+    monkeypatch.setattr(translation, "TRANSLATION_MEMORY_ENABLED", False)
+
+    out = translation.translate_text("Hello there.", target, model="indictrans2", source_lang=source)
+    if engine_used:
+        assert out == "HELLO THERE." and not google
+        assert engine.translator.batches[0][0][:2] == ["eng_Latn", flores_code(target)]
+    else:
+        assert out == "google:Hello there." and not engine.translator.batches
+
+
+def test_tiny_model():
+    pytest.importorskip("ctranslate2")
+    pytest.importorskip("sentencepiece")
+    model_dir = os.environ.get("INDICTRANS2_TEST_MODEL_DIR", "")
+    if not model_dir or not os.path.isdir(model_dir):
+        pytest.skip("INDICTRANS2_TEST_MODEL_DIR not set to a converted IndicTrans2 model")
+
+    engine = IndicTrans2Engine(model_dir, threads=1)
+    out = engine.translate_batch(SENTENCES, "hi", source_lang="en", batch_size=2)
+    assert len(out) == len(SENTENCES)
+    assert all(isinstance(t, str) and t for t in out)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
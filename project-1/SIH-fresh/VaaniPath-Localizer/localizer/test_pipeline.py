@@ -0,0 +1,99 @@
+"""Checks for the staged pipeline engine (pipeline.py).
+
+Run with ``python -m pytest localizer/test_pipeline.py`` from the repository root.
+"""
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from localizer.pipeline import Stage, StagedPipeline
+
+
+def test_every_item_passes_every_stage():
+    pipeline = StagedPipeline([
+        Stage("double", lambda x: x * 2, workers=3),
+        Stage("inc", lambda x: x + 1, workers=2),
+    ], queue_size=2)
+    assert sorted(pipeline.run(range(20))) == [2 * i + 1 for i in range(20)]
+    assert pipeline.stats["double"]["done"] == pipeline.stats["inc"]["done"] == 20
+
+
+def test_failed_item_is_dropped_and_the_rest_carry_on():
+    seen_by_tts = []
+
+    def translate(item):
+        if item["index"] in (3, 7):
+            raise RuntimeError("provider down")
+        return item
+
+    def tts(item):
+        seen_by_tts.append(item["index"])
+        return item
+
+    pipeline = StagedPipeline(
+        [Stage("translate", translate, workers=2), Stage("tts", tts, workers=2)],
+        key=lambda item: f"chunk {item['index']}",
+    )
+    out = pipeline.run({"index": i} for i in range(10))
+
+    assert sorted(item["index"] for item in out) == [0, 1, 2, 4, 5, 6, 8, 9]
+    assert 3 not in seen_by_tts and 7 not in seen_by_tts
+    assert (pipeline.stats["translate"]["done"], pipeline.stats["translate"]["failed"]) == (8, 2)
+    assert pipeline.stats["tts"]["failed"] == 0
+
+
+def test_last_stage_failure_is_dropped_too():
+    pipeline = StagedPipeline([Stage("only", lambda x: 1 // x, workers=2)])
+    assert sorted(pipeline.run([1, 0, 1])) == [1, 1]
+    assert pipeline.stats["only"]["failed"] == 1
+
+
+def test_executor_stage_runs_on_the_executor():
+    names = set()
+
+    def work(x):
+        names.add(threading.current_thread().name)
+        return x
+
+    with ThreadPoolExecutor(max_workers=2, thread_name_prefix="stt-pool") as pool:
+        out = StagedPipeline([Stage("stt", work, workers=2, executor=pool)]).run(range(6))
+    assert sorted(out) == list(range(6))
+    assert names and all(n.startswith("stt-pool") for n in names)
+
+
+def test_bounded_queues_hold_back_a_fast_producer():
+    pulled = []
+    lock = threading.Lock()
+    in_flight = []
+
+    def source():
+        for i in range(30):
+            with lock:
+                pulled.append(i)
+            yield i
+
+    def slow(x):
+        time.sleep(0.002)
+        with lock:
+            in_flight.append(len(pulled) - x)
+        return x
+
+    StagedPipeline([Stage("fast", lambda x: x, 1), Stage("slow", slow, 1)], queue_size=2).run(source())
+    # Pulled but unfinished: both queues, one item per stage worker, one blocked in put()
+    assert max(in_flight) <= 2 * 2 + 2 + 1
+
+
+def test_needs_a_stage():
+    with pytest.raises(ValueError):
+        StagedPipeline([])
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,69 @@
+"""Checks for the compiled pronunciation overrides in tts.py.
+
+tts.py imports the gTTS and edge-tts clients, so this module is skipped without them;
+nothing is synthesized.
+
+Run with ``python -m pytest localizer/test_pronunciation.py`` from the repository root.
+"""
+import json
+import os
+import sys
+
+import pytest
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+pytest.importorskip("gtts")
+pytest.importorskip("edge_tts")
+
+from localizer import tts
+from localizer.tts import OverriddenText, PronunciationOverrides, apply_pronunciation_overrides
+
+
+@pytest.fixture
+def overrides_file(tmp_path, monkeypatch):
+    path = tmp_path / "pronunciation_overrides.json"
+    monkeypatch.setattr(tts, "OVERRIDES_PATH", str(path))
+    monkeypatch.setattr(tts, "_PRON_OVERRIDES", (None, {}))
+    monkeypatch.setattr(tts, "_PRON_MATCHERS", {})
+
+    def write(data, bump=0):
+        path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+        if bump:
+            st = os.stat(path)
+            os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + bump * 1_000_000_000))
+    return write
+
+
+def test_literals_are_whole_word_case_insensitive_then_patterns_in_order():
+    ov = PronunciationOverrides({
+        "SQL": "सीक्वल",
+        "re:\\bv(\\d+)": "वर्ज़न \\1",
+        "re:वर्ज़न 2": "वर्ज़न दो",
+    })
+    assert ov.apply("sql and MySQL on v2") == "सीक्वल and MySQL on वर्ज़न दो"
+    assert ov.size == 3
+
+
+def test_overrides_applied_once(overrides_file):
+    # Applying twice would turn "S Q L" into "Es Q L"
+    overrides_file({"hi": {"SQL": "S Q L", "re:\\bS\\b": "Es"}})
+    once = apply_pronunciation_overrides("SQL", "hi")
+    assert isinstance(once, OverriddenText) and once == "Es Q L"
+    assert apply_pronunciation_overrides(once, "hi") is once
+    assert apply_pronunciation_overrides(OverriddenText("SQL", "ta"), "hi") == "Es Q L"
+
+
+def test_locale_inherits_base_and_recompiles_on_change(overrides_file):
+    overrides_file({"hi": {"AI": "ए आई"}})
+    assert apply_pronunciation_overrides("AI", "hi-IN") == "ए आई"
+    assert tts.get_pronunciation_overrides("hi") is tts.get_pronunciation_overrides("hi")
+
+    overrides_file({"hi": {"AI": "एआई"}}, bump=1)
+    assert apply_pronunciation_overrides("AI", "hi") == "एआई"
+    assert apply_pronunciation_overrides("AI", "ta") == "AI"
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
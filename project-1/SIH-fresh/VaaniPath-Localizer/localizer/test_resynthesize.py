@@ -0,0 +1,110 @@
+"""Checks for incremental resynthesis (resynthesize.resynthesize_job): only dirty chunks are re-voiced.
+
+TTS is replaced by a fake that writes the clip files and records what it was asked
+for, and the fingerprint by a hash of (text, language), so no voices are looked up.
+resynthesize.py imports the gTTS and edge-tts clients and is skipped without them.
+
+Run with ``python -m pytest localizer/test_resynthesize.py`` from the repository root.
+"""
+import json
+import os
+import sys
+
+import pytest
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+pytest.importorskip("gtts")
+pytest.importorskip("edge_tts")
+
+from localizer import resynthesize
+from localizer.utils import content_version
+
+
+@pytest.fixture
+def job(tmp_path, monkeypatch):
+    voiced = []
+
+    def fake_many(items, stats=None):
+        for text, lang, path in items:
+            voiced.append(str(text))
+            with open(path, "wb") as f:
+                f.write(text.encode("utf-8"))
+        return [path for _, _, path in items]
+
+    monkeypatch.setattr(resynthesize, "tts_synthesize_many", fake_many)
+    monkeypatch.setattr(resynthesize, "tts_fingerprint", lambda text, lang: content_version([text, lang]))
+
+    (tmp_path / "tts").mkdir()
+    chunks = [
+        {"index": 0, "start": 0.0, "end": 5.0, "text_translated": "पहला"},
+        {"index": 1, "start": 5.0, "end": 10.0, "text_translated": "", "speech": False},
+        {"index": 2, "start": 10.0, "end": 15.0, "text_translated": "तीसरा"},
+    ]
+    manifest = tmp_path / "manifest.json"
+    manifest.write_text(json.dumps({"target_lang": "hi", "chunks": chunks}, ensure_ascii=False), encoding="utf-8")
+    return manifest, voiced
+
+
+def _edit(manifest, index, text):
+    m = json.loads(manifest.read_text(encoding="utf-8"))
+    m["chunks"][index]["text_translated"] = text
+    manifest.write_text(json.dumps(m, ensure_ascii=False), encoding="utf-8")
+
+
+def test_first_pass_voices_speech_chunks_then_everything_is_reused(job):
+    manifest, voiced = job
+    first = resynthesize.resynthesize_job(str(manifest))
+    assert first["regenerated_count"] == 2 and sorted(voiced) == ["तीसरा", "पहला"]
+    saved = json.loads(manifest.read_text(encoding="utf-8"))["chunks"]
+    assert saved[0]["tts_fingerprint"] and "tts_fingerprint" not in saved[1]
+
+    voiced.clear()
+    second = resynthesize.resynthesize_job(str(manifest))
+    assert (second["regenerated_count"], second["reused"]) == (0, [0, 2])
+    assert voiced == []
+
+
+def test_only_edited_chunk_is_regenerated(job):
+    manifest, voiced = job
+    resynthesize.resynthesize_job(str(manifest))
+    voiced.clear()
+    _edit(manifest, 2, "तीसरा (संशोधित)")
+
+    result = resynthesize.resynthesize_job(str(manifest))
+    assert [u["index"] for u in result["updated"]] == [2]
+    assert result["reused"] == [0]
+    assert voiced == ["तीसरा (संशोधित)"]
+
+
+def test_missing_clip_is_regenerated(job):
+    manifest, voiced = job
+    resynthesize.resynthesize_job(str(manifest))
+    voiced.clear()
+    os.remove(manifest.parent / "tts" / "chunk_0000.mp3")
+
+    result = resynthesize.resynthesize_job(str(manifest))
+    assert [u["index"] for u in result["updated"]] == [0]
+    assert voiced == ["पहला"]
+
+
+def test_relative_manifest_path_reuses_clips(job, monkeypatch):
+    manifest, voiced = job
+    resynthesize.resynthesize_job(str(manifest))
+    voiced.clear()
+    monkeypatch.chdir(manifest.parent)
+    assert resynthesize.resynthesize_job("manifest.json")["reused_count"] == 2
+    assert voiced == []
+
+
+def test_other_output_dir_regenerates(job, tmp_path):
+    manifest, voiced = job
+    resynthesize.resynthesize_job(str(manifest))
+    result = resynthesize.resynthesize_job(str(manifest), output_dir=str(tmp_path / "elsewhere"))
+    assert result["regenerated_count"] == 2
+    assert os.path.exists(tmp_path / "elsewhere" / "chunk_0002.mp3")
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
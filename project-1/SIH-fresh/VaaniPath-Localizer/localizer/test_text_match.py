@@ -0,0 +1,75 @@
+"""Checks for the Aho-Corasick glossary normalizer (text_match.py, glossary.clean_transcript).
+
+Run with ``python -m pytest localizer/test_text_match.py`` from the repository root.
+"""
+import os
+import sys
+
+import pytest
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from localizer.glossary import clean_transcript, get_glossary_matcher, get_job_glossary_matcher
+from localizer.text_match import AhoCorasickReplacer, tokenize
+
+
+def test_tokenize_is_lossless_on_devanagari():
+    text = "मशीन  चालू है। Check-valve, ok?"
+    tokens = tokenize(text)
+    assert "".join(tokens) == text
+    assert "है" in tokens and "है।" not in tokens  # danda is punctuation, matras are word chars
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("we use go daily", "we use Go daily"),
+    ("Google is not Go", "Google is not Go"),  # whole words only
+    ("GO, go; Go.", "Go, Go; Go."),  # any case, punctuation-adjacent
+    ("ci/cd PIPELINE", "CI/CD Pipeline"),
+])
+def test_case_insensitive_whole_word_matching(text, expected):
+    matcher = AhoCorasickReplacer({"go": "Go", "ci/cd": "CI/CD", "pipeline": "Pipeline"})
+    assert matcher.replace(text) == expected
+
+
+def test_leftmost_longest_and_overlaps():
+    matcher = AhoCorasickReplacer({
+        "machine": "M",
+        "machine learning": "ML",
+        "learning rate": "LR",
+        "deep machine learning model": "DMLM",
+    })
+    assert matcher.replace("machine learning rate") == "ML rate"
+    assert matcher.replace("a deep machine learning model") == "a DMLM"
+    # Failure links: a partial long match falls back to the shorter key inside it
+    assert matcher.replace("deep machine learning rate") == "deep ML rate"
+
+
+def test_whitespace_runs_match_key_spaces():
+    matcher = AhoCorasickReplacer({"power  supply": "Power Supply"})
+    assert matcher.replace("check the power\t supply\nnow") == "check the Power Supply\nnow"
+
+
+def test_replacement_is_single_pass():
+    matcher = AhoCorasickReplacer({"a": "b", "b": "c"})
+    assert matcher.replace("a b") == "b c"
+
+
+def test_clean_transcript_matches_devanagari_terms_and_normalizes_space():
+    glossary = {"वाल्व": "Valve", "सेफ्टी गियर": "Safety Gear"}
+    assert clean_transcript("  वाल्वों और वाल्व   बदलें, सेफ्टी  गियर पहनें ", glossary) == (
+        "वाल्वों और Valve बदलें, Safety Gear पहनें"
+    )
+
+
+def test_matchers_cached_per_content_version():
+    glossary = {"plc": "PLC"}
+    assert get_glossary_matcher(glossary) is get_glossary_matcher(dict(glossary))
+    assert get_glossary_matcher({"plc": "P.L.C."}) is not get_glossary_matcher(glossary)
+    job = get_job_glossary_matcher({"hmi": "HMI"})
+    assert job is get_job_glossary_matcher({"hmi": "HMI"})
+    assert job.replace("the hmi panel") == "the HMI panel"
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,79 @@
+"""Checks for the content-addressed transcript cache (stt.transcribe_cached).
+
+Whisper itself is replaced by a counting stub, so no model is loaded; the module still
+imports faster_whisper and is skipped without it.
+
+Run with ``python -m pytest localizer/test_transcript_cache.py`` from the repository root.
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+pytest.importorskip("faster_whisper")
+
+from localizer import stt
+from localizer.audio_extract import read_pcm_window, shared_pcm, to_float32, write_wav
+from localizer.disk_cache import DiskCache
+
+
+@pytest.fixture
+def calls(tmp_path, monkeypatch):
+    calls = []
+
+    def fake_transcribe(audio, source_lang, initial_prompt, mode="fast"):
+        calls.append((source_lang, initial_prompt, mode))
+        return "hello world", [{"start": 0.0, "end": 1.0, "text": "hello world"}]
+
+    monkeypatch.setattr(stt, "TRANSCRIPT_CACHE_ENABLED", True)
+    monkeypatch.setattr(stt, "_TRANSCRIPT_CACHE", DiskCache(str(tmp_path / "t.sqlite"), 1 << 20))
+    monkeypatch.setattr(stt, "transcribe", fake_transcribe)
+    return calls
+
+
+def _pcm(seconds=1.0):
+    t = np.arange(int(16000 * seconds))
+    return (np.sin(t * 2 * np.pi * 220 / 16000) * 8000).astype(np.int16)
+
+
+def test_same_audio_is_transcribed_once(calls):
+    audio = to_float32(_pcm())
+    assert stt.transcribe_cached(audio, "en", "prompt")[2] is False
+    text, segments, hit = stt.transcribe_cached(audio.copy(), "en-IN", "prompt")
+    assert hit is True
+    assert text == "hello world" and segments[0]["end"] == 1.0
+    assert len(calls) == 1
+
+
+@pytest.mark.parametrize("change", [
+    {"source_lang": "hi"},
+    {"initial_prompt": "another prompt"},
+    {"mode": "quality"},
+])
+def test_settings_are_part_of_the_key(calls, change):
+    audio = to_float32(_pcm())
+    args = {"source_lang": "en", "initial_prompt": "prompt", "mode": "fast"}
+    stt.transcribe_cached(audio, **args)
+    assert stt.transcribe_cached(audio, **{**args, **change})[2] is False
+    assert len(calls) == 2
+
+
+def test_wav_file_and_shared_memory_window_share_entries(calls, tmp_path):
+    pcm = _pcm()
+    path = write_wav(str(tmp_path / "chunk_0000.wav"), pcm)
+    stt.transcribe_cached(path, "en", "prompt")
+
+    with shared_pcm(np.concatenate([_pcm(0.5), pcm])) as name:
+        if name is None:
+            pytest.skip("no shared memory here")
+        window = read_pcm_window(name, 8000, len(pcm))
+    assert stt.transcribe_cached(window, "en", "prompt")[2] is True
+    assert len(calls) == 1
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,92 @@
+"""Checks for the sentence-level translation memory in front of translate_text.
+
+Google is replaced by a fake that upper-cases text and keeps the segment markers, so
+each test can count round trips and see what was sent.
+
+Run with ``python -m pytest localizer/test_translation_memory.py`` from the repository root.
+"""
+import os
+import sys
+
+import pytest
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+pytest.importorskip("requests")
+
+from localizer import translation, translation_memory
+from localizer.disk_cache import DiskCache
+from localizer.translation_memory import split_sentences
+
+TEXT = "Wear gloves. Check the valve!\nClose the panel."
+
+
+@pytest.fixture
+def sent(tmp_path, monkeypatch):
+    sent = []
+
+    def fake_google(text, target_lang, *args, **kwargs):
+        sent.append(text)
+        return text.upper()
+
+    monkeypatch.setattr(translation_memory, "_TM", DiskCache(str(tmp_path / "tm.sqlite"), 1 << 20))
+    monkeypatch.setattr(translation, "TRANSLATION_MEMORY_ENABLED", True)
+    monkeypatch.setattr(translation, "_translate_google", fake_google)
+    return sent
+
+
+def test_split_sentences_keeps_danda_and_normalizes_space():
+    assert split_sentences("  नमस्ते।  ठीक   है? Yes ") == ["नमस्ते।", "ठीक है?", "Yes"]
+
+
+def test_misses_go_out_as_one_batch_and_lines_are_kept(sent):
+    stats = {}
+    out = translation.translate_text(TEXT, "hi", model="google", stats=stats)
+
+    assert out == "WEAR GLOVES. CHECK THE VALVE!\nCLOSE THE PANEL."
+    assert len(sent) == 1
+    assert sent[0].count("§") == 6  # three marker-wrapped sentences in one request
+    assert stats == {"tm_hits": 0, "tm_misses": 3}
+
+
+def test_only_new_sentences_are_sent(sent):
+    translation.translate_text(TEXT, "hi", model="google")
+    sent.clear()
+    stats = {}
+    out = translation.translate_text("Wear gloves. Open the door.\nClose the panel.", "hi", model="google", stats=stats)
+
+    assert out == "WEAR GLOVES. OPEN THE DOOR.\nCLOSE THE PANEL."
+    assert sent == ["Open the door."]
+    assert stats == {"tm_hits": 2, "tm_misses": 1}
+
+
+def test_entries_are_per_target_language(sent):
+    translation.translate_text(TEXT, "hi", model="google")
+    stats = {}
+    translation.translate_text(TEXT, "ta", model="google", stats=stats)
+    assert stats == {"tm_hits": 0, "tm_misses": 3}
+    assert len(sent) == 2
+
+
+def test_mangled_batch_falls_back_to_one_call_and_stores_nothing(sent, monkeypatch):
+    monkeypatch.setattr(translation, "_translate_google", lambda text, lang, *a, **k: sent.append(text) or "MANGLED")
+    assert translation.translate_text(TEXT, "hi", model="google") == "MANGLED"
+    # The batch, then the whole text once, instead of one request per sentence
+    assert len(sent) == 2 and sent[1] == TEXT
+
+    stats = {}
+    translation.translate_text(TEXT, "hi", model="google", stats=stats)
+    assert stats["tm_hits"] == 0
+
+
+def test_placeholders_are_not_stored(sent, monkeypatch):
+    monkeypatch.setattr(translation, "_translate_google", lambda text, lang, *a, **k: f"[{lang}] {text}")
+    translation.translate_text("Wear gloves.", "hi", model="google")
+    stats = {}
+    translation.translate_text("Wear gloves.", "hi", model="google", stats=stats)
+    assert stats == {"tm_hits": 0, "tm_misses": 1}
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
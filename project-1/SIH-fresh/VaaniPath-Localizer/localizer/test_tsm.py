@@ -0,0 +1,69 @@
+"""Checks for the numpy WSOLA time-stretch engine (tsm.py).
+
+Run with ``python -m pytest localizer/test_tsm.py`` from the repository root.
+"""
+import os
+import sys
+
+import numpy as np
+import pytest
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from localizer.tsm import QUALITY_PRESETS, fit_length, wsola
+
+RATE = 24000
+
+
+def _tone(seconds: float, freq: float = 220.0) -> np.ndarray:
+    t = np.arange(int(RATE * seconds)) / RATE
+    return (0.5 * np.sin(2 * np.pi * freq * t)).astype(np.float32)
+
+
+def _peak_hz(x: np.ndarray) -> float:
+    spectrum = np.abs(np.fft.rfft(x * np.hanning(len(x))))
+    return float(np.argmax(spectrum)) * RATE / len(x)
+
+
+@pytest.mark.parametrize("quality", sorted(QUALITY_PRESETS))
+@pytest.mark.parametrize("tempo", [0.5, 0.8, 1.25, 1.5, 2.0])
+@pytest.mark.parametrize("seconds", [0.01, 0.3, 2.0])
+def test_output_length_is_exact(quality, tempo, seconds):
+    x = _tone(seconds)
+    out = wsola(x, tempo, RATE, quality)
+    assert len(out) == int(round(len(x) / tempo))
+    assert out.dtype == np.float32
+
+
+@pytest.mark.parametrize("tempo", [0.75, 1.4])
+def test_pitch_and_level_are_kept(tempo):
+    x = _tone(2.0)
+    out = wsola(x, tempo, RATE)
+    body = out[RATE // 10: -RATE // 10]  # skip the fade-in/out half frames
+    assert abs(_peak_hz(body) - 220.0) < 5.0
+    rms_in, rms_out = np.sqrt(np.mean(x ** 2)), np.sqrt(np.mean(body ** 2))
+    assert abs(rms_out / rms_in - 1.0) < 0.1
+
+
+def test_unit_tempo_and_empty_input_are_copies():
+    x = _tone(0.5)
+    out = wsola(x, 1.0, RATE)
+    assert out is not x and np.array_equal(out, x)
+    assert len(wsola(np.zeros(0, np.float32), 1.5, RATE)) == 0
+
+
+def test_invalid_tempo_rejected():
+    with pytest.raises(ValueError):
+        wsola(_tone(0.1), 0.0, RATE)
+
+
+def test_fit_length():
+    x = np.ones(5, np.float32)
+    assert len(fit_length(x, 3)) == 3
+    padded = fit_length(x, 8)
+    assert len(padded) == 8 and padded[5:].sum() == 0 and padded.dtype == np.float32
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,103 @@
+"""Checks for the persisted, TTL'd edge-tts voice catalog (voice_catalog.py).
+
+edge-tts discovery is replaced by a fake TTS service that counts calls, and the clock
+by a settable value, so expiry can be stepped through without waiting or network access.
+
+Run with ``python -m pytest localizer/test_voice_catalog.py`` from the repository root.
+"""
+import json
+import os
+import sys
+
+import pytest
+
+# Add parent dir to path
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from localizer import tts_service, voice_catalog
+from localizer.voice_catalog import VoiceCatalog, get_voice_catalog
+
+
+class _FakeService:
+    def __init__(self):
+        self.calls = []
+        self.voices = [{"ShortName": "hi-IN-MadhurNeural", "Locale": "hi-IN", "Gender": "Male"}]
+        self.fail = False
+
+    def list_voices_sync(self, refresh=False):
+        self.calls.append(refresh)
+        if self.fail:
+            raise RuntimeError("offline")
+        return list(self.voices)
+
+
+@pytest.fixture
+def env(tmp_path, monkeypatch):
+    service = _FakeService()
+    clock = [1_000_000.0]
+    monkeypatch.setattr(tts_service, "edge_tts", object())
+    monkeypatch.setattr(tts_service, "get_tts_service", lambda: service)
+    monkeypatch.setattr(voice_catalog, "CATALOG_PATH", str(tmp_path / "edge_voices.json"))
+    monkeypatch.setattr(voice_catalog, "VOICE_CATALOG_TTL_HOURS", 1.0)
+    monkeypatch.setattr(voice_catalog, "_CATALOG", None)
+    monkeypatch.setattr(voice_catalog.time, "time", lambda: clock[0])
+    return service, clock
+
+
+def test_discovered_once_then_served_until_ttl(env):
+    service, clock = env
+    assert len(get_voice_catalog()) == 1
+    assert service.calls == [True]
+    with open(voice_catalog.CATALOG_PATH, encoding="utf-8") as f:
+        assert json.load(f)["fetched_at"] == clock[0]
+
+    clock[0] += 3599
+    get_voice_catalog()
+    assert service.calls == [True]
+
+
+def test_other_process_reads_the_persisted_copy(env, monkeypatch):
+    service, clock = env
+    get_voice_catalog()
+    monkeypatch.setattr(voice_catalog, "_CATALOG", None)  # as in a fresh worker
+    clock[0] += 60
+    assert get_voice_catalog().best("hi") == "hi-IN-MadhurNeural"
+    assert service.calls == [True]
+
+
+def test_expired_catalog_is_refetched_past_the_service_memo(env):
+    service, clock = env
+    get_voice_catalog()
+    service.voices.append({"ShortName": "hi-IN-SwaraNeural", "Locale": "hi-IN", "Gender": "Female"})
+
+    clock[0] += 3601
+    catalog = get_voice_catalog()
+    assert service.calls == [True, True]
+    assert catalog.best("hi", "female") == "hi-IN-SwaraNeural"
+    assert catalog.fetched_at == clock[0]
+
+
+def test_stale_copy_kept_when_discovery_fails(env):
+    service, clock = env
+    get_voice_catalog()
+    service.fail = True
+    clock[0] += 7200
+    assert len(get_voice_catalog()) == 1
+
+
+def test_best_prefers_neural_then_gender_then_exact_locale():
+    catalog = VoiceCatalog([
+        {"ShortName": "en-US-Plain", "Locale": "en-US", "Gender": "Female"},
+        {"ShortName": "en-US-GuyNeural", "Locale": "en-US", "Gender": "Male"},
+        {"ShortName": "en-IN-NeerjaNeural", "Locale": "en-IN", "Gender": "Female"},
+        {"ShortName": "en-GB-SoniaNeural", "Locale": "en-GB", "Gender": "Female"},
+    ])
+    assert catalog.best("en-IN", "female") == "en-IN-NeerjaNeural"
+    assert catalog.best("en-US", "male") == "en-US-GuyNeural"
+    assert catalog.best("en-GB", "female") == "en-GB-SoniaNeural"
+    assert catalog.best("en-GB", "male") == "en-US-GuyNeural"  # gender outranks locale
+    assert catalog.best("ta") is None
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
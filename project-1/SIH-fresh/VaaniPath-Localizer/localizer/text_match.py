@@ -0,0 +1,118 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+# Characters that count as part of a word for boundary checks: \w plus the whole Devanagari
+# block except the danda/double danda. \b alone fails on Indic text because vowel signs
+# (ा ि ी ...) and the virama are combining marks, not alphanumerics.
+WORD_CHARS = r"\wऀ-ॣ०-ॿ"
+_TOKEN_RE = re.compile(rf"[{WORD_CHARS}]+|\s+|[^{WORD_CHARS}\s]")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split into word runs, whitespace runs and single punctuation characters (lossless)."""
+    return _TOKEN_RE.findall(text)
+
+
+def _fold_token(token: str) -> str:
+    return " " if token.isspace() else token.lower()
+
+
+class AhoCorasickReplacer:
+    """Replace many literal phrases in one linear scan (Aho-Corasick automaton).
+
+    The automaton runs over tokens rather than characters, so a key can only match whole
+    words (``Go`` never matches inside ``Google``) and the Python-level loop does one step
+    per token. Matching is case-insensitive, any whitespace run matches a space in a key,
+    and overlaps resolve leftmost-longest. When two keys differ only in case, the later
+    one in *mapping* wins.
+    """
+
+    def __init__(self, mapping: Dict[str, str]):
+        # Trie as parallel lists: goto transitions, failure links, and the output at each
+        # state (key length in tokens, replacement)
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Optional[Tuple[int, str]]] = [None]
+        # For each state, the next state along the failure chain that has an output
+        self._dict_link: List[int] = [0]
+        self.size = 0
+
+        for key, value in mapping.items():
+            tokens = [_fold_token(t) for t in tokenize(key.strip())]
+            if not tokens:
+                continue
+            state = 0
+            for tok in tokens:
+                nxt = self._goto[state].get(tok)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append(None)
+                    self._dict_link.append(0)
+                    self._goto[state][tok] = nxt
+                state = nxt
+            if self._out[state] is None:
+                self.size += 1
+            self._out[state] = (len(tokens), value)
+        self._build_links()
+
+    def _build_links(self) -> None:
+        queue = list(self._goto[0].values())
+        i = 0
+        while i < len(queue):
+            state = queue[i]
+            i += 1
+            for tok, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and tok not in self._goto[f]:
+                    f = self._fail[f]
+                fl = self._goto[f].get(tok, 0) if state else 0
+                self._fail[nxt] = fl
+                self._dict_link[nxt] = fl if self._out[fl] is not None else self._dict_link[fl]
+
+    def replace(self, text: str) -> str:
+        if not text or not self.size:
+            return text
+        tokens = tokenize(text)
+        folded = tokenize(text.lower())
+        if len(folded) != len(tokens):  # lower() changed the tokenization (rare)
+            folded = [t.lower() for t in tokens]
+        goto, fail, out, dict_link = self._goto, self._fail, self._out, self._dict_link
+        root = goto[0]
+
+        # start token index -> (end token index, replacement) of the longest match there
+        best: Dict[int, Tuple[int, str]] = {}
+        state = 0
+        for i, tok in enumerate(folded):
+            if state == 0:
+                if tok not in root:
+                    continue
+            elif tok.isspace():
+                tok = " "
+            while state and tok not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(tok, 0)
+            s = state if out[state] is not None else dict_link[state]
+            while s:
+                length, value = out[s]
+                start = i + 1 - length
+                prev = best.get(start)
+                if prev is None or prev[0] < i + 1:
+                    best[start] = (i + 1, value)
+                s = dict_link[s]
+        if not best:
+            return text
+
+        parts = []
+        pos = 0
+        for start in sorted(best):
+            if start < pos:
+                continue  # overlaps a match already taken further left
+            end, value = best[start]
+            parts.extend(tokens[pos:start])
+            parts.append(value)
+            pos = end
+        parts.extend(tokens[pos:])
+        return "".join(parts)
@@ -0,0 +1,170 @@
+import os
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .audio_utils import _build_atempo_chain, load_audio, write_pcm16_wav
+from .config import (
+    TIMELINE_MEMMAP_MB,
+    TIMELINE_SAMPLE_RATE,
+    TSM_ENGINE,
+    TSM_QUALITY,
+    TTS_MAX_TEMPO,
+    TTS_MIN_TEMPO,
+)
+from .tsm import wsola
+from .utils import setup_logger, FFMPEG
+
+logger = setup_logger("timeline")
+
+# Clips within this fraction of their window are placed as is
+_TEMPO_TOLERANCE = 0.02
+
+
+def fit_tempo(clip_seconds: float, window_seconds: float) -> float:
+    """Speed-up for a clip of *clip_seconds* to fit *window_seconds*, clamped to
+    [TTS_MIN_TEMPO, TTS_MAX_TEMPO] so no clip is distorted beyond what sounds natural."""
+    if clip_seconds <= 0 or window_seconds <= 0:
+        return 1.0
+    ratio = clip_seconds / window_seconds
+    if abs(ratio - 1.0) <= _TEMPO_TOLERANCE:
+        return 1.0
+    return min(TTS_MAX_TEMPO, max(TTS_MIN_TEMPO, ratio))
+
+
+def load_fitted(path: str, window_seconds: float, sample_rate: int = TIMELINE_SAMPLE_RATE) -> np.ndarray:
+    """Load a clip and apply its own tempo so it fits *window_seconds* as far as the clamp allows.
+
+    WAV clips (e.g. rendered chunks) are read without an ffmpeg spawn, see :func:`load_audio`.
+    """
+    samples = load_audio(path, sample_rate)
+    tempo = fit_tempo(len(samples) / sample_rate, window_seconds)
+    if tempo == 1.0:
+        return samples
+    if TSM_ENGINE == "wsola":
+        return wsola(samples, tempo, sample_rate, TSM_QUALITY)
+    return decode_audio_atempo(path, sample_rate, tempo)
+
+
+def decode_audio_atempo(path: str, sample_rate: int, tempo: float) -> np.ndarray:
+    """Decode with ffmpeg's atempo filter applied (TSM_ENGINE=ffmpeg)."""
+    cmd = [
+        FFMPEG, "-v", "error", "-i", path, "-filter:a", _build_atempo_chain(tempo),
+        "-ac", "1", "-ar", str(sample_rate), "-f", "f32le", "-",
+    ]
+    out = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True).stdout
+    return np.frombuffer(out, dtype=np.float32)
+
+
+class Timeline:
+    """A mono float32 PCM buffer that clips are mixed onto at absolute timestamps.
+
+    Buffers above TIMELINE_MEMMAP_MB are memory-mapped from *spill_path*, so an hour of
+    24 kHz audio does not have to stay resident.
+    """
+
+    def __init__(self, duration: float, sample_rate: int = TIMELINE_SAMPLE_RATE, spill_path: Optional[str] = None):
+        self.sample_rate = sample_rate
+        n = max(1, int(round(duration * sample_rate)))
+        self.spill_path = None
+        if spill_path and n * 4 > TIMELINE_MEMMAP_MB * 1024 * 1024:
+            self.spill_path = spill_path
+            self.buf = np.memmap(spill_path, dtype=np.float32, mode="w+", shape=(n,))
+        else:
+            self.buf = np.zeros(n, dtype=np.float32)
+
+    @property
+    def duration(self) -> float:
+        return len(self.buf) / self.sample_rate
+
+    def place(self, samples: np.ndarray, start: float) -> int:
+        """Mix *samples* in at *start* seconds; returns how many samples fell past the end."""
+        s0 = max(0, int(round(start * self.sample_rate)))
+        s1 = min(len(self.buf), s0 + len(samples))
+        if s1 > s0:
+            self.buf[s0:s1] += samples[: s1 - s0]
+        return len(samples) - max(0, s1 - s0)
+
+    def write_wav(self, path: str) -> str:
+        """Write the mix as 16-bit PCM WAV."""
+        return write_pcm16_wav(path, self.buf, self.sample_rate)
+
+    def close(self) -> None:
+        if self.spill_path:
+            del self.buf
+            try:
+                os.remove(self.spill_path)
+            except OSError:
+                pass
+            self.spill_path = None
+
+
+def _windows(spans: List[Tuple[float, float]], end: float) -> List[float]:
+    """Room for each span's clip: until the next span starts (or *end*), at least its own length."""
+    out = []
+    for i, (s, e) in enumerate(spans):
+        nxt = spans[i + 1][0] if i + 1 < len(spans) else end
+        out.append(max(e - s, nxt - s))
+    return out
+
+
+def _mix(timeline: Timeline, placements: List[Tuple[str, float, float]], workers: int) -> int:
+    """Decode/fit (path, start, window) clips in parallel and mix them in; returns overflow samples.
+
+    Clips are decoded a few batches at a time, so only a bounded number are held in memory.
+    """
+    workers = max(1, workers)
+    overflow = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        for b in range(0, len(placements), workers * 4):
+            batch = placements[b:b + workers * 4]
+            clips = pool.map(lambda p: load_fitted(p[0], p[2], timeline.sample_rate), batch)
+            for samples, (_, start, _) in zip(clips, batch):
+                overflow += timeline.place(samples, start)
+    return overflow
+
+
+def render_chunk(segments: List[Dict[str, Any]], duration: float, output_path: str, workers: int = 4) -> str:
+    """Mix a chunk's per-segment clips (``seg["audio_path"]``) at their Whisper timestamps.
+
+    Segment times are relative to the chunk. Each clip gets its own tempo fit to the gap
+    before the next segment instead of one ratio for the whole chunk. Speech that still
+    runs past the chunk end is kept (the WAV is longer); render_timeline fits it later.
+    """
+    voiced = sorted((s for s in segments if s.get("audio_path")), key=lambda s: float(s["start"]))
+    spans = [(float(s["start"]), float(s["end"])) for s in voiced]
+    windows = _windows(spans, duration)
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        clips = list(pool.map(lambda p: load_fitted(p[0]["audio_path"], p[1]), zip(voiced, windows)))
+    end = max([duration] + [s + len(c) / TIMELINE_SAMPLE_RATE for (s, _), c in zip(spans, clips)])
+    timeline = Timeline(end)
+    for (start, _), samples in zip(spans, clips):
+        timeline.place(samples, start)
+    return timeline.write_wav(output_path)
+
+
+def render_timeline(chunks: List[Dict[str, Any]], duration: float, output_path: str, workers: int = 4) -> str:
+    """Place every chunk's clip (``audio_path``) at its source start on one job-length timeline.
+
+    Clips longer than their chunk window are sped up individually (clamped), so drift
+    never accumulates across chunks and one slow chunk does not distort the rest.
+    """
+    # Silent chunks add nothing to the mix, and their time becomes room for the chunk before
+    ordered = sorted(
+        (c for c in chunks if c.get("audio_path") and c.get("speech", True)),
+        key=lambda c: float(c["start"]),
+    )
+    spans = [(float(c["start"]), float(c["end"])) for c in ordered]
+    windows = _windows(spans, duration)
+    timeline = Timeline(duration, spill_path=output_path + ".pcm")
+    try:
+        overflow = _mix(timeline, [(c["audio_path"], span[0], w) for c, span, w in zip(ordered, spans, windows)], workers)
+        if overflow:
+            logger.warning(f"{overflow / timeline.sample_rate:.2f}s of speech ran past the end of the media")
+        timeline.write_wav(output_path)
+    finally:
+        timeline.close()
+    logger.info(f"Rendered {len(ordered)} clips onto a {duration:.2f}s timeline: {output_path}")
+    return output_path
@@ -1,13 +1,54 @@
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Tuple
 import re
 import os
 import json
+import threading
 import requests
 
-from .utils import setup_logger
+from .config import GEMINI_BATCH_SEGMENTS, TRANSLATION_BATCH_CHARS, TRANSLATION_MEMORY_ENABLED
+from .dialect import apply_dialect
+from .glossary import relevant_terms
+from .indictrans2 import get_engine as get_indictrans2_engine, supports as indictrans2_supports
+from .translation_memory import (
+    normalize_sentence,
+    record,
+    split_sentences,
+    tm_key,
+    tm_lookup,
+    tm_store,
+)
+from .translation_service import get_translation_service
+from .utils import content_version, setup_logger
 
 logger = setup_logger("translation")
 
+# Per-provider prompt size counters (this process), see prompt_stats()
+_PROMPT_STATS: Dict[str, Dict[str, int]] = {}
+_PROMPT_STATS_LOCK = threading.Lock()
+
+
+def _record_prompt(provider: str, prompt_chars: int, terms_used: int, glossary: Optional[Dict[str, str]]) -> None:
+    terms_total = len(glossary or {})
+    logger.info(f"{provider} prompt: {prompt_chars} chars, {terms_used}/{terms_total} glossary terms")
+    with _PROMPT_STATS_LOCK:
+        st = _PROMPT_STATS.setdefault(provider, {"requests": 0, "prompt_chars": 0, "glossary_terms": 0})
+        st["requests"] += 1
+        st["prompt_chars"] += prompt_chars
+        st["glossary_terms"] += terms_used
+
+
+def prompt_stats() -> Dict[str, Dict[str, float]]:
+    """Per-provider request count, total/average prompt size and glossary terms sent."""
+    with _PROMPT_STATS_LOCK:
+        return {
+            provider: {
+                **st,
+                "avg_prompt_chars": round(st["prompt_chars"] / st["requests"], 1),
+                "avg_glossary_terms": round(st["glossary_terms"] / st["requests"], 2),
+            }
+            for provider, st in _PROMPT_STATS.items()
+        }
+
 
 def _translate_google(text: str, target_lang: str, style_guide: Optional[str] = None, glossary: Optional[Dict[str, str]] = None) -> str:
     """Translate using Google Translate with automatic Gemini fallback for unsupported languages."""
@@ -44,12 +85,10 @@ def _translate_google(text: str, target_lang: str, style_guide: Optional[str] =
     lang_to_use = FALLBACK_MAP.get(base_lang, base_lang)
     
     try:
-        translator = GoogleTranslator(source='auto', target=lang_to_use)
-        out = translator.translate(text)
+        out = get_translation_service().google_sync(text, lang_to_use)
         
-        # Apply dialectal approximation for Bhojpuri
-        if base_lang == "bho":
-            out = _approx_bhojpuri(out)
+        # Apply dialectal approximation (e.g. Bhojpuri) where a rules file exists
+        out = apply_dialect(out, base_lang)
         return out
     except Exception as e:
         logger.warning(f"Google translate error for {target_lang}: {e}; trying Gemini fallback")
@@ -59,9 +98,28 @@ def _translate_google(text: str, target_lang: str, style_guide: Optional[str] =
 
 
 
-def _translate_indictrans2(text: str, target_lang: str) -> str:
-    # Stub: Implement real model integration later
-    return f"{text}"
+def _translate_indictrans2(text: str, target_lang: str, source_lang: str = "en") -> str:
+    """Translate locally with IndicTrans2 (CTranslate2), keeping the text's line structure.
+
+    All sentences of all lines go to the engine as one length-sorted batch. Falls back to
+    Google if the engine is not available or does not cover *source_lang* -> *target_lang*
+    (the en-indic model only translates English into Indic languages).
+    """
+    if not indictrans2_supports(source_lang, target_lang):
+        logger.info(f"IndicTrans2 does not cover {source_lang}->{target_lang}; using Google")
+        return _translate_google(text, target_lang)
+    engine = get_indictrans2_engine()
+    if engine is None:
+        return _translate_google(text, target_lang)
+
+    lines = [split_sentences(line) for line in text.split("\n")]
+    flat = [s for line in lines for s in line]
+    try:
+        translated = iter(engine.translate_batch(flat, target_lang, source_lang=source_lang))
+    except Exception as e:
+        logger.warning(f"IndicTrans2 error for {target_lang}: {e}; falling back to Google")
+        return _translate_google(text, target_lang)
+    return "\n".join(" ".join(next(translated) for _ in line) for line in lines)
 
 
 def _apply_style_guide(text: str, style_guide: Optional[str]) -> str:
@@ -74,30 +132,223 @@ def _apply_style_guide(text: str, style_guide: Optional[str]) -> str:
     return text
 
 
+def _translate_provider(
+    text: str,
+    target_lang: str,
+    model: str,
+    style_guide: Optional[str],
+    glossary: Optional[Dict[str, str]],
+    source_lang: str = "en",
+) -> str:
+    if model == "google":
+        return _translate_google(text, target_lang, style_guide, glossary)
+    if model == "indictrans2":
+        return _translate_indictrans2(text, target_lang, source_lang)
+    # if model == "llm":
+    #     return _translate_llm(text, target_lang, style_guide, glossary)
+    if model == "gemini":
+        return _translate_gemini(text, target_lang, style_guide, glossary)
+    return f"[{target_lang}] {text}"
+
+
+def _is_placeholder(translated: str, target_lang: str) -> bool:
+    """Providers signal failure by echoing the source behind a "[<lang>...]" tag."""
+    return translated.startswith(f"[{target_lang}")
+
+
+def _translate_with_memory(
+    text: str,
+    target_lang: str,
+    model: str,
+    style_guide: Optional[str],
+    glossary: Optional[Dict[str, str]],
+    stats: Optional[Dict[str, int]],
+    source_lang: str = "en",
+) -> str:
+    """Sentence-level translation memory in front of the provider.
+
+    Cached sentences are reused; the misses go out in provider-sized batches (JSON arrays
+    for Gemini, marker-delimited text for Google, see :func:`_translate_batch_once`). If a
+    batch cannot be split back, the whole text is translated in one call and nothing from
+    that batch is stored, instead of re-sending every sentence on its own. The text's line
+    structure is kept.
+    """
+    lines = [split_sentences(line) for line in text.split("\n")]
+    sentences = [s for line in lines for s in line]
+    if not sentences:
+        return _translate_provider(text, target_lang, model, style_guide, glossary, source_lang)
+
+    glossary_version = content_version(glossary)
+    keys = [tm_key(s, target_lang, model, glossary_version, style_guide) for s in sentences]
+    out = tm_lookup(keys)
+    missing = [i for i, t in enumerate(out) if t is None]
+    record(stats, len(sentences) - len(missing), len(missing))
+
+    for batch in _pack_batches([sentences[i] for i in missing], *_batch_limits(model)):
+        idx = [missing[b] for b in batch]
+        translated = _translate_batch_once(
+            [sentences[i] for i in idx], target_lang, model, style_guide, glossary, source_lang
+        )
+        if translated is None:
+            logger.info(f"TM: batch of {len(idx)} sentences could not be split back; translating the text in one call")
+            return _translate_provider(text, target_lang, model, style_guide, glossary, source_lang)
+        for i, t in zip(idx, translated):
+            out[i] = t
+            if t and not _is_placeholder(t, target_lang):
+                tm_store(keys[i], t)
+
+    merged = iter(out)
+    return "\n".join(" ".join(next(merged) for _ in line) for line in lines)
+
+
 def translate_text(
     text: str,
     target_lang: str,
     model: str = "google",
     style_guide: Optional[str] = None,
     glossary: Optional[Dict[str, str]] = None,
+    stats: Optional[Dict[str, int]] = None,
+    source_lang: str = "en",
 ) -> str:
+    """Translate *text* from *source_lang*, reusing the translation memory for sentences seen before.
+
+    If *stats* is given, its ``tm_hits`` / ``tm_misses`` counters are incremented.
+    """
     model = (model or "google").lower()
-    if model == "google":
-        translated = _translate_google(text, target_lang, style_guide, glossary)
-    elif model == "indictrans2":
-        translated = _translate_indictrans2(text, target_lang)
-    # elif model == "llm":
-    #     translated = _translate_llm(text, target_lang, style_guide, glossary)
-    elif model == "gemini":
-        translated = _translate_gemini(text, target_lang, style_guide, glossary)
+    if TRANSLATION_MEMORY_ENABLED and model in ("google", "gemini", "indictrans2"):
+        translated = _translate_with_memory(text, target_lang, model, style_guide, glossary, stats, source_lang)
     else:
-        translated = f"[{target_lang}] {text}"
+        translated = _translate_provider(text, target_lang, model, style_guide, glossary, source_lang)
 
     translated = _apply_style_guide(translated, style_guide)
     return translated
 
 
 
+# Google keeps these markers intact, so one request can carry many segments
+_SEGMENT_MARKER = "§{}§"
+_SEGMENT_MARKER_RE = re.compile(r"§\s*(\d+)\s*§")
+
+
+def _pack_batches(texts: List[str], max_chars: int, max_items: int) -> List[List[int]]:
+    """Group segment indices into consecutive batches within the size limits."""
+    batches: List[List[int]] = []
+    current: List[int] = []
+    size = 0
+    for i, text in enumerate(texts):
+        cost = len(text) + 8  # marker + newline
+        if current and (size + cost > max_chars or len(current) >= max_items):
+            batches.append(current)
+            current, size = [], 0
+        current.append(i)
+        size += cost
+    if current:
+        batches.append(current)
+    return batches
+
+
+def _unpack_markers(translated: str, count: int) -> Optional[List[str]]:
+    """Split a marker-delimited translation back into *count* segments (None if mangled)."""
+    matches = list(_SEGMENT_MARKER_RE.finditer(translated))
+    if [int(m.group(1)) for m in matches] != list(range(count)):
+        return None
+    parts = []
+    for n, m in enumerate(matches):
+        end = matches[n + 1].start() if n + 1 < len(matches) else len(translated)
+        parts.append(translated[m.end():end].strip())
+    return parts
+
+
+def _batch_limits(model: str) -> Tuple[int, int]:
+    """(max chars, max items) per batch: Gemini batches by segment count, the rest by size."""
+    if model == "gemini":
+        return 1 << 30, GEMINI_BATCH_SEGMENTS
+    return TRANSLATION_BATCH_CHARS, 1 << 30
+
+
+def _translate_batch_once(
+    texts: List[str],
+    target_lang: str,
+    model: str,
+    style_guide: Optional[str],
+    glossary: Optional[Dict[str, str]],
+    source_lang: str = "en",
+) -> Optional[List[str]]:
+    """One provider round trip for a batch; None if the reply cannot be split back."""
+    if len(texts) == 1:
+        return [_translate_provider(texts[0], target_lang, model, style_guide, glossary, source_lang).strip()]
+    if model == "gemini":
+        return _translate_gemini_batch(texts, target_lang, style_guide, glossary)
+    if model == "google":
+        packed = "\n".join(f"{_SEGMENT_MARKER.format(i)} {t}" for i, t in enumerate(texts))
+        translated = _translate_google(packed, target_lang, style_guide, glossary)
+        if not _is_placeholder(translated, target_lang):
+            return _unpack_markers(translated, len(texts))
+    elif model == "indictrans2":
+        lines = _translate_indictrans2("\n".join(texts), target_lang, source_lang).split("\n")
+        if len(lines) == len(texts):
+            return [l.strip() for l in lines]
+    return None
+
+
+def _translate_batch(
+    texts: List[str],
+    target_lang: str,
+    model: str,
+    style_guide: Optional[str],
+    glossary: Optional[Dict[str, str]],
+    source_lang: str = "en",
+) -> List[str]:
+    """One provider round trip for a batch, falling back to per-segment calls."""
+    out = _translate_batch_once(texts, target_lang, model, style_guide, glossary, source_lang)
+    if out is not None:
+        return out
+    logger.info(f"Batch of {len(texts)} segments could not be split back; translating individually")
+    return [_translate_provider(t, target_lang, model, style_guide, glossary, source_lang).strip() for t in texts]
+
+
+def translate_segments(
+    texts: List[str],
+    target_lang: str,
+    model: str = "google",
+    style_guide: Optional[str] = None,
+    glossary: Optional[Dict[str, str]] = None,
+    stats: Optional[Dict[str, int]] = None,
+    source_lang: str = "en",
+) -> List[str]:
+    """Translate many short segments (e.g. Whisper segments) with as few requests as possible.
+
+    Segments found in the translation memory are reused; the rest are packed into
+    provider-sized batches (marker-delimited text for Google, JSON arrays for Gemini) and
+    split back. Returns one translation per input segment, in order.
+    """
+    model = (model or "google").lower()
+    texts = [normalize_sentence(t) for t in texts]
+    out: List[Optional[str]] = [t if not t else None for t in texts]
+    todo = [i for i, t in enumerate(texts) if t]
+
+    use_tm = TRANSLATION_MEMORY_ENABLED and model in ("google", "gemini", "indictrans2")
+    keys: Dict[int, str] = {}
+    if use_tm and todo:
+        glossary_version = content_version(glossary)
+        keys = {i: tm_key(texts[i], target_lang, model, glossary_version, style_guide) for i in todo}
+        for i, cached in zip(todo, tm_lookup([keys[i] for i in todo])):
+            out[i] = cached
+        missing = [i for i in todo if out[i] is None]
+        record(stats, len(todo) - len(missing), len(missing))
+        todo = missing
+
+    for batch in _pack_batches([texts[i] for i in todo], *_batch_limits(model)):
+        idx = [todo[b] for b in batch]
+        for i, translated in zip(idx, _translate_batch([texts[i] for i in idx], target_lang, model, style_guide, glossary, source_lang)):
+            out[i] = translated
+            if use_tm and translated and not _is_placeholder(translated, target_lang):
+                tm_store(keys[i], translated)
+
+    return [_apply_style_guide(t or "", style_guide) for t in out]
+
+
+
 def _translate_llm(
     text: str,
     target_lang: str,
@@ -121,12 +372,12 @@ def _translate_llm(
 
     base_lang = (target_lang or "").split("-")[0]
     guide = (style_guide or "").strip()
-    def _format_glossary_constraints(glossary: Optional[Dict[str, str]]) -> str:
-        if not glossary:
+    # Only the glossary terms that actually occur in the text
+    terms = relevant_terms(glossary, text)
+    def _format_glossary_constraints(terms: Dict[str, str]) -> str:
+        if not terms:
             return ""
-        # Limit terms to avoid excessively long prompts
-        items = list(glossary.items())[:50]
-        pairs = "\n".join([f"- {src} -> {tgt}" for src, tgt in items])
+        pairs = "\n".join([f"- {src} -> {tgt}" for src, tgt in terms.items()])
         return (
             "Terminology constraints (honor strictly; prefer these canonical translations):\n"
             f"{pairs}\n"
@@ -143,7 +394,7 @@ def _translate_llm(
         system_prompt += " Use a formal, instructional Sanskrit register."
     if guide:
         system_prompt += f" Style guide: {guide}."
-    gc = _format_glossary_constraints(glossary)
+    gc = _format_glossary_constraints(terms)
     if gc:
         system_prompt += " " + gc
 
@@ -157,6 +408,7 @@ def _translate_llm(
     }
     if model_name:
         payload["model"] = model_name
+    _record_prompt("llm", len(system_prompt) + len(payload["messages"][1]["content"]), len(terms), glossary)
 
     headers = {
         "Authorization": f"Bearer {api_key}",
@@ -186,6 +438,53 @@ def _translate_llm(
         return _translate_google(text, target_lang)
 
 
+# Map codes to full language names for better Gemini accuracy
+GEMINI_LANG_NAMES = {
+    "brx": "Bodo",
+    "doi": "Dogri",
+    "ks": "Kashmiri",
+    "gom": "Konkani",
+    "kok": "Konkani",
+    "mai": "Maithili",
+    "mni": "Manipuri (Meitei)",
+    "sat": "Santali",
+    "mwr": "Marwari",
+    "bho": "Bhojpuri",
+    "as": "Assamese",
+    "ne": "Nepali",
+    "sa": "Sanskrit",
+    "sd": "Sindhi",
+    "ur": "Urdu",
+    "bgc": "Haryanvi",
+}
+
+
+def _gemini_instructions(
+    target_lang: str,
+    style_guide: Optional[str],
+    glossary: Optional[Dict[str, str]],
+    text: str,
+) -> Tuple[List[str], int]:
+    """Prompt instructions for *text*, and how many glossary terms they include."""
+    base_lang = (target_lang or "").split("-")[0]
+    lang_name = GEMINI_LANG_NAMES.get(base_lang, base_lang)
+
+    # Prompt: ask for direct translation, no extra commentary.
+    instructions = [
+        f"Translate the following content into the target language '{lang_name}' (code: {base_lang}).",
+    ]
+    if style_guide:
+        instructions.append(f"Style guide: {style_guide}")
+    # Add terminology constraints for the glossary terms present in the text
+    terms = relevant_terms(glossary, text)
+    if terms:
+        pairs = "\n".join([f"- {src} -> {tgt}" for src, tgt in terms.items()])
+        instructions.append(
+            "Terminology constraints (use these canonical translations when applicable):\n" + pairs
+        )
+    return instructions, len(terms)
+
+
 def _translate_gemini(
     text: str,
     target_lang: str,
@@ -205,53 +504,17 @@ def _translate_gemini(
 
     try:
         # Import here to keep dependency optional
-        from google import genai
         from google.genai import types
     except Exception as e:
         logger.error(f"google-genai SDK import failed ({e}); cannot translate. Install: pip install google-genai")
         return f"[{target_lang} - Gemini SDK required] {text}"
 
     try:
-        client = genai.Client(api_key=api_key)
         model = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
 
-        # Map codes to full language names for better Gemini accuracy
-        LANG_NAMES = {
-            "brx": "Bodo",
-            "doi": "Dogri",
-            "ks": "Kashmiri",
-            "gom": "Konkani",
-            "kok": "Konkani",
-            "mai": "Maithili",
-            "mni": "Manipuri (Meitei)",
-            "sat": "Santali",
-            "mwr": "Marwari",
-            "bho": "Bhojpuri",
-            "as": "Assamese",
-            "ne": "Nepali",
-            "sa": "Sanskrit",
-            "sd": "Sindhi",
-            "ur": "Urdu",
-            "bgc": "Haryanvi",
-        }
-        
-        base_lang = (target_lang or "").split("-")[0]
-        lang_name = LANG_NAMES.get(base_lang, base_lang)
-        
-        # Prompt: ask for direct translation, no extra commentary.
-        instructions = [
-            f"Translate the following content into the target language '{lang_name}' (code: {base_lang}).",
-            "Return only the translated text without quotes or explanation.",
-        ]
-        if style_guide:
-            instructions.append(f"Style guide: {style_guide}")
-        # Add terminology constraints if provided
-        if glossary:
-            items = list(glossary.items())[:50]
-            pairs = "\n".join([f"- {src} -> {tgt}" for src, tgt in items])
-            instructions.append(
-                "Terminology constraints (use these canonical translations when applicable):\n" + pairs
-            )
+        instructions, n_terms = _gemini_instructions(target_lang, style_guide, glossary, text)
+        instructions.insert(1, "Return only the translated text without quotes or explanation.")
+        _record_prompt("gemini", sum(len(i) + 1 for i in instructions) + len(text), n_terms, glossary)
 
         contents = [
             types.Content(
@@ -264,11 +527,7 @@ def _translate_gemini(
         ]
 
         # Use non-streaming for simplicity and determinism.
-        resp = client.models.generate_content(
-            model=model,
-            contents=contents,
-            config=types.GenerateContentConfig(),
-        )
+        resp = get_translation_service().gemini_sync(api_key, model, contents, types.GenerateContentConfig())
 
         # The SDK returns a rich object; `.text` provides concatenated string.
         translated = getattr(resp, "text", None)
@@ -283,160 +542,56 @@ def _translate_gemini(
 
 
 
-def _approx_bhojpuri(text: str) -> str:
-    """Approximate Bhojpuri dialect from Hindi using lightweight rules.
-    This is not a full linguistic conversion, but it nudges common copulas,
-    pronouns, auxiliaries, and conjunctions toward Bhojpuri usage.
+def _translate_gemini_batch(
+    texts: List[str],
+    target_lang: str,
+    style_guide: Optional[str],
+    glossary: Optional[Dict[str, str]] = None,
+) -> Optional[List[str]]:
+    """Translate a list of segments in one Gemini call using a JSON array in and out.
+
+    Returns None if Gemini is unavailable or the reply is not an array of the same length.
     """
-    rules = [
-        # --- Fixed expressions and punctuation-adjacent copulas ---
-        (r"ठीक है", "ठीक बा"),
-        (r"यह है", "ई बा"),
-        (r"ये हैं", "ई लोग बाड़े"),
-        (r"वह है", "उ बा"),
-        (r"वे हैं", "ऊ लोग बाड़े"),
-        (r"Python क्या है", "पायथन का बा"),
-        (r"तो क्या है", "तऽ का बा"),
-        (r"है([\.,!?])", r"बा\1"),
-        (r"हैं([\.,!?])", r"बाड़े\1"),
-        # --- Copula / auxiliaries / aspect ---
-        (r"\bहै\b", "बा"),
-        (r"\bहैं\b", "बाड़े"),
-        (r"\bथा\b", "रहल"),
-        (r"\bथे\b", "रहल"),
-        (r"\bथी\b", "रहल"),
-        (r"\bरहा है\b", "करत बा"),
-        (r"\bरहे हैं\b", "करत बाड़े"),
-        (r"\bरही है\b", "करत बा"),
-        (r"\bरही हैं\b", "करत बाड़े"),
-        (r"\bहोता है\b", "होला"),
-        (r"\bहोते हैं\b", "होले"),
-        (r"\bहोगा\b", "होई"),
-        (r"\bहोंगे\b", "होइहें"),
-        (r"\bकिया जा रहा है\b", "कइल जा रहल बा"),
-        (r"\bकिया गया\b", "कइल गइल"),
-        (r"\bकिया\b", "कइल"),
-        (r"\bकर चुका है\b", "कर चुकल बा"),
-        (r"\bकर चुके हैं\b", "कर चुकल बा"),
-        (r"\bकर रही है\b", "करत बा"),
-        (r"\bकर रहा है\b", "करत बा"),
-
-        # --- Pronouns and possessives ---
-        (r"\bमैं\b", "हम"),
-        (r"\bमुझे\b", "हमके"),
-        (r"\bमुझे\b", "हमके"),
-        (r"\bमेरा\b", "हमार"),
-        (r"\bमेरी\b", "हमार"),
-        (r"\bमेरे\b", "हमार"),
-        (r"\bतुम\b", "तू"),
-        (r"\bतुम्हें\b", "तोहके"),
-        (r"\bतुम्हारा\b", "तोहार"),
-        (r"\bतुम्हारी\b", "तोहार"),
-        (r"\bआप\b", "रउआ"),
-        (r"\bआपको\b", "रउआ के"),
-        (r"\bआपका\b", "रउआ के"),
-        (r"\bआपकी\b", "रउआ के"),
-        (r"\bवह\b", "उह"),
-        (r"\bवो\b", "उह"),
-        (r"\bवे\b", "ऊ लोग"),
-        (r"\bये\b", "ई"),
-        (r"\bयह\b", "ई"),
-
-        # --- Question words / particles ---
-        (r"\bक्या\b", "का"),
-        (r"\bक्यों\b", "काहे"),
-        (r"\bकैसे\b", "कइसन"),
-        (r"\bकब\b", "कबहुँ"),
-        (r"\bकहाँ\b", "कहँवा"),
-        (r"\bकिस\b", "कवन"),
-        (r"\bकिसे\b", "कवनो/काके"),  # rough
-        (r"\bका है\b", "का बा"),
-        (r"\bक्या हुआ\b", "का भइल"),
-
-        # --- Negation ---
-        (r"\bनहीं\b", "ना"),
-        (r"\bमत\b", "ना"),
-        (r"\bनही\b", "ना"),  # common misspelling
-        (r"\bकभी नहीं\b", "कबहुँ ना"),
-        (r"\bनहीं होगा\b", "ना होई"),
-        (r"\bनहीं हैं\b", "ना बाड़े"),
-
-        # --- Conjunctions / discourse ---
-        (r"\bऔर\b", "आउर"),
-        (r"\bलेकिन\b", "बाकिर"),
-        (r"\bतब\b", "तब"),
-        (r"\bयदि\b", "अगर"),
-        (r"\bक्योंकि\b", "काहे कि"),
-        (r"\bइसलिए\b", "एही से"),
-        (r"\bभी\b", "भि"),
-        (r"\bही\b", "एह"),
-
-        # --- Modal / ability / permission ---
-        (r"\bसकता है\b", "सकेला"),
-        (r"\bसकती है\b", "सकेले"),
-        (r"\bसकते हैं\b", "सकेला"),
-        (r"\bकर सकता है\b", "कर सकेला"),
-        (r"\bकर सकती है\b", "कर सकेले"),
-        (r"\bकर सकते हैं\b", "कर सकेला"),
-        (r"\bचाहता है\b", "चाहेला"),
-        (r"\bचाहती है\b", "चाहेला"),
-        (r"\bपाना\b", "पावे"),
-
-        # --- Infinitives / verbal nouns ---
-        (r"\bकरना\b", "करे के"),
-        (r"\bखाना\b", "खाये के"),
-        (r"\bपीना\b", "पीये के"),
-        (r"\bदेखना\b", "देखे के"),
-        (r"\bलेना\b", "लेवे के"),
-        (r"\bदेना\b", "देवे के"),
-        (r"\bबनाना\b", "बनावे के"),
-        (r"\bपढ़ना\b", "पढ़े के"),
-        (r"\bलिखना\b", "लिखे के"),
-
-        # --- Common verbs / domain words ---
-        (r"\bजाना\b", "जाए के"),
-        (r"\bआना\b", "आवे के"),
-        (r"\bबैठना\b", "बैठे के"),
-        (r"\bखोलना\b", "खोले के"),
-        (r"\bबंद करना\b", "बंद करे के"),
-        (r"\bशुरू करना\b", "शुरू करे के"),
-        (r"\bसमाप्त करना\b", "खत्म करे के"),
-        (r"\bप्रयोग\b", "उपयोग"),
-        (r"\bकनेक्ट\b", "जुड़"),
-        (r"\bकनेक्शन\b", "जुड़ाव"),
-        (r"\bडाटाबेस\b", "डेटाबेस"),
-        (r"\bवर्कफ़्लो\b", "वर्कफ्लो"),  # keep loanword
-
-        # --- Politeness / honorifics ---
-        (r"\bजी\b", "जी"),  # keep 'जी' as-is but ensure spacing
-        (r"\bसाहब\b", "साहेब"),
-        (r"\bश्री\b", "श्री"),  # unchanged
-
-        # --- Numbers / quantifiers ---
-        (r"\bएक\b", "एक"),
-        (r"\bदो\b", "दू"),
-        (r"\bतीन\b", "तीन"),
-        (r"\bकई\b", "कई"),
-        (r"\bसब\b", "सब"), 
-        (r"\bकाफी\b", "काफ़ी"),
-
-        # --- Emphasis / intensifiers ---
-        (r"\bबहुत\b", "बहुते"),
-        (r"\bथोड़ा\b", "थोड़"),
-        (r"\bबिलकुल\b", "पूरी तरह"),
-        (r"\bअभी\b", "अभी/एगो"),
-        (r"\bफिर\b", "फिर"),
-        (r"\bअब\b", "अब"),
-
-        # --- Time phrases / temporals ---
-        (r"\bकल\b", "काल/भोरे"),  # ambiguous; keep simple
-        (r"\bआज\b", "आज"),
-        (r"\bसुबह\b", "सबेरे"),
-        (r"\bशाम\b", "सांझ"),
-
-        # --- Punctuation / spacing cleanups applied after substitutions ---
-    ]
-    out = text
-    for pattern, repl in rules:
-        out = re.sub(pattern, repl, out)
-    return out
+    api_key = os.getenv("GEMINI_API_KEY")
+    if not api_key:
+        logger.error(f"GEMINI_API_KEY not set; cannot translate {target_lang}. Please set GEMINI_API_KEY environment variable.")
+        return None
+
+    try:
+        from google.genai import types
+    except Exception as e:
+        logger.error(f"google-genai SDK import failed ({e}); cannot translate. Install: pip install google-genai")
+        return None
+
+    try:
+        model = os.getenv("GEMINI_MODEL", "gemini-2.5-flash")
+
+        payload = json.dumps(texts, ensure_ascii=False)
+        instructions, n_terms = _gemini_instructions(target_lang, style_guide, glossary, "\n".join(texts))
+        instructions.insert(
+            1,
+            f"The input is a JSON array of {len(texts)} strings. Translate each string independently and "
+            f"return only a JSON array of exactly {len(texts)} translated strings, in the same order.",
+        )
+        _record_prompt("gemini_batch", sum(len(i) + 1 for i in instructions) + len(payload), n_terms, glossary)
+        contents = [
+            types.Content(
+                role="user",
+                parts=[
+                    types.Part.from_text(text="\n".join(instructions)),
+                    types.Part.from_text(text=payload),
+                ],
+            ),
+        ]
+        resp = get_translation_service().gemini_sync(
+            api_key, model, contents, types.GenerateContentConfig(response_mime_type="application/json")
+        )
+        out = json.loads(getattr(resp, "text", None) or "null")
+    except Exception as e:
+        logger.error(f"Gemini batch translation failed ({e})")
+        return None
+
+    if not isinstance(out, list) or len(out) != len(texts) or not all(isinstance(t, str) for t in out):
+        logger.warning(f"Gemini batch reply malformed for {len(texts)} segments")
+        return None
+    return [t.strip() for t in out]
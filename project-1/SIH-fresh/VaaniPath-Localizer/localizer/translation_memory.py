@@ -0,0 +1,61 @@
+import hashlib
+import os
+import re
+import unicodedata
+from typing import Dict, List, Optional
+
+from .config import CACHE_DIR, TRANSLATION_MEMORY_MAX_MB
+from .disk_cache import DiskCache
+from .utils import content_version
+
+# Sentence ends: Latin punctuation and the Devanagari danda, followed by whitespace
+_SENTENCE_END = re.compile(r"(?<=[.!?।॥])\s+")
+
+_TM: Optional[DiskCache] = None
+
+
+def get_translation_memory() -> DiskCache:
+    global _TM
+    if _TM is None:
+        _TM = DiskCache(os.path.join(CACHE_DIR, "translation_memory.sqlite"), TRANSLATION_MEMORY_MAX_MB * 1024 * 1024)
+    return _TM
+
+
+def normalize_sentence(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def split_sentences(text: str) -> List[str]:
+    return [s for s in (normalize_sentence(p) for p in _SENTENCE_END.split(text or "")) if s]
+
+
+def tm_key(
+    sentence: str,
+    target_lang: str,
+    model: str,
+    glossary_version: str,
+    style_guide: Optional[str],
+) -> str:
+    src_hash = hashlib.sha256(normalize_sentence(sentence).encode("utf-8")).hexdigest()
+    return "|".join([src_hash, target_lang, model, glossary_version, content_version(style_guide)])
+
+
+def tm_lookup(keys: List[str]) -> List[Optional[str]]:
+    tm = get_translation_memory()
+    out = []
+    for key in keys:
+        raw = tm.get(key)
+        out.append(raw.decode("utf-8") if raw is not None else None)
+    return out
+
+
+def tm_store(key: str, translation: str) -> None:
+    get_translation_memory().set(key, translation.encode("utf-8"))
+
+
+def record(stats: Optional[Dict[str, int]], hits: int, misses: int) -> None:
+    """Accumulate per-job TM counters into a caller-owned dict (if any)."""
+    if stats is None:
+        return
+    stats["tm_hits"] = stats.get("tm_hits", 0) + hits
+    stats["tm_misses"] = stats.get("tm_misses", 0) + misses
@@ -0,0 +1,107 @@
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Optional
+
+from .async_utils import TokenBucket, get_background_loop, retry_with_jitter
+from .config import (
+    GEMINI_CONCURRENCY,
+    GEMINI_RPS,
+    GOOGLE_TRANSLATE_CONCURRENCY,
+    GOOGLE_TRANSLATE_RPS,
+    TRANSLATION_RETRIES,
+)
+from .utils import setup_logger
+
+logger = setup_logger("translation_service")
+
+# deep_translator's GoogleTranslator mutates its request params on every call, so
+# instances are reused per (thread, target) rather than shared between threads
+_local = threading.local()
+
+
+def _google_translate_sync(text: str, target: str) -> str:
+    from deep_translator import GoogleTranslator
+
+    translators = getattr(_local, "translators", None)
+    if translators is None:
+        translators = _local.translators = {}
+    translator = translators.get(target)
+    if translator is None:
+        translator = translators[target] = GoogleTranslator(source="auto", target=target)
+    return translator.translate(text)
+
+
+class TranslationService:
+    """Provider calls multiplexed on one background event loop per process.
+
+    Clients are long-lived (one Gemini client per API key, one GoogleTranslator per
+    pool thread and language), every provider has its own concurrency semaphore and
+    token-bucket rate limit, and failed calls are retried with jittered backoff.
+    Coroutines are the primary API; ``*_sync`` facades block only the calling thread.
+    """
+
+    def __init__(self):
+        self._bg = get_background_loop("translation")
+        self._google_pool = ThreadPoolExecutor(
+            max_workers=GOOGLE_TRANSLATE_CONCURRENCY, thread_name_prefix="google-translate"
+        )
+        self._google_sem = asyncio.Semaphore(GOOGLE_TRANSLATE_CONCURRENCY)
+        self._google_bucket = TokenBucket(GOOGLE_TRANSLATE_RPS)
+        self._gemini_sem = asyncio.Semaphore(GEMINI_CONCURRENCY)
+        self._gemini_bucket = TokenBucket(GEMINI_RPS)
+        self._gemini_clients: Dict[str, Any] = {}
+        self.stats = {"google_calls": 0, "gemini_calls": 0}
+
+    def _gemini_client(self, api_key: str):
+        client = self._gemini_clients.get(api_key)
+        if client is None:
+            from google import genai
+            client = self._gemini_clients[api_key] = genai.Client(api_key=api_key)
+        return client
+
+    async def google(self, text: str, target: str) -> str:
+        async def attempt() -> str:
+            await self._google_bucket.acquire()
+            self.stats["google_calls"] += 1
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._google_pool, _google_translate_sync, text, target)
+
+        async with self._google_sem:
+            return await retry_with_jitter(attempt, attempts=TRANSLATION_RETRIES, label=f"Google translate ({target})")
+
+    async def gemini(self, api_key: str, model: str, contents: Any, config: Any) -> Any:
+        client = self._gemini_client(api_key)
+
+        async def attempt() -> Any:
+            await self._gemini_bucket.acquire()
+            self.stats["gemini_calls"] += 1
+            return await client.aio.models.generate_content(model=model, contents=contents, config=config)
+
+        async with self._gemini_sem:
+            return await retry_with_jitter(attempt, attempts=TRANSLATION_RETRIES, label=f"Gemini ({model})")
+
+    def submit(self, coro):
+        """Schedule a coroutine on the service loop without waiting (returns a Future)."""
+        return self._bg.submit(coro)
+
+    def google_sync(self, text: str, target: str) -> str:
+        return self._bg.run(self.google(text, target))
+
+    def gemini_sync(self, api_key: str, model: str, contents: Any, config: Any) -> Any:
+        return self._bg.run(self.gemini(api_key, model, contents, config))
+
+
+_SERVICE: Optional[TranslationService] = None
+_SERVICE_PID: Optional[int] = None
+_SERVICE_LOCK = threading.Lock()
+
+
+def get_translation_service() -> TranslationService:
+    global _SERVICE, _SERVICE_PID
+    with _SERVICE_LOCK:
+        if _SERVICE is None or _SERVICE_PID != os.getpid():
+            _SERVICE = TranslationService()
+            _SERVICE_PID = os.getpid()
+        return _SERVICE
@@ -0,0 +1,82 @@
+import math
+from typing import Dict, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# quality -> (frame length ms, similarity search tolerance ms, search decimation)
+QUALITY_PRESETS: Dict[str, Tuple[float, float, int]] = {
+    "fast": (20.0, 5.0, 4),
+    "balanced": (30.0, 10.0, 2),
+    "high": (40.0, 15.0, 1),
+}
+
+# Frames overlap-added per block, bounding the frame matrix held in memory
+_OLA_BLOCK = 4096
+
+
+def _periodic_hann(n: int) -> np.ndarray:
+    # Periodic Hann windows at 50% overlap sum to exactly 1
+    return (0.5 - 0.5 * np.cos(2.0 * np.pi * np.arange(n) / n)).astype(np.float32)
+
+
+def wsola(samples: np.ndarray, tempo: float, sample_rate: int, quality: str = "balanced") -> np.ndarray:
+    """Time-scale mono float32 PCM by *tempo* (>1 faster/shorter) without changing pitch.
+
+    Waveform-similarity overlap-add: output frames are laid down every half frame, and
+    each frame is read from the input near its ideal position ``k * hop * tempo``,
+    shifted (within the search tolerance) to the offset whose waveform best continues
+    the previous frame. That offset search is one cross-correlation per frame, and the
+    overlap-add is vectorized per block of frames. The output has exactly
+    ``round(len(samples) / tempo)`` samples.
+
+    *quality* picks a preset from QUALITY_PRESETS: longer frames and a wider, denser
+    search sound smoother on speech at the cost of speed.
+    """
+    x = np.asarray(samples, dtype=np.float32).reshape(-1)
+    if tempo <= 0:
+        raise ValueError(f"tempo must be positive, got {tempo}")
+    out_len = int(round(len(x) / tempo))
+    if len(x) == 0 or abs(tempo - 1.0) < 1e-3:
+        return x.copy()
+
+    frame_ms, tolerance_ms, stride = QUALITY_PRESETS.get(quality, QUALITY_PRESETS["balanced"])
+    n = max(16, int(sample_rate * frame_ms / 1000) // 2 * 2)
+    hs = n // 2
+    delta = max(1, int(sample_rate * tolerance_ms / 1000))
+    ha = hs * tempo
+
+    # Frame k covers output [k*hs - hs, k*hs + hs); the first half-frame is discarded
+    n_frames = out_len // hs + 3
+    pad = delta + n
+    tail = int(math.ceil(n_frames * ha)) + n + delta
+    xp = np.concatenate([np.zeros(pad, np.float32), x, np.zeros(max(0, tail - len(x)) + pad, np.float32)])
+    windows = sliding_window_view(xp, n)
+
+    # Similarity search on a decimated copy (offsets in steps of *stride* samples): one
+    # C-level cross-correlation per frame over the 2*delta+1 candidate offsets
+    xd = np.ascontiguousarray(xp[::stride]) if stride > 1 else xp
+    nd, span = n // stride, (2 * delta) // stride + 1
+    positions = np.empty(n_frames, dtype=np.int64)
+    positions[0] = pad - hs
+    for k in range(1, n_frames):
+        natural = (positions[k - 1] + hs) // stride
+        lo = (pad - hs + int(round(k * ha)) - delta) // stride
+        corr = np.correlate(xd[lo:lo + span + nd - 1], xd[natural:natural + nd], "valid")
+        positions[k] = (lo + int(np.argmax(corr))) * stride
+
+    win = _periodic_hann(n)
+    out = np.zeros((n_frames + 1) * hs, dtype=np.float32)
+    for b in range(0, n_frames, _OLA_BLOCK):
+        frames = windows[positions[b:b + _OLA_BLOCK]] * win
+        m = len(frames)
+        out[b * hs:(b + m) * hs] += frames[:, :hs].reshape(-1)
+        out[(b + 1) * hs:(b + m + 1) * hs] += frames[:, hs:].reshape(-1)
+    return out[hs:hs + out_len]
+
+
+def fit_length(samples: np.ndarray, n: int) -> np.ndarray:
+    """Trim or zero-pad to exactly *n* samples."""
+    if len(samples) >= n:
+        return samples[:n]
+    return np.concatenate([samples, np.zeros(n - len(samples), dtype=samples.dtype)])
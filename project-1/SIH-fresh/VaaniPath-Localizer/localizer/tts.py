@@ -1,173 +1,283 @@
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 import os
 import json
 import re
-import asyncio
+import threading
 
 from gtts import gTTS
 
-from .utils import setup_logger
+from .text_match import AhoCorasickReplacer
+from .tts_cache import fetch_clip, record as record_tts, store_clip, tts_cache_key
+from .tts_service import edge_tts, get_tts_service
+from .utils import content_version, setup_logger
+from .voice_catalog import resolve_voice
 
 logger = setup_logger("tts")
 
-_PRON_OVERRIDES = None
-_VOICE_MAP_CACHE = None
-try:
-    import edge_tts  # type: ignore
-except Exception:
-    edge_tts = None
-
-DEFAULT_VOICE_MAP = {
-    "hi": "hi-IN-MadhurNeural",
-    "hi-IN": "hi-IN-MadhurNeural",
-    "sa": "hi-IN-MadhurNeural",
-    "sa-IN": "hi-IN-MadhurNeural",
-}
+OVERRIDES_PATH = os.path.join(os.path.dirname(__file__), "sample_data", "pronunciation_overrides.json")
 
-def _load_voice_map() -> Dict[str, str]:
-    global _VOICE_MAP_CACHE
-    if _VOICE_MAP_CACHE is not None:
-        return _VOICE_MAP_CACHE
-    path = os.path.join(os.path.dirname(__file__), "sample_data", "voice_map.json")
-    data: Dict[str, str] = {}
-    if os.path.exists(path):
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-        except Exception:
-            data = {}
-    # Merge defaults
-    merged = {**DEFAULT_VOICE_MAP, **data}
-    _VOICE_MAP_CACHE = merged
-    return merged
+# (overrides file mtime, parsed JSON); reloaded when the file changes
+_PRON_OVERRIDES: Tuple[Optional[float], Dict] = (None, {})
+# language -> (overrides file mtime, compiled overrides)
+_PRON_MATCHERS: Dict[str, Tuple[Optional[float], "PronunciationOverrides"]] = {}
+_PRON_LOCK = threading.Lock()
+
+
+class OverriddenText(str):
+    """Text that already went through the pronunciation overrides for ``lang``.
+
+    ``tts_synthesize`` checks for it so callers that pre-apply overrides (to log or
+    store the spoken form) do not get them applied a second time.
+    """
+
+    lang: str = ""
+
+    def __new__(cls, text: str, lang: str):
+        obj = super().__new__(cls, text)
+        obj.lang = lang
+        return obj
+
+
+class PronunciationOverrides:
+    """One language's overrides compiled once.
+
+    Literal entries run as a single whole-word, case-insensitive Aho-Corasick pass;
+    ``re:`` entries are compiled once and applied afterwards in file order.
+    """
+
+    def __init__(self, overrides: Dict[str, str]):
+        literals = {src: dst for src, dst in overrides.items() if not src.startswith("re:")}
+        self._literals = AhoCorasickReplacer(literals)
+        self._patterns = [
+            (re.compile(src[3:], flags=re.IGNORECASE), dst)
+            for src, dst in overrides.items()
+            if src.startswith("re:")
+        ]
+        self.size = self._literals.size + len(self._patterns)
+        self.version = content_version(overrides)
+
+    def apply(self, text: str) -> str:
+        if not text or not self.size:
+            return text
+        out = self._literals.replace(text)
+        for pattern, dst in self._patterns:
+            out = pattern.sub(dst, out)
+        return out
+
+
+def _overrides_mtime() -> Optional[float]:
+    try:
+        return os.path.getmtime(OVERRIDES_PATH)
+    except OSError:
+        return None
 
 
-def _load_overrides() -> Dict:
+def _load_overrides(mtime: Optional[float] = None) -> Dict:
     global _PRON_OVERRIDES
-    if _PRON_OVERRIDES is not None:
-        return _PRON_OVERRIDES
-    path = os.path.join(os.path.dirname(__file__), "sample_data", "pronunciation_overrides.json")
-    if os.path.exists(path):
-        try:
-            with open(path, "r", encoding="utf-8") as f:
-                _PRON_OVERRIDES = json.load(f)
-        except Exception:
-            _PRON_OVERRIDES = {}
-    else:
-        _PRON_OVERRIDES = {}
-    return _PRON_OVERRIDES
+    if mtime is None:
+        mtime = _overrides_mtime()
+    with _PRON_LOCK:
+        if _PRON_OVERRIDES[0] == mtime:
+            return _PRON_OVERRIDES[1]
+        data: Dict = {}
+        if mtime is not None:
+            try:
+                with open(OVERRIDES_PATH, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+            except Exception as e:
+                logger.error(f"Failed to load pronunciation overrides {OVERRIDES_PATH}: {e}")
+                data = {}
+        _PRON_OVERRIDES = (mtime, data)
+        return data
 
 
-def apply_pronunciation_overrides(text: str, lang: str) -> str:
+def get_pronunciation_overrides(lang: str) -> PronunciationOverrides:
+    """Compiled overrides for *lang* (locale variants inherit the base code), rebuilt when
+    ``pronunciation_overrides.json`` changes."""
+    mtime = _overrides_mtime()
+    with _PRON_LOCK:
+        cached = _PRON_MATCHERS.get(lang)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
     try:
-        ov = _load_overrides()
+        ov = _load_overrides(mtime)
         overrides = ov.get(lang, {}) or ov.get((lang or "").split("-")[0], {})
     except Exception:
         overrides = {}
-    if not overrides:
-        return text
-    out = text
-    for src, dst in overrides.items():
-        if src.startswith("re:"):
-            pattern = re.compile(src[3:], flags=re.IGNORECASE)
-        else:
-            pattern = re.compile(r"\b" + re.escape(src) + r"\b", flags=re.IGNORECASE)
-        out = pattern.sub(dst, out)
-    return out
+    compiled = PronunciationOverrides(overrides or {})
+    with _PRON_LOCK:
+        _PRON_MATCHERS[lang] = (mtime, compiled)
+    if compiled.size:
+        logger.info(f"Compiled {compiled.size} pronunciation overrides for {lang}")
+    return compiled
 
 
-async def _tts_edge_async(text: str, voice: str, output_path: str, rate: str | None = None, pitch: str | None = None) -> None:
-    # Use edge-tts built-in prosody controls to avoid SSML tags being spoken.
-    kwargs = {"text": text, "voice": voice}
-    if rate is not None:
-        kwargs["rate"] = rate
-    if pitch is not None:
-        kwargs["pitch"] = pitch
-    communicate = edge_tts.Communicate(**kwargs)
-    await communicate.save(output_path)
+def apply_pronunciation_overrides(text: str, lang: str) -> str:
+    if isinstance(text, OverriddenText) and text.lang == lang:
+        return text
+    return OverriddenText(get_pronunciation_overrides(lang).apply(text), lang)
 
 
 def _tts_edge(text: str, voice: str, output_path: str, rate: str | None = None, pitch: str | None = None) -> str:
-    asyncio.run(_tts_edge_async(text, voice, output_path, rate=rate, pitch=pitch))
-    return output_path
+    return get_tts_service().edge_sync(text, voice, output_path, rate=rate, pitch=pitch)
 
 
 def _select_edge_voice(lang: str) -> str | None:
-    # Try explicit mapping first
-    voice_map = _load_voice_map()
-    if lang in voice_map:
-        return voice_map[lang]
-    base = lang.split("-")[0]
-    if base in voice_map:
-        return voice_map[base]
-    # Dynamic discovery from edge-tts voices
+    # Voice map first, then the best Neural (male) voice from the shared voice catalog
     if edge_tts is None:
         return None
     try:
-        voices = asyncio.run(edge_tts.list_voices())
-        # Prefer exact locale, then base language, prefer Neural and Male
-        candidates = []
-        for v in voices:
-            locale = (v.get("Locale") or "").lower()
-            short = v.get("ShortName")
-            gender = (v.get("Gender") or "").lower()
-            if not short:
-                continue
-            if locale == lang.lower() or locale.startswith(base.lower()):
-                score = 0
-                if "neural" in short.lower():
-                    score += 2
-                if gender == "male":
-                    score += 1
-                candidates.append((score, short))
-        if not candidates:
-            return None
-        candidates.sort(key=lambda x: x[0], reverse=True)
-        return candidates[0][1]
+        return resolve_voice(lang)
     except Exception:
         return None
 
 
-def tts_synthesize(text: str, lang: str, output_path: str) -> str:
+# Fallback mapping for codes gTTS does not support
+GTTS_FALLBACK_MAP = {
+    "mwr": "hi",  # Marwari approximated via Hindi for TTS
+    "bho": "hi",  # Bhojpuri approximated via Hindi for TTS
+    "sa": "hi",   # Sanskrit approximated via Hindi for TTS when needed
+    "brx": "hi",  # Bodo via Hindi
+    "doi": "hi",  # Dogri via Hindi
+    "ks": "ur",   # Kashmiri via Urdu
+    "gom": "hi",  # Konkani via Hindi
+    "mai": "hi",  # Maithili via Hindi
+    "mni": "hi",  # Manipuri via Hindi
+    "sat": "hi",  # Santali via Hindi
+    "sd": "ur",   # Sindhi via Urdu (closer phonetically)
+    "bgc": "hi",  # Haryanvi via Hindi
+}
+
+
+def _edge_request(text: str, lang: str, output_path: str) -> Dict | None:
+    """Keyword arguments for ``TTSService.edge``, or None when no edge-tts voice fits *lang*."""
+    if edge_tts is None:
+        return None
+    voice = _select_edge_voice(lang)
+    if not voice:
+        return None
+    req = {"text": text, "voice": voice, "output_path": output_path}
+    if (lang or "").split("-")[0] == "bho":
+        # Apply a stronger accent via prosody controls without SSML tags.
+        req.update(rate="-10%", pitch="-4%")
+    return req
+
+
+def _gtts_lang(lang: str) -> str:
+    # gTTS expects a base language code like 'hi'
+    base_lang = (lang or "").split("-")[0]
+    return GTTS_FALLBACK_MAP.get(base_lang, base_lang)
+
+
+def _edge_cache_key(req: Dict) -> str:
+    return tts_cache_key(req["text"], "edge-tts", req["voice"], req.get("rate"), req.get("pitch"))
+
+
+def _tts_gtts(text: str, lang: str, output_path: str) -> str:
+    tts = gTTS(text=text, lang=_gtts_lang(lang))
+    tts.save(output_path)
+    logger.info(f"Saved TTS (gTTS) to {output_path}")
+    store_clip(tts_cache_key(text, "gtts", _gtts_lang(lang)), output_path)
+    return output_path
+
+
+def _cached_clip(text_for_tts: str, req: Dict | None, lang: str, output_path: str) -> bool:
+    """Serve the clip from the TTS cache: the edge-tts voice when one fits, else gTTS."""
+    key = _edge_cache_key(req) if req is not None else tts_cache_key(text_for_tts, "gtts", _gtts_lang(lang))
+    return fetch_clip(key, output_path)
+
+
+def tts_fingerprint(text: str, lang: str) -> str:
+    """Identity of the clip tts_synthesize would produce for *text*: the translated text,
+    the voice (engine, voice name, prosody) and the language's pronunciation overrides."""
+    req = _edge_request(text, lang, "")
+    if req is not None:
+        voice = f"edge-tts:{req['voice']}:{req.get('rate')}:{req.get('pitch')}"
+    else:
+        voice = f"gtts:{_gtts_lang(lang)}"
+    return content_version([text, voice, get_pronunciation_overrides(lang).version])
+
+
+def tts_synthesize(text: str, lang: str, output_path: str, stats: Dict[str, int] | None = None) -> str:
+    # No-op when the caller already applied the overrides for this language
     text_for_tts = apply_pronunciation_overrides(text, lang)
-    voice = None
-    if edge_tts is not None:
-        voice = _select_edge_voice(lang)
-    if edge_tts is not None and voice:
+    req = _edge_request(text_for_tts, lang, output_path)
+    if _cached_clip(text_for_tts, req, lang, output_path):
+        record_tts(stats, 1, 0)
+        logger.info(f"Reused cached TTS clip for {output_path}")
+        return output_path
+    record_tts(stats, 0, 1)
+    if req is not None:
         try:
-            base_lang = (lang or "").split("-")[0]
-            if base_lang == "bho":
-                # Apply a stronger accent via prosody controls without SSML tags.
-                _tts_edge(text_for_tts, voice, output_path, rate="-10%", pitch="-4%")
-            else:
-                _tts_edge(text_for_tts, voice, output_path)
-            logger.info(f"Saved TTS (edge-tts {voice}) to {output_path}")
+            _tts_edge(**req)
+            logger.info(f"Saved TTS (edge-tts {req['voice']}) to {output_path}")
+            store_clip(_edge_cache_key(req), output_path)
             return output_path
         except Exception as e:
             logger.error(f"edge-tts synthesis failed: {e}; falling back to gTTS")
+    return _tts_gtts(text_for_tts, lang, output_path)
 
-    # Fallback to gTTS (expects base language code like 'hi')
-    base_lang = (lang or "").split("-")[0]
-    # Fallback mapping for unsupported codes
-    FALLBACK_MAP = {
-        "mwr": "hi",  # Marwari approximated via Hindi for TTS
-        "bho": "hi",  # Bhojpuri approximated via Hindi for TTS
-        "sa": "hi",   # Sanskrit approximated via Hindi for TTS when needed
-        "brx": "hi",  # Bodo via Hindi
-        "doi": "hi",  # Dogri via Hindi
-        "ks": "ur",   # Kashmiri via Urdu
-        "gom": "hi",  # Konkani via Hindi
-        "mai": "hi",  # Maithili via Hindi
-        "mni": "hi",  # Manipuri via Hindi
-        "sat": "hi",  # Santali via Hindi
-        "sd": "ur",   # Sindhi via Urdu (closer phonetically)
-        "bgc": "hi",  # Haryanvi via Hindi
-    }
-    base_lang = FALLBACK_MAP.get(base_lang, base_lang)
-    tts = gTTS(text=text_for_tts, lang=base_lang)
-    tts.save(output_path)
-    logger.info(f"Saved TTS (gTTS) to {output_path}")
-    return output_path
+
+def tts_synthesize_many(items: List[Tuple[str, str, str]], stats: Dict[str, int] | None = None) -> List[str]:
+    """Synthesize many ``(text, lang, output_path)`` clips with their edge-tts requests in
+    flight together on the TTS service loop; clips that fail fall back to gTTS."""
+    prepared = []
+    hits = 0
+    for text, lang, output_path in items:
+        text_for_tts = apply_pronunciation_overrides(text, lang)
+        req = _edge_request(text_for_tts, lang, output_path)
+        if _cached_clip(text_for_tts, req, lang, output_path):
+            hits += 1
+            continue
+        prepared.append((text_for_tts, lang, output_path, req))
+    record_tts(stats, hits, len(prepared))
+
+    edge_reqs = [p[3] for p in prepared if p[3] is not None]
+    edge_results = iter(get_tts_service().synthesize_many_sync(edge_reqs) if edge_reqs else [])
+    for text_for_tts, lang, output_path, req in prepared:
+        if req is not None:
+            res = next(edge_results)
+            if not isinstance(res, BaseException):
+                store_clip(_edge_cache_key(req), output_path)
+                continue
+            logger.error(f"edge-tts synthesis failed for {output_path}: {res}; falling back to gTTS")
+        _tts_gtts(text_for_tts, lang, output_path)
+    logger.info(
+        f"Synthesized {len(items)} TTS clips ({hits} cached, {len(edge_reqs)} via edge-tts, "
+        f"{len(prepared) - len(edge_reqs)} via gTTS)"
+    )
+    return [output_path for _, _, output_path in items]
+
+
+def tts_synthesize_segments(
+    segments: List[Dict],
+    lang: str,
+    output_dir: str,
+    prefix: str,
+    stats: Dict[str, int] | None = None,
+) -> List[Dict]:
+    """One clip per segment (``seg["text_translated"]``), all synthesized together.
+
+    Clips are written as ``<prefix>_seg_NNN.mp3``; returns the segments with ``audio_path``
+    set on every segment that has text to speak.
+    """
+    out = [dict(seg) for seg in segments]
+    items = []
+    for i, seg in enumerate(out):
+        text = (seg.get("text_translated") or "").strip()
+        if not text:
+            seg.pop("audio_path", None)
+            continue
+        seg["audio_path"] = os.path.join(output_dir, f"{prefix}_seg_{i:03d}.mp3")
+        items.append((text, lang, seg["audio_path"]))
+    if items:
+        tts_synthesize_many(items, stats=stats)
+    return out
+
+
+def segments_fingerprint(segments: List[Dict], lang: str) -> str:
+    """tts_fingerprint over a chunk's per-segment texts (segment-level TTS)."""
+    return tts_fingerprint("\n".join((seg.get("text_translated") or "").strip() for seg in segments), lang)
 
 
 def _format_ts(seconds: float) -> str:
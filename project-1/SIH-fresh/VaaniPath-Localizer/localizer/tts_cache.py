@@ -0,0 +1,65 @@
+import hashlib
+import json
+import os
+from typing import Dict, Optional
+
+from .config import CACHE_DIR, TTS_CACHE_ENABLED, TTS_CACHE_MAX_MB
+from .disk_cache import DiskCache
+from .utils import mkdir_p, setup_logger
+
+logger = setup_logger("tts_cache")
+
+_CACHE: Optional[DiskCache] = None
+
+
+def get_tts_cache() -> DiskCache:
+    global _CACHE
+    if _CACHE is None:
+        _CACHE = DiskCache(os.path.join(CACHE_DIR, "tts_clips.sqlite"), TTS_CACHE_MAX_MB * 1024 * 1024)
+    return _CACHE
+
+
+def tts_cache_key(
+    text: str,
+    engine: str,
+    voice: str,
+    rate: Optional[str] = None,
+    pitch: Optional[str] = None,
+) -> str:
+    """Content address of a clip: the exact text sent to the engine plus every voice setting."""
+    payload = json.dumps([text, engine, voice, rate, pitch], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def fetch_clip(key: str, output_path: str) -> bool:
+    """Write the cached clip for *key* to *output_path*; False on a miss."""
+    if not TTS_CACHE_ENABLED:
+        return False
+    data = get_tts_cache().get(key)
+    if data is None:
+        return False
+    mkdir_p(os.path.dirname(output_path) or ".")
+    with open(output_path, "wb") as f:
+        f.write(data)
+    return True
+
+
+def store_clip(key: str, path: str) -> None:
+    if not TTS_CACHE_ENABLED:
+        return
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError as e:
+        logger.warning(f"Could not cache TTS clip {path}: {e}")
+        return
+    if data:
+        get_tts_cache().set(key, data)
+
+
+def record(stats: Optional[Dict[str, int]], hits: int, misses: int) -> None:
+    """Accumulate per-job TTS cache counters into a caller-owned dict (if any)."""
+    if stats is None:
+        return
+    stats["tts_hits"] = stats.get("tts_hits", 0) + hits
+    stats["tts_misses"] = stats.get("tts_misses", 0) + misses
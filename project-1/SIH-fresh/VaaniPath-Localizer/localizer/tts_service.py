@@ -0,0 +1,116 @@
+import asyncio
+import os
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+from .async_utils import get_background_loop, retry_with_jitter
+from .config import EDGE_TTS_CONCURRENCY, TTS_RETRIES
+from .utils import setup_logger
+
+logger = setup_logger("tts_service")
+
+try:
+    import edge_tts  # type: ignore
+except Exception:
+    edge_tts = None
+
+
+class TTSService:
+    """edge-tts synthesis multiplexed on one background event loop per process.
+
+    Replaces an ``asyncio.run()`` (new loop, new websocket handshake) per clip: every
+    request is a coroutine on the shared ``tts`` loop, at most ``EDGE_TTS_CONCURRENCY``
+    run at once, and failures are retried with jittered backoff. The voice list is
+    fetched once per process unless a refresh is asked for. ``*_sync`` facades block
+    only the calling thread, so chunk threads overlap their network waits on the same loop.
+    """
+
+    def __init__(self):
+        self._bg = get_background_loop("tts")
+        self._sem = asyncio.Semaphore(EDGE_TTS_CONCURRENCY)
+        self._voices: Optional[List[Dict[str, Any]]] = None
+        self._voices_lock: Optional[asyncio.Lock] = None
+        self.stats = {"edge_calls": 0, "edge_failures": 0, "voice_list_calls": 0}
+
+    async def edge(
+        self,
+        text: str,
+        voice: str,
+        output_path: str,
+        rate: Optional[str] = None,
+        pitch: Optional[str] = None,
+    ) -> str:
+        # Use edge-tts built-in prosody controls to avoid SSML tags being spoken.
+        kwargs = {"text": text, "voice": voice}
+        if rate is not None:
+            kwargs["rate"] = rate
+        if pitch is not None:
+            kwargs["pitch"] = pitch
+
+        async def attempt() -> str:
+            self.stats["edge_calls"] += 1
+            await edge_tts.Communicate(**kwargs).save(output_path)
+            return output_path
+
+        async with self._sem:
+            try:
+                return await retry_with_jitter(attempt, attempts=TTS_RETRIES, label=f"edge-tts ({voice})")
+            except Exception:
+                self.stats["edge_failures"] += 1
+                raise
+
+    async def list_voices(self, refresh: bool = False) -> List[Dict[str, Any]]:
+        """edge-tts voice list, memoized for the process; *refresh* re-fetches it."""
+        if self._voices is not None and not refresh:
+            return self._voices
+        if self._voices_lock is None:
+            self._voices_lock = asyncio.Lock()
+        async with self._voices_lock:
+            if self._voices is None or refresh:
+                self.stats["voice_list_calls"] += 1
+                self._voices = await retry_with_jitter(
+                    edge_tts.list_voices, attempts=TTS_RETRIES, label="edge-tts list_voices"
+                )
+        return self._voices
+
+    async def synthesize_many(self, requests: Sequence[Dict[str, Any]]) -> List[Any]:
+        """Run many ``edge()`` requests concurrently (bounded by the semaphore).
+
+        Each request is a dict of ``edge()`` keyword arguments. Results keep input
+        order; a failed request yields its exception instead of a path.
+        """
+        return await asyncio.gather(*(self.edge(**req) for req in requests), return_exceptions=True)
+
+    def submit(self, coro):
+        """Schedule a coroutine on the service loop without waiting (returns a Future)."""
+        return self._bg.submit(coro)
+
+    def edge_sync(
+        self,
+        text: str,
+        voice: str,
+        output_path: str,
+        rate: Optional[str] = None,
+        pitch: Optional[str] = None,
+    ) -> str:
+        return self._bg.run(self.edge(text, voice, output_path, rate=rate, pitch=pitch))
+
+    def list_voices_sync(self, refresh: bool = False) -> List[Dict[str, Any]]:
+        return self._bg.run(self.list_voices(refresh=refresh))
+
+    def synthesize_many_sync(self, requests: Sequence[Dict[str, Any]]) -> List[Any]:
+        return self._bg.run(self.synthesize_many(requests))
+
+
+_SERVICE: Optional[TTSService] = None
+_SERVICE_PID: Optional[int] = None
+_SERVICE_LOCK = threading.Lock()
+
+
+def get_tts_service() -> TTSService:
+    global _SERVICE, _SERVICE_PID
+    with _SERVICE_LOCK:
+        if _SERVICE is None or _SERVICE_PID != os.getpid():
+            _SERVICE = TTSService()
+            _SERVICE_PID = os.getpid()
+        return _SERVICE
@@ -1,3 +1,5 @@
+import hashlib
+import json
 import os
 import logging
 from multiprocessing import cpu_count
@@ -19,6 +21,14 @@ def get_worker_count() -> int:
     return max(1, cpus - 1)
 
 
+def content_version(data) -> str:
+    """Short stable hash of a glossary dict / style guide string (empty -> "none")."""
+    if not data:
+        return "none"
+    raw = json.dumps(data, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:12]
+
+
 def setup_logger(name: str) -> logging.Logger:
     logger = logging.getLogger(name)
     if not logger.handlers:
@@ -1,104 +1,227 @@
 import math
 import os
-import subprocess
-from typing import List, Dict
+from contextlib import contextmanager
+from typing import Iterator, List, Dict, Tuple
 
-from .utils import mkdir_p, safe_filename, setup_logger, FFMPEG, FFPROBE
+import numpy as np
+
+from .audio_extract import decode_pcm16, pcm_chunk_meta, segment_to_wavs, shared_pcm, write_chunk_wavs
+from .config import (
+    CHUNK_MAX_SECONDS,
+    CHUNK_MIN_SECONDS,
+    CHUNK_STRATEGY,
+    LONG_SILENCE_SECONDS,
+    MIN_SPEECH_SECONDS,
+    PCM_TRANSPORT,
+    SAMPLE_RATE,
+)
+from .utils import setup_logger
 
 logger = setup_logger("video_splitter")
 
 
-def _ffprobe_duration(input_path: str) -> float:
-    cmd = [
-        FFPROBE,
-        "-v",
-        "error",
-        "-show_entries",
-        "format=duration",
-        "-of",
-        "default=noprint_wrappers=1:nokey=1",
-        input_path,
-    ]
-    try:
-        out = subprocess.check_output(cmd, stderr=subprocess.STDOUT)
-        return float(out.decode().strip())
-    except subprocess.CalledProcessError as e:
-        logger.error(f"ffprobe failed: {e.output.decode(errors='ignore')}")
-        raise
+def _frame_levels_db(samples: np.ndarray, frame_len: int) -> np.ndarray:
+    n_frames = len(samples) // frame_len
+    if n_frames == 0:
+        return np.full(1, -100.0, dtype=np.float32)
+    frames = samples[: n_frames * frame_len].astype(np.float32).reshape(n_frames, frame_len) / 32768.0
+    rms = np.sqrt(np.mean(frames * frames, axis=1) + 1e-12)
+    return 20.0 * np.log10(rms)
 
 
-def split_video(
-    input_path: str,
-    output_dir: str,
-    chunk_length: float = 30.0,
-    overlap: float = 1.0,
+def _silence_threshold_db(levels: np.ndarray) -> float:
+    # Noise floor + margin, kept within a sane range so constant speech or digital
+    # silence do not produce a useless threshold
+    return float(np.clip(np.percentile(levels, 10) + 12.0, -50.0, -30.0))
+
+
+def _silent_runs(silent: np.ndarray) -> List[Tuple[int, int]]:
+    """Return [start, end) frame index pairs of consecutive silent frames."""
+    padded = np.concatenate(([False], silent, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    return list(zip(edges[0::2].tolist(), edges[1::2].tolist()))
+
+
+def _plan_span(
+    start: float,
+    end: float,
+    levels: np.ndarray,
+    runs: List[Tuple[int, int]],
+    frame_s: float,
+    target_length: float,
+    min_length: float,
+    max_length: float,
+) -> List[float]:
+    """Return the interior cut points for the span [start, end)."""
+    cuts = [start]
+    while end - cuts[-1] > max_length:
+        cur = cuts[-1]
+        lo, hi, target = cur + min_length, cur + max_length, cur + target_length
+        best = None
+        for r0, r1 in runs:
+            t0, t1 = r0 * frame_s, r1 * frame_s
+            if t1 <= lo or t0 >= hi:
+                continue
+            cut = min(max((t0 + t1) / 2.0, lo), hi)
+            key = (-round(min(t1 - t0, 0.5), 1), abs(cut - target))
+            if best is None or key < best[0]:
+                best = (key, cut)
+        if best is None:
+            # No pause in the window: cut at the quietest frame
+            f_lo = int(lo / frame_s)
+            f_hi = max(f_lo + 1, int(hi / frame_s))
+            cut = (f_lo + int(np.argmin(levels[f_lo:f_hi]))) * frame_s
+        else:
+            cut = best[1]
+        cuts.append(cut)
+    return cuts[1:]
+
+
+def plan_silence_chunks(
+    samples: np.ndarray,
+    target_length: float,
+    min_length: float = CHUNK_MIN_SECONDS,
+    max_length: float = CHUNK_MAX_SECONDS,
+    frame_ms: int = 30,
 ) -> List[Dict]:
-    mkdir_p(output_dir)
-    duration = _ffprobe_duration(input_path)
-    logger.info(f"Input duration: {duration:.2f}s")
+    """Choose chunk boundaries inside pauses near *target_length* seconds.
 
+    Pauses of LONG_SILENCE_SECONDS or more always become chunks of their own. Other
+    cuts go, within each [min_length, max_length] window, in the middle of the
+    longest pause (pauses over 0.5s count equally), ties broken by distance to the
+    target. Chunks with less than MIN_SPEECH_SECONDS of voiced frames are flagged
+    ``speech=False`` so the pipeline can skip STT, translation and TTS for them.
+    """
+    frame_len = SAMPLE_RATE * frame_ms // 1000
+    frame_s = frame_ms / 1000.0
+    levels = _frame_levels_db(samples, frame_len)
+    silent = levels < _silence_threshold_db(levels)
+    runs = _silent_runs(silent)
+    duration = len(samples) / SAMPLE_RATE
+    min_length = min(min_length, target_length)
+    max_length = max(max_length, target_length)
+
+    # Long pauses are isolated first (keeping a little padding around the speech)
+    forced = [0.0]
+    pad = 0.25
+    for r0, r1 in runs:
+        t0, t1 = r0 * frame_s, min(r1 * frame_s, duration)
+        if t1 - t0 < LONG_SILENCE_SECONDS:
+            continue
+        for cut in (t0 + pad if t0 > 0 else None, t1 - pad if t1 < duration else None):
+            if cut is not None and cut - forced[-1] >= 1.0 and duration - cut >= 1.0:
+                forced.append(cut)
+    forced.append(duration)
+
+    bounds = [0.0]
+    for start, end in zip(forced[:-1], forced[1:]):
+        bounds.extend(_plan_span(start, end, levels, runs, frame_s, target_length, min_length, max_length))
+        bounds.append(end)
+
+    plan = []
+    for start, end in zip(bounds[:-1], bounds[1:]):
+        f0 = int(start / frame_s)
+        f1 = max(f0 + 1, int(end / frame_s))
+        voiced = float(np.count_nonzero(~silent[f0:f1])) * frame_s
+        plan.append({"start": start, "end": end, "speech": voiced >= MIN_SPEECH_SECONDS})
+    return plan
+
+
+def _fixed_spans(duration: float, chunk_length: float, overlap: float) -> List[Dict]:
     # Next chunk starts at previous_end - overlap, so step = chunk_length - overlap
     step = max(0.1, chunk_length - overlap)
-    starts = []
+    spans = []
     t = 0.0
     while t < duration:
-        starts.append(t)
+        spans.append({"start": t, "end": min(t + chunk_length, duration)})
         t += step
+    return spans
+
+
+def plan_chunks(
+    input_path: str,
+    chunk_length: float = 30.0,
+    overlap: float = 1.0,
+    strategy: str | None = None,
+) -> Tuple[np.ndarray, List[Dict]]:
+    """Decode the input once and return (int16 samples, chunk spans) without writing files."""
+    samples = decode_pcm16(input_path)
+    logger.info(f"Input duration: {len(samples) / SAMPLE_RATE:.2f}s")
+    if (strategy or CHUNK_STRATEGY) == "silence":
+        return samples, plan_silence_chunks(samples, chunk_length)
+    return samples, _fixed_spans(len(samples) / SAMPLE_RATE, chunk_length, overlap)
+
+
+@contextmanager
+def open_chunks(
+    input_path: str,
+    output_dir: str,
+    chunk_length: float = 30.0,
+    overlap: float = 1.0,
+    strategy: str | None = None,
+    transport: str | None = None,
+) -> Iterator[List[Dict]]:
+    """Yield chunk metadata for the ProcessPool, valid until the block exits.
+
+    With ``transport="shared_memory"`` (default, see PCM_TRANSPORT) the audio is decoded
+    once into a shared int16 buffer and each chunk carries an (offset, length) window
+    of it, so no chunk WAVs are written or re-decoded. When shared memory is too small
+    (e.g. Docker's 64 MB /dev/shm) the decoded samples are written out as chunk WAVs
+    instead. ``"files"`` behaves like :func:`split_video`.
+    """
+    if (transport or PCM_TRANSPORT) != "shared_memory":
+        yield split_video(input_path, output_dir, chunk_length, overlap, strategy)
+        return
+
+    samples, spans = plan_chunks(input_path, chunk_length, overlap, strategy)
+    with shared_pcm(samples) as shm_name:
+        if shm_name is None:
+            logger.warning(f"No room for {len(samples) * 2 / 1e6:.1f} MB in shared memory; writing chunk files")
+            yield write_chunk_wavs(samples, output_dir, spans)
+            return
+        chunks = [pcm_chunk_meta(i, span, shm_name, len(samples)) for i, span in enumerate(spans)]
+        logger.info(f"Prepared {len(chunks)} in-memory chunks (shared buffer {shm_name})")
+        yield chunks
+
+
+def split_on_silence(
+    input_path: str,
+    output_dir: str,
+    chunk_length: float = 30.0,
+) -> List[Dict]:
+    """Decode once, cut at pauses near *chunk_length* and write one WAV per chunk."""
+    samples, spans = plan_chunks(input_path, chunk_length, strategy="silence")
+    chunks = write_chunk_wavs(samples, output_dir, spans)
+
+    skipped = sum(1 for c in chunks if not c["speech"])
+    logger.info(f"Created {len(chunks)} chunks ({skipped} without speech) at {output_dir}")
+    return chunks
+
+
+def split_video(
+    input_path: str,
+    output_dir: str,
+    chunk_length: float = 30.0,
+    overlap: float = 1.0,
+    strategy: str | None = None,
+) -> List[Dict]:
+    """Split the input into chunks for parallel processing.
+
+    ``strategy="fixed"`` (the default, see CHUNK_STRATEGY) cuts every *chunk_length*
+    seconds with *overlap*; ``"silence"`` cuts at pauses near *chunk_length* and
+    ignores *overlap*.
+    """
+    if (strategy or CHUNK_STRATEGY) == "silence":
+        return split_on_silence(input_path, output_dir, chunk_length)
 
-    chunks = []
-    base = os.path.splitext(os.path.basename(input_path))[0]
-    for i, start in enumerate(starts):
-        end = min(start + chunk_length, duration)
-        out_video = os.path.join(output_dir, f"chunk_{i:04d}.mp4")
-        out_audio = os.path.join(output_dir, f"chunk_{i:04d}.wav")
-
-        # Extract video segment
-        cmd_video = [
-            FFMPEG,
-            "-y",
-            "-ss",
-            str(start),
-            "-i",
-            input_path,
-            "-t",
-            str(end - start),
-            "-c",
-            "copy",
-            out_video,
-        ]
-
-        # Extract audio from the segment
-        cmd_audio = [
-            FFMPEG,
-            "-y",
-            "-i",
-            out_video,
-            "-vn",
-            "-ac",
-            "1",
-            "-ar",
-            "16000",
-            "-f",
-            "wav",
-            out_audio,
-        ]
-
-        try:
-            subprocess.check_call(cmd_video, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT)
-            subprocess.check_call(cmd_audio, stdout=subprocess.DEVNULL, stderr=subprocess.STDOUT)
-        except subprocess.CalledProcessError as e:
-            logger.error(f"ffmpeg segment extraction failed at chunk {i}: {e}")
-            raise
-
-        chunks.append(
-            {
-                "index": i,
-                "start": start,
-                "end": end,
-                "video_path": out_video,
-                "audio_path": out_audio,
-            }
-        )
+    if overlap <= 0:
+        # One ffmpeg process decodes and cuts everything; no video chunks are written
+        chunks = segment_to_wavs(input_path, output_dir, chunk_length)
+        logger.info(f"Created {len(chunks)} chunks at {output_dir}")
+        return chunks
 
+    # Overlapping chunks: decode once and slice the samples
+    samples, spans = plan_chunks(input_path, chunk_length, overlap, strategy="fixed")
+    chunks = write_chunk_wavs(samples, output_dir, spans)
     logger.info(f"Created {len(chunks)} chunks at {output_dir}")
-    return chunks
\ No newline at end of file
+    return chunks
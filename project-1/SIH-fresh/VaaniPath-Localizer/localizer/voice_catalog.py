@@ -0,0 +1,190 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import CACHE_DIR, VOICE_CATALOG_TTL_HOURS
+from .utils import mkdir_p, setup_logger
+
+logger = setup_logger("voice_catalog")
+
+VOICE_MAP_PATH = os.path.join(os.path.dirname(__file__), "sample_data", "voice_map.json")
+CATALOG_PATH = os.path.join(CACHE_DIR, "edge_voices.json")
+
+DEFAULT_VOICE_MAP = {
+    "hi": "hi-IN-MadhurNeural",
+    "hi-IN": "hi-IN-MadhurNeural",
+    "sa": "hi-IN-MadhurNeural",
+    "sa-IN": "hi-IN-MadhurNeural",
+}
+
+
+def _atomic_write_json(path: str, data: Any) -> None:
+    """Write to a temp file in the same directory and rename over *path*, so readers
+    (other processes included) see either the old or the new file, never a partial one."""
+    mkdir_p(os.path.dirname(path))
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=".tmp-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+class VoiceCatalog:
+    """edge-tts voices indexed by base language for (locale, gender, neural) lookups."""
+
+    def __init__(self, voices: List[Dict[str, Any]], fetched_at: float = 0.0):
+        self.voices = [v for v in voices if v.get("ShortName")]
+        self.fetched_at = fetched_at
+        # base language -> [(short name, locale, gender, neural)]
+        self._by_base: Dict[str, List[Tuple[str, str, str, bool]]] = {}
+        for v in self.voices:
+            short = v["ShortName"]
+            locale = (v.get("Locale") or "").lower()
+            entry = (short, locale, (v.get("Gender") or "").lower(), "neural" in short.lower())
+            self._by_base.setdefault(locale.split("-")[0], []).append(entry)
+        self._best: Dict[Tuple[str, str], Optional[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self.voices)
+
+    def best(self, lang: str, gender: Optional[str] = None) -> Optional[str]:
+        """Best voice for *lang*: Neural first, then *gender*, then the exact locale."""
+        key = ((lang or "").lower(), (gender or "").lower())
+        if key in self._best:
+            return self._best[key]
+        lang_l, gen = key
+        best, best_score = None, None
+        for short, locale, g, neural in self._by_base.get(lang_l.split("-")[0], ()):
+            score = (2 if neural else 0) + (1 if gen and g == gen else 0), locale == lang_l
+            if best_score is None or score > best_score:
+                best, best_score = short, score
+        self._best[key] = best
+        return best
+
+    def list(self, lang: Optional[str] = None) -> List[Dict[str, Any]]:
+        if not lang:
+            voices = self.voices
+        else:
+            base = lang.split("-")[0].lower()
+            voices = [v for v in self.voices if (v.get("Locale") or "").lower().startswith(base)]
+        return [{"ShortName": v.get("ShortName"), "Locale": v.get("Locale"), "Gender": v.get("Gender")} for v in voices]
+
+
+def _read_catalog_file() -> Optional[VoiceCatalog]:
+    try:
+        with open(CATALOG_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return VoiceCatalog(data.get("voices", []), float(data.get("fetched_at", 0)))
+    except (OSError, ValueError):
+        return None
+
+
+def _fetch_catalog() -> Optional[VoiceCatalog]:
+    from .tts_service import edge_tts, get_tts_service
+
+    if edge_tts is None:
+        return None
+    try:
+        # The catalog owns expiry, so always go past the service's in-process memo
+        voices = get_tts_service().list_voices_sync(refresh=True)
+    except Exception as e:
+        logger.warning(f"edge-tts voice discovery failed: {e}")
+        return None
+    catalog = VoiceCatalog(voices, time.time())
+    try:
+        _atomic_write_json(CATALOG_PATH, {"fetched_at": catalog.fetched_at, "voices": catalog.voices})
+    except OSError as e:
+        logger.warning(f"Could not persist voice catalog to {CATALOG_PATH}: {e}")
+    logger.info(f"Discovered {len(catalog)} edge-tts voices")
+    return catalog
+
+
+_CATALOG: Optional[VoiceCatalog] = None
+_CATALOG_LOCK = threading.Lock()
+
+
+def get_voice_catalog(refresh: bool = False) -> VoiceCatalog:
+    """Process-wide catalog: the on-disk copy while it is younger than the TTL, else a fresh
+    edge-tts discovery (written back for other processes). A stale copy beats none."""
+    global _CATALOG
+    ttl = VOICE_CATALOG_TTL_HOURS * 3600
+    with _CATALOG_LOCK:
+        if _CATALOG is not None and not refresh and time.time() - _CATALOG.fetched_at < ttl:
+            return _CATALOG
+        on_disk = None if refresh else _read_catalog_file()
+        if on_disk is not None and time.time() - on_disk.fetched_at < ttl:
+            _CATALOG = on_disk
+        else:
+            _CATALOG = _fetch_catalog() or on_disk or _CATALOG or VoiceCatalog([])
+        return _CATALOG
+
+
+# (voice_map.json mtime, merged map); replaced wholesale on change, never mutated
+_VOICE_MAP: Tuple[Optional[float], Dict[str, str]] = (None, {})
+_VOICE_MAP_LOCK = threading.Lock()
+
+
+def _voice_map_mtime() -> Optional[float]:
+    try:
+        return os.path.getmtime(VOICE_MAP_PATH)
+    except OSError:
+        return None
+
+
+def _read_voice_map_file() -> Dict[str, str]:
+    try:
+        with open(VOICE_MAP_PATH, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def load_voice_map() -> Dict[str, str]:
+    """Built-in defaults merged with ``voice_map.json``; re-read only when the file changes.
+
+    The returned dict is shared: treat it as read-only and go through update_voice_map().
+    """
+    global _VOICE_MAP
+    mtime = _voice_map_mtime()
+    with _VOICE_MAP_LOCK:
+        if _VOICE_MAP[0] != mtime or not _VOICE_MAP[1]:
+            _VOICE_MAP = (mtime, {**DEFAULT_VOICE_MAP, **_read_voice_map_file()})
+        return _VOICE_MAP[1]
+
+
+def update_voice_map(lang: str, voice: str) -> bool:
+    """Map *lang* (and its base code, if unmapped) to *voice*.
+
+    Copy-on-write: the file is rewritten atomically only when the mapping actually
+    changes. Returns True if it did.
+    """
+    global _VOICE_MAP
+    base = lang.split("-")[0]
+    with _VOICE_MAP_LOCK:
+        current = _read_voice_map_file()
+        updated = {**current, lang: voice}
+        updated.setdefault(base, voice)
+        if updated == current:
+            return False
+        _atomic_write_json(VOICE_MAP_PATH, updated)
+        _VOICE_MAP = (_voice_map_mtime(), {**DEFAULT_VOICE_MAP, **updated})
+    logger.info(f"Voice map: {lang} -> {voice}")
+    return True
+
+
+def resolve_voice(lang: str, gender: Optional[str] = "male") -> Optional[str]:
+    """Voice for *lang*: the voice map (exact code, then base code), else the catalog."""
+    voice_map = load_voice_map()
+    voice = voice_map.get(lang) or voice_map.get(lang.split("-")[0])
+    if voice:
+        return voice
+    return get_voice_catalog().best(lang, gender)